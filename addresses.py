@@ -0,0 +1,122 @@
+"""
+addresses.py
+--------------
+The module contains the index of the IPv4 networks of the network state, it finds the networks
+overlapping a new static address without scanning all interfaces.
+"""
+
+import socket
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, NamedTuple
+
+from libnmstate.schema import Interface, InterfaceIPv4
+
+from consts import Address
+
+
+class AddressEntry(NamedTuple):
+    """Class - IPv4 address of the interface and the range of its network."""
+
+    start: int
+    end: int
+    prefix_length: int
+    ip: str
+    name: str
+
+    def __str__(self) -> str:
+        return f"{self.ip}/{self.prefix_length} on {self.name}"
+
+
+def network_range(ip: str, prefix_length: int) -> tuple[int, int]:
+    """
+    The function returns the first and the last address of the network.
+
+    Args:
+        ip: IPv4 address
+        prefix_length: prefix length of the address
+
+    Returns: first and last address of the network as integers
+    """
+
+    host_mask = (1 << 32 - prefix_length) - 1
+    start = int.from_bytes(socket.inet_aton(ip), "big") & ~host_mask
+    return start, start | host_mask
+
+
+class AddressIndex:
+    """
+    Class - interval index of the IPv4 networks.
+
+    Two networks overlap only if one contains the other, so the networks containing the new one
+    are found by its network at each present prefix length, and the networks inside it
+    by the binary search of the sorted network starts.
+    """
+
+    def __init__(self, entries: Iterable[AddressEntry]):
+        """
+        The initialization of the index.
+
+        Args:
+            entries: addresses of the interfaces
+        """
+
+        self.entries = sorted(entries)
+        self.starts = [entry.start for entry in self.entries]
+        self.networks = dict()
+        for entry in self.entries:
+            self.networks.setdefault((entry.prefix_length, entry.start), []).append(entry)
+        self.prefix_lengths = sorted({entry.prefix_length for entry in self.entries})
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "AddressIndex":
+        """
+        The method builds the index of the addresses of all interfaces of the network state,
+        the slim state read from the kernel keeps the addresses of the other interface types
+        under Address.OTHER_INTERFACES_KEY.
+
+        Args:
+            raw: network state of the nmstate lib
+
+        Returns: index
+        """
+
+        addresses = [
+            (interface[Interface.NAME], address)
+            for interface in raw.get(Interface.KEY, [])
+            for address in (interface.get(Interface.IPV4) or {}).get(InterfaceIPv4.ADDRESS, [])
+        ]
+        addresses += [(address[Interface.NAME], address) for address in raw.get(Address.OTHER_INTERFACES_KEY, [])]
+        return cls(
+            AddressEntry(
+                *network_range(address[InterfaceIPv4.ADDRESS_IP], address[InterfaceIPv4.ADDRESS_PREFIX_LENGTH]),
+                address[InterfaceIPv4.ADDRESS_PREFIX_LENGTH],
+                address[InterfaceIPv4.ADDRESS_IP],
+                name,
+            )
+            for name, address in addresses
+        )
+
+    def conflicts(self, ip: str, prefix_length: int, exclude: Iterable[str] = ()) -> list[AddressEntry]:
+        """
+        The method finds the addresses of the other interfaces in the networks overlapping the network of the address.
+
+        Args:
+            ip: IPv4 address
+            prefix_length: prefix length of the address
+            exclude: names of the interfaces whose addresses are ignored
+
+        Returns: conflicting addresses
+        """
+
+        exclude = set(exclude)
+        start, end = network_range(ip, prefix_length)
+        found = []
+        for length in self.prefix_lengths:
+            if length > prefix_length:
+                break
+            found.extend(self.networks.get((length, network_range(ip, length)[0]), ()))
+        for entry in self.entries[bisect_left(self.starts, start):bisect_right(self.starts, end)]:
+            if entry.prefix_length > prefix_length:
+                found.append(entry)
+        return [entry for entry in found if entry.name not in exclude]
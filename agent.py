@@ -0,0 +1,186 @@
+"""
+agent.py
+-----------
+The agent of the multi-host mode: serves the nmstate lib calls of the remote application
+as JSON lines over stdin and stdout. The module depends only on the standard library and the nmstate lib,
+so it is enough to copy this file to the managed host:
+
+    ssh host sudo python3 agent.py
+
+Each request is one line {"id": 1, "method": "show", "params": {}}, each response is one line
+{"id": 1, "result": ...} or {"id": 1, "error": "message"}.
+With --fake the agent serves an in-memory network state read from a JSON file instead of the nmstate lib.
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import sys
+import time
+
+METHODS = ("show", "apply", "commit", "rollback")
+
+
+class FakeNmstate:
+    """Class - in-memory stand-in of the nmstate lib, used to test the multi-host mode without the managed hosts."""
+
+    def __init__(self, state: dict, delay: float = 0.0):
+        """
+        The initialization of the stand-in.
+
+        Args:
+            state: initial network state
+            delay: delay of each call in seconds, it emulates the slow host
+        """
+
+        self.state = state
+        self.delay = delay
+        self.checkpoints = dict()
+        self._ids = itertools.count(1)
+
+    def show(self) -> dict:
+        """The method returns the copy of the network state."""
+
+        time.sleep(self.delay)
+        return copy.deepcopy(self.state)
+
+    def apply(self, desired_state: dict, verify_change: bool = True, commit: bool = True, rollback_timeout: int = 60):
+        """
+        The method merges the desired interface states into the network state.
+
+        Args:
+            desired_state: desired network state
+            verify_change: ignored, the merged state always matches
+            commit: the change is kept at once, otherwise it waits for commit or rollback
+            rollback_timeout: ignored
+
+        Returns: checkpoint of the uncommitted change or None
+        """
+
+        time.sleep(self.delay)
+        previous = copy.deepcopy(self.state)
+        interfaces = {interface["name"]: interface for interface in self.state["interfaces"]}
+        for iface in desired_state.get("interfaces", []):
+            if iface["name"] in interfaces:
+                merge(interfaces[iface["name"]], iface)
+            else:
+                self.state["interfaces"].append(copy.deepcopy(iface))
+        if commit:
+            return None
+        checkpoint = f"checkpoint-{next(self._ids)}"
+        self.checkpoints[checkpoint] = previous
+        return checkpoint
+
+    def commit(self, checkpoint: str | None = None) -> None:
+        """
+        The method keeps the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        self.checkpoints.pop(checkpoint, None)
+
+    def rollback(self, checkpoint: str | None = None) -> None:
+        """
+        The method restores the network state of the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        if checkpoint in self.checkpoints:
+            self.state = self.checkpoints.pop(checkpoint)
+
+
+def merge(current: dict, desired: dict) -> None:
+    """
+    The function merges the desired state into the current one the way the nmstate lib does it:
+    dictionaries are merged, other values are replaced.
+
+    Args:
+        current: current state
+        desired: desired state
+    """
+
+    for key, value in desired.items():
+        if isinstance(value, dict) and isinstance(current.get(key), dict):
+            merge(current[key], value)
+        else:
+            current[key] = copy.deepcopy(value)
+
+
+def handle(nmstate, line: str) -> dict:
+    """
+    The function executes one request.
+
+    Args:
+        nmstate: nmstate lib or its stand-in
+        line: request line
+
+    Returns: response
+    """
+
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return {"id": None, "error": f"bad request: {e}"}
+    if not isinstance(request, dict):
+        return {"id": None, "error": "bad request: the request must be an object"}
+
+    method = request.get("method")
+    if method not in METHODS:
+        return {"id": request.get("id"), "error": f"unknown method: {method}"}
+    try:
+        result = getattr(nmstate, method)(**request.get("params", {}))
+    except Exception as e:
+        return {"id": request.get("id"), "error": str(e) or type(e).__name__}
+    return {"id": request.get("id"), "result": result}
+
+
+def serve(nmstate, stdin, stdout) -> None:
+    """
+    The function serves the requests until the end of the input.
+
+    Args:
+        nmstate: nmstate lib or its stand-in
+        stdin: input stream of the requests
+        stdout: output stream of the responses
+    """
+
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(json.dumps(handle(nmstate, line)) + "\n")
+        stdout.flush()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the agent.
+
+    Args:
+        argv: command line arguments
+
+    Returns: exit code
+    """
+
+    parser = argparse.ArgumentParser(description="Agent serving the nmstate lib calls as JSON lines.")
+    parser.add_argument("--fake", metavar="STATE", help="serve the network state from the JSON file in memory")
+    parser.add_argument("--delay", type=float, default=0.0, help="delay of each call of the fake state, seconds")
+    args = parser.parse_args(argv)
+
+    if args.fake:
+        with open(args.fake) as stream:
+            nmstate = FakeNmstate(json.load(stream), args.delay)
+    else:
+        import libnmstate
+
+        nmstate = libnmstate
+    serve(nmstate, sys.stdin, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,17 +4,31 @@ app.py
 Module for initializing the application and assigning initial parameters to curses
 """
 
+import argparse
 import curses
 import subprocess
 
-from controllers import menu_controller
-from consts import Color
+import eventloop
+
+from controllers import hosts_controller, menu_controller
+from consts import Cache, Color, Journal
+from tracing import TRACER
+from views import TraceOverlay
 
 
 class MyApp:
     """Entry point class and initialization of initial values for the application."""
 
-    def __init__(self, stdscr):
+    def __init__(
+            self,
+            stdscr,
+            watch: bool = False,
+            hosts: list | None = None,
+            debug: bool = False,
+            snapshot_path: str | None = None,
+            full_state: bool = False,
+            journal_path: str | None = None,
+    ):
         self.screen = stdscr
         curses.start_color()
 
@@ -29,18 +43,108 @@ class MyApp:
 
         stdscr.bkgd(" ", curses.color_pair(Color.WINDOW_COLOR))
 
-        stdscr.addstr(0, 1, f"ESC - cancel, arrows - navigation, Enter - edit/save, q - exit")
+        stdscr.addstr(
+            0, 1, "ESC-back arrows-move Enter-edit a-queue c-commit x-stop u/U-undo/redo /-find r-reload q-exit"
+        )
         stdscr.refresh()
         curses.curs_set(0)
 
         border_top = 2
         border_left = 2
 
-        menu_controller(stdscr, border_top, border_left)
+        if debug:
+            TraceOverlay.enable(stdscr)
+
+        if hosts is not None:
+            eventloop.run(hosts_controller(stdscr, border_top, border_left, hosts))
+            return
+
+        watcher = None
+        if watch:
+            from watcher import start_watcher
+
+            try:
+                watcher = start_watcher(eventloop.wake)
+            except OSError as e:
+                stdscr.addstr(1, 2, f"watcher is not available: {e}")
+                stdscr.refresh()
+        try:
+            eventloop.run(menu_controller(
+                stdscr,
+                border_top,
+                border_left,
+                watcher,
+                snapshot_path=snapshot_path,
+                full_state=full_state,
+                journal_path=journal_path,
+            ))
+        finally:
+            if watcher is not None:
+                watcher.stop()
 
 
 if __name__ == "__main__":
-    curses.wrapper(MyApp)
+    parser = argparse.ArgumentParser(description="Curses interface for the Ethernet interfaces and bridges.")
+    parser.add_argument(
+        "--watch", action="store_true", help="follow the link and address changes reported by the kernel"
+    )
+    parser.add_argument(
+        "--hosts", metavar="FILE", help="manage the hosts of the file through their agents instead of this machine"
+    )
+    parser.add_argument(
+        "--netns", action="store_true", help="manage the interfaces of all network namespaces of this machine"
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="FILE",
+        default=Cache.SNAPSHOT_PATH,
+        help="show the interfaces saved by the previous run until the network state is loaded, "
+             f"an empty string disables it (default: {Cache.SNAPSHOT_PATH})",
+    )
+    parser.add_argument(
+        "--full-state",
+        action="store_true",
+        help="request the whole network state of nmstate instead of reading the interfaces from the kernel",
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="FILE",
+        default=Journal.PATH,
+        help=f"record the applied changes to the file for undo and redo, an empty string disables it "
+             f"(default: {Journal.PATH})",
+    )
+    parser.add_argument(
+        "--trace", metavar="FILE", help="append the timings of the operations to the file as JSON lines"
+    )
+    parser.add_argument("--debug", action="store_true", help="show the timings of the last operations on the screen")
+    args = parser.parse_args()
+    if args.trace:
+        TRACER.export(args.trace)
+    hosts = None
+    pool = None
+    if args.hosts:
+        from hosts import load_hosts
+
+        with open(args.hosts) as stream:
+            hosts = load_hosts(stream)
+    elif args.netns:
+        from netns import namespace_hosts, namespace_pool
+
+        pool = namespace_pool()
+        hosts = namespace_hosts(pool)
+    try:
+        curses.wrapper(
+            MyApp, args.watch, hosts, args.debug, args.snapshot or None, args.full_state, args.journal or None
+        )
+    finally:
+        if args.trace:
+            TRACER.close()
+        if hosts is not None:
+            from hosts import close_hosts
+
+            close_hosts(hosts)
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
 
     if b"linux" == curses.termname():
         subprocess.run(["reset"])
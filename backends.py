@@ -0,0 +1,101 @@
+"""
+backends.py
+-------------
+The module contains the protocol of the network state backend and its implementation by the nmstate lib.
+The cache and the store call only the functions of the protocol, so the nmstate lib can be replaced
+by the remote agent of the multi-host mode or by the in-memory simulator of the tests and benchmarks.
+"""
+
+from typing import Protocol
+
+import libnmstate
+
+
+class Backend(Protocol):
+    """Class - protocol of the network state backend, the functions of the nmstate lib used by the application."""
+
+    def show(self) -> dict:
+        """
+        The method returns the network state, the caller must not change it.
+
+        Returns: network state
+        """
+
+    def apply(
+            self, desired_state: dict, verify_change: bool = True, commit: bool = True, rollback_timeout: int = 60
+    ) -> str | None:
+        """
+        The method applies the desired state.
+
+        Args:
+            desired_state: desired network state
+            verify_change: verify the applied state
+            commit: keep the change at once, otherwise it waits for commit or rollback
+            rollback_timeout: time in seconds the uncommitted change is rolled back after
+
+        Returns: checkpoint of the uncommitted change
+        """
+
+    def commit(self, checkpoint: str | None = None) -> None:
+        """
+        The method keeps the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+    def rollback(self, checkpoint: str | None = None) -> None:
+        """
+        The method rolls back the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+
+class NmstateBackend:
+    """Class - the backend of the local host, the calls are passed to the nmstate lib."""
+
+    def show(self) -> dict:
+        """The method returns the network state of the host."""
+
+        return libnmstate.show()
+
+    def apply(
+            self, desired_state: dict, verify_change: bool = True, commit: bool = True, rollback_timeout: int = 60
+    ) -> str | None:
+        """
+        The method applies the desired state using the nmstate lib.
+
+        Args:
+            desired_state: desired network state
+            verify_change: verify the applied state
+            commit: keep the change at once, otherwise it waits for commit or rollback
+            rollback_timeout: time in seconds the uncommitted change is rolled back after
+
+        Returns: checkpoint of the uncommitted change
+        """
+
+        return libnmstate.apply(
+            desired_state, verify_change=verify_change, commit=commit, rollback_timeout=rollback_timeout
+        )
+
+    def commit(self, checkpoint: str | None = None) -> None:
+        """
+        The method keeps the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        libnmstate.commit(checkpoint=checkpoint)
+
+    def rollback(self, checkpoint: str | None = None) -> None:
+        """
+        The method rolls back the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        libnmstate.rollback(checkpoint=checkpoint)
@@ -0,0 +1,144 @@
+"""
+bench_hot_paths.py
+--------------------
+pytest-benchmark suite of the model and view hot paths on the generated network states
+of 10, 1000 and 10000 interfaces served by the in-memory simulator, the curses windows are replaced by the stub.
+
+Run from the project directory, compare with the stored baseline:
+
+    python3 -m pytest benchmarks/bench_hot_paths.py --benchmark-storage=benchmarks/baselines \
+        --benchmark-compare --benchmark-compare-fail=median:25%
+
+Save a new baseline after an intended change of the performance:
+
+    python3 -m pytest benchmarks/bench_hot_paths.py --benchmark-storage=benchmarks/baselines --benchmark-autosave
+"""
+
+import itertools
+import os
+import sys
+
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import MemoryBackend, generate_state  # noqa: E402
+from state import NetworkState, NetworkStore  # noqa: E402
+from tests.test_views import FakeWindow  # noqa: E402
+from views import InterfaceView, MenuView  # noqa: E402
+
+SIZES = (10, 1000, 10000)
+
+CHANGES = {
+    "state down": {"state": "down"},
+    "dhcp": {"ipv4 dhcp": True},
+    "address": {"ipv4 address": "192.168.1.10"},
+    "bridge": {"bridge": True, "bridge name": "br0"},
+}
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size}")
+def raw(request) -> dict:
+    """The fixture generates the network state, one bridge per ten interfaces."""
+
+    return generate_state(request.param, max(1, request.param // 10))
+
+
+@pytest.fixture()
+def store(raw) -> NetworkStore:
+    """The fixture creates the store of the generated network state."""
+
+    store = NetworkStore(backend=MemoryBackend(raw))
+    store.update()
+    return store
+
+
+@pytest.fixture()
+def interface(store):
+    """The fixture returns the Ethernet interface that is not a bridge port."""
+
+    return store.state.interfaces_by_name["eth0"]
+
+
+@pytest.fixture(autouse=True)
+def curses_stub():
+    """The fixture replaces the curses functions that require the initialized terminal."""
+
+    with patch("curses.doupdate"), patch("curses.ACS_HLINE", ord("-"), create=True):
+        yield
+
+
+def test_build_snapshot(benchmark, raw, store):
+    """Parsing of the network state into the interface records and the bridge indexes"""
+
+    benchmark(NetworkState.from_raw, raw, store)
+
+
+def test_store_update(benchmark, store):
+    """Requesting the network state, the unchanged state is not parsed again"""
+
+    benchmark(store.update, True)
+
+
+def test_serialize(benchmark, interface):
+    """Fields of the interface view"""
+
+    benchmark(interface.serialize)
+
+
+@pytest.mark.parametrize("change", CHANGES)
+def test_get_new_iface_state(benchmark, interface, change):
+    """Desired state of one interface change"""
+
+    benchmark(interface._get_new_iface_state, **CHANGES[change])
+
+
+def test_update_bridges(benchmark, store):
+    """Moving the bridge port to another bridge in the copy of the bridges"""
+
+    interface = store.state.interfaces_by_name["eth1"]
+    bridges = dict(store.state.bridges_by_name)
+    names = itertools.cycle(sorted(bridges))
+    benchmark(lambda: interface.update_bridges(bridges, next(names)))
+
+
+def test_cache_refresh_controller(benchmark, store):
+    """Publishing the changed controller of the port in the cached network state"""
+
+    names = itertools.cycle(sorted(store.state.bridges_by_name))
+    benchmark(lambda: store.cache.refresh_interface({"name": "eth1", "controller": next(names)}))
+
+
+def test_set_show_items(benchmark, interface):
+    """Choosing the widgets of the interface view"""
+
+    view = InterfaceView(FakeWindow(30, 35), interface.serialize(), interface)
+    benchmark(view.set_show_items)
+
+
+def test_menu_full_redraw(benchmark, store):
+    """Drawing the visible slice of the menu"""
+
+    menu = MenuView(FakeWindow(40, 35), list(store.state.interfaces))
+
+    def redraw():
+        menu.full_redraw = True
+        menu.show()
+
+    benchmark(redraw)
+
+
+def test_menu_navigate(benchmark, store):
+    """Moving the position in the menu, only the damaged rows are drawn"""
+
+    menu = MenuView(FakeWindow(40, 35), list(store.state.interfaces))
+    menu.show()
+    steps = itertools.cycle((1,) * 20 + (-1,) * 20)
+
+    def navigate():
+        menu.navigate(next(steps))
+        menu.show()
+
+    benchmark(navigate)
@@ -0,0 +1,115 @@
+"""
+memory.py
+------------
+Memory benchmark of the interface model: the traced memory per interface of the slotted records
+compared to the records with the instance dictionary, and the time of the bridge membership update.
+
+Run from the project directory:
+
+    python3 benchmarks/memory.py --interfaces 10000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import NetInterface  # noqa: E402
+
+
+class DictInterface(NetInterface):
+    """Class - the interface record with the instance dictionary, the layout before the slots."""
+
+
+def generate_interfaces(count: int, bridges: int) -> list[dict]:
+    """
+    The function generates the Ethernet interfaces the way the nmstate lib reports them.
+
+    Args:
+        count: number of interfaces
+        bridges: number of bridges the interfaces are distributed between
+
+    Returns: interface states
+    """
+
+    return [
+        {
+            "name": f"eth{i}",
+            "type": "ethernet",
+            "state": "up",
+            "controller": f"br{i % bridges}",
+            "mac-address": f"02:00:00:{i >> 16 & 0xff:02X}:{i >> 8 & 0xff:02X}:{i & 0xff:02X}",
+            "ipv4": {"enabled": True, "dhcp": False},
+        }
+        for i in range(count)
+    ]
+
+
+def memory_per_interface(record: type, interfaces: list[dict]) -> float:
+    """
+    The function measures the traced memory of the records created from the interface states.
+
+    Args:
+        record: record class
+        interfaces: interface states
+
+    Returns: bytes per interface
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [record(**interface) for interface in interfaces]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / len(interfaces)
+
+
+def bridge_update_time(interfaces: list[dict], bridges: int) -> float:
+    """
+    The function measures the mean time of moving an interface to another bridge.
+
+    Args:
+        interfaces: interface states
+        bridges: number of bridges
+
+    Returns: seconds per update
+    """
+
+    records = [NetInterface(**interface) for interface in interfaces]
+    configs = dict()
+    for record in records:
+        record._add_bridge(configs, record.controller)
+
+    started = time.perf_counter()
+    for i, record in enumerate(records):
+        record.update_bridges(configs, f"br{(i + 1) % bridges}")
+    return (time.perf_counter() - started) / len(records)
+
+
+def main() -> None:
+    """Entry point of the benchmark, the results are printed as JSON lines."""
+
+    parser = argparse.ArgumentParser(description="Memory benchmark of the interface model.")
+    parser.add_argument("--interfaces", type=int, default=10000, help="number of interfaces")
+    parser.add_argument("--bridges", type=int, default=100, help="number of bridges")
+    args = parser.parse_args()
+
+    interfaces = generate_interfaces(args.interfaces, args.bridges)
+    results = {
+        "bytes per interface, slots": memory_per_interface(NetInterface, interfaces),
+        "bytes per interface, dict": memory_per_interface(DictInterface, interfaces),
+        "seconds per bridge update": bridge_update_time(interfaces, args.bridges),
+    }
+    for name, value in results.items():
+        print(json.dumps({"benchmark": name, "interfaces": args.interfaces, "value": value}))
+
+
+if __name__ == "__main__":
+    main()
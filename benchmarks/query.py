@@ -0,0 +1,64 @@
+"""
+query.py
+------------
+Benchmark of the network state query on this machine: the whole network state of the nmstate lib
+against the slim state of the Ethernet interfaces and the bridges read from the kernel by rtnetlink.
+
+Run from the project directory, NetworkManager is required for the nmstate lib:
+
+    python3 benchmarks/query.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libnmstate  # noqa: E402
+
+from kernel import show_kernel  # noqa: E402
+
+
+def measure(func, runs: int) -> tuple[float, int]:
+    """
+    The function measures the median time of the query.
+
+    Args:
+        func: query without arguments
+        runs: number of runs
+
+    Returns: seconds per run and the size of the returned state in bytes of JSON
+    """
+
+    times = []
+    state = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        state = func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), len(json.dumps(state, default=str))
+
+
+def main() -> None:
+    """Entry point of the benchmark, the results are printed as JSON lines."""
+
+    parser = argparse.ArgumentParser(description="Benchmark of the network state query.")
+    parser.add_argument("--runs", type=int, default=10, help="number of runs, the median is reported")
+    args = parser.parse_args()
+
+    queries = {
+        "nmstate show": libnmstate.show,
+        "nmstate show kernel only": lambda: libnmstate.show(kernel_only=True),
+        "kernel slim state": show_kernel,
+    }
+    for name, func in queries.items():
+        seconds, size = measure(func, args.runs)
+        print(json.dumps({"benchmark": name, "seconds": seconds, "bytes": size}))
+
+
+if __name__ == "__main__":
+    main()
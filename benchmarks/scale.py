@@ -0,0 +1,96 @@
+"""
+scale.py
+------------
+Scale benchmark of the model and the diffing on the generated network state served by the in-memory simulator,
+it runs without root and NetworkManager: the time of building the snapshot, searching it,
+checking the address conflicts, applying a bridge membership change with and without the change journal,
+undoing it by the journal and patching an observed change.
+
+Run from the project directory:
+
+    python3 benchmarks/scale.py --interfaces 10000 --bridges 1000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import ChangeJournal  # noqa: E402
+from simulator import MemoryBackend, generate_state  # noqa: E402
+from state import NetworkState, NetworkStore  # noqa: E402
+
+
+def measure(func, runs: int) -> float:
+    """
+    The function measures the median time of the function.
+
+    Args:
+        func: function without arguments
+        runs: number of runs
+
+    Returns: seconds per run
+    """
+
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """Entry point of the benchmark, the results are printed as JSON lines."""
+
+    parser = argparse.ArgumentParser(description="Scale benchmark of the model on the simulated network state.")
+    parser.add_argument("--interfaces", type=int, default=10000, help="number of Ethernet interfaces")
+    parser.add_argument("--bridges", type=int, default=1000, help="number of bridges")
+    parser.add_argument("--runs", type=int, default=5, help="number of runs, the median is reported")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    raw = generate_state(args.interfaces, args.bridges)
+    generated = time.perf_counter() - started
+    store = NetworkStore(backend=MemoryBackend(raw))
+    snapshot = store.update()
+    names = iter(f"eth{i}" for i in range(0, args.interfaces, 2))
+    bridges = iter(f"br{i % args.bridges}" for i in range(args.interfaces))
+    directory = tempfile.TemporaryDirectory()
+    journal = ChangeJournal(os.path.join(directory.name, "journal.jsonl"))
+    journal_store = NetworkStore(backend=MemoryBackend(raw), journal=journal)
+    journal_store.update()
+
+    results = {
+        "generate state": generated,
+        "build snapshot": measure(lambda: NetworkState.from_raw(raw, store), args.runs),
+        "build search index": measure(lambda: NetworkState.from_raw(raw, store).search_index(), args.runs),
+        "search": measure(lambda: snapshot.search_index().search("10.0.1"), args.runs),
+        "build address index": measure(lambda: NetworkState.from_raw(raw, store).address_index(), args.runs),
+        "address conflicts": measure(lambda: snapshot.address_index().conflicts("10.0.1.1", 24), args.runs),
+        "apply bridge change": measure(
+            lambda: store.state.interfaces_by_name[next(names)].apply(**{"bridge": True, "bridge name": next(bridges)}),
+            args.runs,
+        ),
+        "apply bridge change with journal": measure(
+            lambda: journal_store.state.interfaces_by_name[next(names)].apply(
+                **{"bridge": True, "bridge name": next(bridges)}
+            ),
+            args.runs,
+        ),
+        "undo": measure(journal_store.undo, args.runs),
+        "patch interface": measure(lambda: store.patch_interface({"name": next(names), "state": "down"}), args.runs),
+    }
+    journal.close()
+    directory.cleanup()
+    for name, value in results.items():
+        print(json.dumps({"benchmark": name, "interfaces": args.interfaces, "bridges": args.bridges, "seconds": value}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+startup.py
+------------
+Startup benchmark: import time of the application modules and time to the first frame of the curses interface.
+
+Run from the project directory:
+
+    python3 benchmarks/startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import pty
+import re
+import select
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ("controllers", "models", "cli")
+
+FIRST_PAINT_MARK = b"Menu"
+INTERFACES_MARK = re.compile(rb"0\. \w")
+
+
+def import_time(module: str) -> float:
+    """
+    The function measures the cumulative import time of the module in a new interpreter.
+
+    Args:
+        module: module name
+
+    Returns: import time in seconds
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1_000_000
+    raise RuntimeError(f"failed to import {module}: {result.stderr.strip()[-200:]}")
+
+
+def paint_time(timeout: float = 60.0) -> tuple[float, float | None]:
+    """
+    The function starts the application in a pseudo terminal and measures the time to the first frame
+    and the time to the filled list of interfaces.
+
+    Args:
+        timeout: maximum waiting time in seconds
+
+    Returns: time to the first frame and time to the list of interfaces in seconds
+    """
+
+    started = time.monotonic()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.chdir(PROJECT_DIR)
+        os.environ.setdefault("TERM", "xterm")
+        os.execv(sys.executable, [sys.executable, "app.py"])
+
+    output = b""
+    first_paint = None
+    interfaces = None
+    try:
+        while time.monotonic() - started < timeout and interfaces is None:
+            ready, _, _ = select.select([fd], [], [], 0.01)
+            if not ready:
+                continue
+            try:
+                output += os.read(fd, 65536)
+            except OSError:
+                break
+            now = time.monotonic() - started
+            if first_paint is None and FIRST_PAINT_MARK in output:
+                first_paint = now
+            if first_paint is not None and INTERFACES_MARK.search(output):
+                interfaces = now
+    finally:
+        os.kill(pid, 9)
+        os.waitpid(pid, 0)
+        os.close(fd)
+    if first_paint is None:
+        raise RuntimeError("the application did not draw the first frame")
+    return first_paint, interfaces
+
+
+def main() -> None:
+    """Entry point of the benchmark, the results are printed as JSON lines."""
+
+    parser = argparse.ArgumentParser(description="Startup benchmark of the application.")
+    parser.add_argument("--runs", type=int, default=5, help="number of runs, the median is reported")
+    args = parser.parse_args()
+
+    results = {}
+    for module in MODULES:
+        results[f"import {module}"] = statistics.median(import_time(module) for _ in range(args.runs))
+
+    paints = [paint_time() for _ in range(args.runs)]
+    results["first paint"] = statistics.median(paint for paint, _ in paints)
+    loaded = [interfaces for _, interfaces in paints if interfaces is not None]
+    results["interfaces loaded"] = statistics.median(loaded) if loaded else None
+
+    for name, value in results.items():
+        print(json.dumps({"benchmark": name, "seconds": value}))
+
+
+if __name__ == "__main__":
+    main()
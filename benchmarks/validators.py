@@ -0,0 +1,99 @@
+"""
+validators.py
+---------------
+Throughput benchmark of the field validators: the items per second of the validator called for each value,
+of the batch validation and of the regular expression compiled on each call, the layout before the batch API.
+
+Run from the project directory:
+
+    python3 benchmarks/validators.py --values 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validators import bridge_name_validator, ipv4_validator, validate_many  # noqa: E402
+
+
+def regex_ipv4_validator(value: str) -> bool:
+    """The IPv4 address validator compiling the regular expression on each call, the layout before the batch API."""
+
+    if not isinstance(value, str):
+        return False
+    pattern = re.compile(r"^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$")
+    return bool(pattern.match(value))
+
+
+def regex_bridge_name_validator(value: str) -> bool:
+    """The bridge name validator matching the string pattern on each call, the layout before the batch API."""
+
+    if not isinstance(value, str):
+        return False
+    return bool(re.match(r"^[a-zA-Z][a-zA-Z0-9_-]{0,14}$", value))
+
+
+def generate_addresses(count: int) -> list[str]:
+    """
+    The function generates the addresses, every tenth address is invalid.
+
+    Args:
+        count: number of addresses
+
+    Returns: addresses
+    """
+
+    rand = random.Random(count)
+    return [
+        f"10.{rand.randrange(256)}.{rand.randrange(256)}.{rand.randrange(256 if i % 10 else 1000)}"
+        for i in range(count)
+    ]
+
+
+def throughput(func, values: list) -> float:
+    """
+    The function measures the items per second of the validation.
+
+    Args:
+        func: function validating the list of values
+        values: values
+
+    Returns: items per second
+    """
+
+    started = time.perf_counter()
+    func(values)
+    return len(values) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    """Entry point of the benchmark, the results are printed as JSON lines."""
+
+    parser = argparse.ArgumentParser(description="Throughput benchmark of the field validators.")
+    parser.add_argument("--values", type=int, default=100000, help="number of values")
+    args = parser.parse_args()
+
+    addresses = generate_addresses(args.values)
+    names = [f"br{i}" if i % 10 else f"{i}br" for i in range(args.values)]
+    results = {
+        "ipv4, regex per call": throughput(lambda values: [regex_ipv4_validator(value) for value in values], addresses),
+        "ipv4, per call": throughput(lambda values: [ipv4_validator(value) for value in values], addresses),
+        "ipv4, validate_many": throughput(lambda values: validate_many("ipv4address", values), addresses),
+        "bridge name, regex per call": throughput(
+            lambda values: [regex_bridge_name_validator(value) for value in values], names
+        ),
+        "bridge name, per call": throughput(lambda values: [bridge_name_validator(value) for value in values], names),
+        "bridge name, validate_many": throughput(lambda values: validate_many("bridge_name", values), names),
+    }
+    for name, value in results.items():
+        print(json.dumps({"benchmark": name, "values": args.values, "items per second": value}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+cache.py
+----------
+The module contains the cache of the network state received from the nmstate library.
+"""
+
+import copy
+import time
+
+from libnmstate.schema import Interface, InterfaceIPv4, InterfaceType, LinuxBridge
+
+from backends import Backend, NmstateBackend
+from consts import Cache
+from tracing import span
+
+
+class StateCache:
+    """
+    Class - network state cache with a limited lifetime.
+
+    The cached state is never changed in place: a refresh publishes a new state dictionary
+    with new entries for the changed interfaces, the unchanged entries are shared,
+    so the state returned earlier stays valid for its readers. Each change of the cached state
+    increases the generation, so the state requested before a change can be recognized and dropped.
+    """
+
+    def __init__(self, ttl: float = Cache.STATE_TTL, backend: Backend | None = None):
+        """
+        The initialization of the cache.
+
+        Args:
+            ttl: lifetime of the network state in seconds
+            backend: network state backend, the nmstate lib of the local host by default
+        """
+
+        self.ttl = ttl
+        self.backend = NmstateBackend() if backend is None else backend
+        self._state = None
+        self._by_name = dict()
+        self._updated = 0.0
+        self.generation = 0
+
+    @property
+    def expired(self) -> bool:
+        """The property returns True if the network state must be requested again."""
+
+        return self._state is None or time.monotonic() - self._updated > self.ttl
+
+    def get(self, force: bool = False) -> dict:
+        """
+        The method returns the network state, the nmstate lib is requested only when the cache is expired.
+
+        Args:
+            force: request the network state regardless of the lifetime
+
+        Returns: network state, it must not be changed
+        """
+
+        if force or self.expired:
+            self.store(self.request())
+        return self._state
+
+    def request(self) -> dict:
+        """
+        The method requests the network state from the backend without caching it.
+
+        Returns: network state
+        """
+
+        with span("backend.show") as trace:
+            state = self.backend.show()
+            trace.attributes["interfaces"] = len(state[Interface.KEY])
+        return state
+
+    def store(self, state: dict) -> None:
+        """
+        The method replaces the cached network state by the requested one.
+
+        Args:
+            state: network state of the backend
+        """
+
+        self._by_name = {interface[Interface.NAME]: interface for interface in state[Interface.KEY]}
+        self._state = state
+        self._updated = time.monotonic()
+        self.generation += 1
+
+    def peek(self) -> dict | None:
+        """
+        The method returns the cached network state without requesting it.
+
+        Returns: network state or None if the cache is empty
+        """
+
+        return self._state
+
+    def invalidate(self) -> None:
+        """The method resets the cache, the next get() requests the whole network state."""
+
+        self._state = None
+        self._by_name = dict()
+        self.generation += 1
+
+    def get_interface(self, name: str) -> dict | None:
+        """
+        The method returns the cached entry of the interface.
+
+        Args:
+            name: interface name
+
+        Returns: interface state or None if the interface is unknown or the cache is empty
+        """
+
+        return self._by_name.get(name)
+
+    def refresh_interface(self, iface_state: dict) -> None:
+        """
+        The method refreshes the entry of one interface by the state that has been applied and verified
+        by the nmstate lib, without requesting the whole network state.
+
+        Args:
+            iface_state: applied interface state
+        """
+
+        if self._state is None:
+            return
+        changed = dict()
+        name = iface_state[Interface.NAME]
+        if name not in self._by_name:
+            changed[name] = copy.deepcopy(iface_state)
+            self._update_ports(changed, changed[name], "")
+        else:
+            interface = self._edit(changed, name)
+            controller = interface.get(Interface.CONTROLLER, "")
+            self._merge(interface, iface_state)
+            self._clear_static_addresses(interface, iface_state)
+            if Interface.CONTROLLER in iface_state and iface_state[Interface.CONTROLLER] != controller:
+                self._update_ports(changed, interface, controller)
+            elif not interface.get(Interface.CONTROLLER):
+                interface.pop(Interface.CONTROLLER, None)
+
+        if iface_state.get(Interface.TYPE) == InterfaceType.LINUX_BRIDGE:
+            self._update_controllers(changed, iface_state)
+        self._publish(changed)
+
+    def remove_interface(self, name: str) -> None:
+        """
+        The method removes the entry of the deleted interface and its references from the bridges.
+
+        Args:
+            name: interface name
+        """
+
+        interface = self._by_name.get(name)
+        if interface is None:
+            return
+        changed = {name: None}
+        controller = interface.get(Interface.CONTROLLER, "")
+        if controller:
+            self._update_ports(changed, {Interface.NAME: name}, controller)
+        if interface.get(Interface.TYPE) == InterfaceType.LINUX_BRIDGE:
+            for item in self._state[Interface.KEY]:
+                if item.get(Interface.CONTROLLER) == name:
+                    del self._edit(changed, item[Interface.NAME])[Interface.CONTROLLER]
+        self._publish(changed)
+
+    def _edit(self, changed: dict[str, dict | None], name: str) -> dict:
+        """
+        The method returns the private copy of the entry that can be changed before it is published.
+
+        Args:
+            changed: copies of the changed entries by name
+            name: interface name
+
+        Returns: copy of the entry
+        """
+
+        if changed.get(name) is None:
+            changed[name] = copy.deepcopy(self._by_name[name])
+        return changed[name]
+
+    def _publish(self, changed: dict[str, dict | None]) -> None:
+        """
+        The method replaces the cached state by a new one with the changed entries,
+        None removes the entry, the unknown entries are appended.
+
+        Args:
+            changed: new entries by name
+        """
+
+        interfaces = [changed.get(interface[Interface.NAME], interface) for interface in self._state[Interface.KEY]]
+        interfaces = [interface for interface in interfaces if interface is not None]
+        interfaces += [
+            interface for name, interface in changed.items()
+            if interface is not None and name not in self._by_name
+        ]
+        by_name = {**self._by_name, **changed}
+        self._by_name = {name: interface for name, interface in by_name.items() if interface is not None}
+        self._state = {**self._state, Interface.KEY: interfaces}
+        self.generation += 1
+
+    def _update_ports(self, changed: dict[str, dict | None], interface: dict, controller: str) -> None:
+        """
+        The method moves the interface from the ports of the previous bridge to the ports of its new controller.
+
+        Args:
+            changed: copies of the changed entries by name
+            interface: interface state with the new controller
+            controller: previous controller name
+        """
+
+        name = interface[Interface.NAME]
+        if not interface.get(Interface.CONTROLLER):
+            interface.pop(Interface.CONTROLLER, None)
+        for bridge_name in {controller, interface.get(Interface.CONTROLLER, "")} - {""}:
+            bridge = self._by_name.get(bridge_name)
+            if bridge is None or bridge.get(Interface.TYPE) != InterfaceType.LINUX_BRIDGE:
+                continue
+            bridge = self._edit(changed, bridge_name)
+            config = bridge.setdefault(LinuxBridge.CONFIG_SUBTREE, {})
+            ports = [port for port in config.get(LinuxBridge.PORT_SUBTREE, []) if port[LinuxBridge.Port.NAME] != name]
+            if bridge_name == interface.get(Interface.CONTROLLER):
+                ports.append({LinuxBridge.Port.NAME: name})
+            config[LinuxBridge.PORT_SUBTREE] = ports
+
+    def _update_controllers(self, changed: dict[str, dict | None], bridge: dict) -> None:
+        """
+        The method synchronizes the controller of the interfaces with the ports of the bridge.
+
+        Args:
+            changed: copies of the changed entries by name
+            bridge: applied bridge state
+        """
+
+        ports = bridge.get(LinuxBridge.CONFIG_SUBTREE, {}).get(LinuxBridge.PORT_SUBTREE)
+        if ports is None:
+            return
+        bridge_name = bridge[Interface.NAME]
+        port_names = {port[LinuxBridge.Port.NAME] for port in ports}
+        for interface in self._state[Interface.KEY]:
+            name = interface[Interface.NAME]
+            if name in port_names and interface.get(Interface.CONTROLLER) != bridge_name:
+                self._edit(changed, name)[Interface.CONTROLLER] = bridge_name
+            elif name not in port_names and interface.get(Interface.CONTROLLER) == bridge_name:
+                del self._edit(changed, name)[Interface.CONTROLLER]
+
+    @staticmethod
+    def _clear_static_addresses(interface: dict, iface_state: dict) -> None:
+        """
+        The method removes the static IPv4 addresses of the merged entry when the applied state
+        enables DHCP or disables IPv4 without listing the addresses: the nmstate lib drops them,
+        the plain merge would keep them.
+
+        Args:
+            interface: merged interface state
+            iface_state: applied interface state
+        """
+
+        ipv4 = iface_state.get(Interface.IPV4)
+        if not isinstance(ipv4, dict) or InterfaceIPv4.ADDRESS in ipv4:
+            return
+        if ipv4.get(InterfaceIPv4.DHCP) or ipv4.get(InterfaceIPv4.ENABLED) is False:
+            interface[Interface.IPV4].pop(InterfaceIPv4.ADDRESS, None)
+
+    @classmethod
+    def _merge(cls, current: dict, desired: dict) -> None:
+        """
+        The method merges the desired state into the current one the way the nmstate lib does it:
+        dictionaries are merged, other values are replaced.
+
+        Args:
+            current: current state
+            desired: desired state
+        """
+
+        for key, value in desired.items():
+            if isinstance(value, dict) and isinstance(current.get(key), dict):
+                cls._merge(current[key], value)
+            else:
+                current[key] = copy.deepcopy(value)
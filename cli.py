@@ -0,0 +1,345 @@
+"""
+cli.py
+---------
+Module for applying interface changes without the curses interface, for automation.
+
+The change list is a YAML or JSON document:
+
+    interfaces:
+      - name: enp0s3
+        state: down
+      - name: enp0s8
+        ipv4 address: 10.0.2.10
+      - name: enp0s9
+        bridge name: br0
+
+All changes are applied in one transaction, the results are printed as JSON.
+With --hosts the same changes are rolled out to each host of the file through its agent:
+the canary hosts go first, the others are applied concurrently within the window and the rollout halts
+when the share of the failed hosts exceeds the threshold, the results are printed by host name.
+
+The local changes are recorded to the journal, instead of the change list the last transaction can be undone
+with --undo or redone with --redo, one interface can be reverted with --revert NAME --at TIME and
+a transaction can be replayed with --replay N, on this machine or on the hosts of --hosts.
+When the journal cannot be written, its error is printed with the results and the apply is reported as failed.
+"""
+
+import argparse
+import json
+import sys
+import threading
+
+from datetime import datetime
+
+from libnmstate.schema import Interface
+
+from journal import ChangeJournal
+from models import APPLY_RESULT_OK, APPLY_RESULT_NO_CHANGE
+from consts import Journal, Rollout
+from rollout import RolloutReport, RolloutScheduler
+from state import NetworkStore
+from validators import validate_many
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_BAD_INPUT = 2
+
+
+def load_changes(stream, fmt: str = "json") -> list[dict]:
+    """
+    The function reads the change list.
+
+    Args:
+        stream: file object with the change list
+        fmt: document format, json or yaml
+
+    Returns: list of interface changes
+    """
+
+    if fmt == "yaml":
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("PyYAML is required to read YAML change lists")
+        try:
+            document = yaml.safe_load(stream)
+        except yaml.YAMLError as e:
+            raise ValueError(str(e))
+    else:
+        document = json.load(stream)
+
+    if isinstance(document, dict):
+        document = document.get("interfaces")
+    if not isinstance(document, list) or not all(isinstance(change, dict) and "name" in change for change in document):
+        raise ValueError("change list must be a list of interfaces with the 'name' field")
+    return [{key.replace("_", " "): value for key, value in change.items()} for change in document]
+
+
+def queue_changes(store: NetworkStore, changes: list[dict]) -> dict[str, str]:
+    """
+    The function validates the changes and puts them into the queue of pending changes.
+
+    Args:
+        store: network state store
+        changes: list of interface changes
+
+    Returns: errors and results of queuing for each interface
+    """
+
+    interfaces = store.state.interfaces_by_name
+    results = dict()
+    known = []
+    checks = dict()
+    for change in changes:
+        values = dict(change)
+        name = values.pop("name")
+        interface = interfaces.get(name)
+        if interface is None:
+            results[name] = "unknown interface"
+            continue
+        field_types = {item["name"]: item["type"] for item in interface.serialize()}
+        errors = [field for field in values if field not in field_types]
+        for field, value in values.items():
+            if field in field_types:
+                checks.setdefault(field_types[field], []).append((len(known), field, value))
+        known.append((interface, values, errors))
+
+    for field_type, typed_checks in checks.items():
+        type_errors = validate_many(field_type, [value for _, _, value in typed_checks])
+        for (i, field, _), error in zip(typed_checks, type_errors):
+            if error is not None:
+                known[i][2].append(field)
+
+    for interface, values, errors in known:
+        if errors:
+            errors = [field for field in values if field in errors]
+            results[interface.name] = f"errors field - {', '.join(errors)}"
+            continue
+        results[interface.name] = interface.queue(**values)
+    return results
+
+
+def apply_changes(
+        changes: list[dict], store: NetworkStore | None = None, cancel: threading.Event | None = None
+) -> dict[str, str]:
+    """
+    The function applies the changes of many interfaces in one pass.
+
+    Args:
+        changes: list of interface changes
+        store: network state store, a new one is created if omitted
+        cancel: event to roll back the changes after the verification
+
+    Returns: result apply for each interface
+    """
+
+    if store is None:
+        store = NetworkStore()
+    store.update()
+    store.discard_pending()
+    results = queue_changes(store, changes)
+    if store.pending:
+        results.update(store.commit(cancel))
+    return results
+
+
+def apply_hosts(changes: list[dict], hosts: list, scheduler: RolloutScheduler | None = None) -> RolloutReport:
+    """
+    The function rolls out the same changes to many hosts, each host in its own transaction.
+
+    Args:
+        changes: list of interface changes
+        hosts: hosts of the multi-host mode
+        scheduler: rollout scheduler, by default all hosts are applied in the window without the canary and the halt
+
+    Returns: report of the rollout
+    """
+
+    if scheduler is None:
+        scheduler = RolloutScheduler(
+            lambda host, cancel: apply_changes(changes, host.store, cancel), canary=0, max_failure_rate=1.0
+        )
+    return scheduler.run(hosts)
+
+
+def parse_time(value: str) -> float:
+    """
+    The function reads the moment of the revert.
+
+    Args:
+        value: seconds since the epoch or the local time in the ISO format
+
+    Returns: moment as the seconds since the epoch
+    """
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time: {value}")
+
+
+def print_error(error: str) -> int:
+    """
+    The function prints the error of the input.
+
+    Args:
+        error: error message
+
+    Returns: exit code of the bad input
+    """
+
+    json.dump({"error": error}, sys.stdout)
+    sys.stdout.write("\n")
+    return EXIT_BAD_INPUT
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the headless mode.
+
+    Args:
+        argv: command line arguments
+
+    Returns: exit code
+    """
+
+    parser = argparse.ArgumentParser(description="Apply ethernet interface changes without the curses interface.")
+    parser.add_argument("changes", nargs="?", help="YAML or JSON change list, '-' to read from stdin")
+    parser.add_argument(
+        "--format", choices=("json", "yaml"), help="format of the change list, by file extension if omitted"
+    )
+    parser.add_argument(
+        "--hosts", metavar="FILE", help="roll out the changes to each host of the file through its agent"
+    )
+    parser.add_argument(
+        "--canary", type=int, default=Rollout.CANARY, help="number of the first hosts that must succeed"
+    )
+    parser.add_argument(
+        "--window", type=int, default=Rollout.WINDOW, help="maximum number of the hosts applied at once"
+    )
+    parser.add_argument(
+        "--max-failure-rate", type=float, default=Rollout.MAX_FAILURE_RATE, help="share of the failed hosts to halt at"
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="FILE",
+        default=Journal.PATH,
+        help=f"journal of the local changes, an empty string disables it (default: {Journal.PATH})",
+    )
+    actions = parser.add_mutually_exclusive_group()
+    actions.add_argument("--undo", action="store_true", help="undo the last transaction of the journal")
+    actions.add_argument("--redo", action="store_true", help="apply again the last undone transaction")
+    actions.add_argument("--revert", metavar="NAME", help="restore the interface as it was at the time of --at")
+    actions.add_argument("--replay", metavar="N", type=int, help="apply the desired state of the transaction again")
+    parser.add_argument(
+        "--at", metavar="TIME", type=parse_time, help="time of --revert, seconds since the epoch or ISO local time"
+    )
+    args = parser.parse_args(argv)
+
+    journal_action = args.undo or args.redo or args.revert is not None or args.replay is not None
+    if journal_action == (args.changes is not None):
+        parser.error("either the change list or one of --undo, --redo, --revert and --replay is required")
+    if args.revert is not None and args.at is None:
+        parser.error("--revert requires --at")
+    if journal_action and not args.journal:
+        parser.error("the journal is disabled")
+
+    journal = ChangeJournal(args.journal) if args.journal else None
+    try:
+        return run(args, journal)
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def run(args: argparse.Namespace, journal: ChangeJournal | None) -> int:
+    """
+    The function applies the change list or the transaction of the journal by the parsed arguments.
+
+    Args:
+        args: parsed command line arguments
+        journal: journal of the local changes
+
+    Returns: exit code
+    """
+
+    changes = None
+    transaction = None
+    if args.replay is not None:
+        transaction = journal.get(args.replay)
+        if transaction is None:
+            return print_error(f"unknown transaction {args.replay}")
+    elif args.changes is not None:
+        fmt = args.format or ("yaml" if args.changes.endswith((".yaml", ".yml")) else "json")
+        try:
+            if args.changes == "-":
+                changes = load_changes(sys.stdin, fmt)
+            else:
+                with open(args.changes) as stream:
+                    changes = load_changes(stream, fmt)
+        except (OSError, ValueError) as e:
+            return print_error(str(e))
+
+    if args.hosts:
+        from hosts import close_hosts, load_hosts
+
+        if changes is None and transaction is None:
+            return print_error("only the change list and --replay can be rolled out to the hosts")
+        try:
+            with open(args.hosts) as stream:
+                hosts = load_hosts(stream)
+        except (OSError, ValueError) as e:
+            return print_error(str(e))
+        if transaction is not None:
+            def apply(host, cancel):
+                return host.store.apply_state(transaction.state[Interface.KEY], cancel, Journal.REPLAY, transaction.id)
+        else:
+            def apply(host, cancel):
+                return apply_changes(changes, host.store, cancel)
+        scheduler = RolloutScheduler(
+            apply,
+            canary=args.canary,
+            window=args.window,
+            max_failure_rate=args.max_failure_rate,
+        )
+        try:
+            report = apply_hosts(changes, hosts, scheduler)
+        finally:
+            close_hosts(hosts)
+        json.dump(report.serialize(), sys.stdout)
+        sys.stdout.write("\n")
+        return EXIT_OK if report.ok else EXIT_FAILED
+
+    if args.undo and journal.undo_target() is None:
+        return print_error("nothing to undo")
+    if args.redo and journal.redo_target() is None:
+        return print_error("nothing to redo")
+    store = NetworkStore(journal=journal)
+    if args.undo:
+        results = store.undo()
+    elif args.redo:
+        results = store.redo()
+    elif args.revert is not None:
+        results = store.revert(args.revert, args.at)
+    elif transaction is not None:
+        results = store.apply_state(transaction.state[Interface.KEY], kind=Journal.REPLAY, target=transaction.id)
+    else:
+        results = apply_changes(changes, store)
+    ok = all(result in (APPLY_RESULT_OK, APPLY_RESULT_NO_CHANGE) for result in results.values())
+    output = {"ok": ok, "results": results}
+    if journal is not None:
+        journal.flush()
+        if journal.error is not None:
+            output["ok"] = False
+            output["journal"] = f"the changes are not recorded: {journal.error}"
+    json.dump(output, sys.stdout)
+    sys.stdout.write("\n")
+    return EXIT_OK if output["ok"] else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
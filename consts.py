@@ -17,3 +17,112 @@ class Color:
     ERROR_VALIDATION_COLOR: int = 13
     WINDOW_COLOR: int = 14
     EDITOR_COLOR: int = 15
+
+
+class Cache:
+    """
+    Class for constant parameters of the network state cache.
+    """
+
+    STATE_TTL: float = 30.0
+    SNAPSHOT_PATH: str = "~/.cache/nmstate-tui/state.json"
+
+
+class Ui:
+    """
+    Class for constant parameters of the user interface.
+    """
+
+    POLL_INTERVAL: int = 100
+
+
+class ApplyResult:
+    """
+    Class for constant results of applying the interface changes.
+    """
+
+    NO_CHANGE: str = "no change"
+    OK: str = "Ok"
+    QUEUED: str = "queued"
+    CANCELLED: str = "cancelled"
+    ADDRESS_CONFLICT: str = "address conflict"
+
+
+class Watcher:
+    """
+    Class for constant parameters of the watcher of the link and address changes.
+    """
+
+    READ_TIMEOUT: float = 0.5
+    BUFFER_SIZE: int = 65536
+
+
+class Hosts:
+    """
+    Class for constant parameters of the multi-host mode.
+    """
+
+    AGENT_COMMAND: str = "ssh {host} sudo python3 agent.py"
+    MAX_WORKERS: int = 32
+    TIMEOUT: float = 60.0
+    READ_SIZE: int = 65536
+
+
+class Netns:
+    """
+    Class for constant parameters of the network namespaces.
+    """
+
+    RUN_DIR: str = "/run/netns"
+    ROOT: str = "root"
+    CLONE_NEWNET: int = 0x40000000
+
+
+class Rollout:
+    """
+    Class for constant parameters and target results of the rollout.
+    """
+
+    CANARY: int = 1
+    WINDOW: int = 32
+    MAX_FAILURE_RATE: float = 0.2
+
+    OK: str = "ok"
+    FAILED: str = "failed"
+    CANCELLED: str = "cancelled"
+    SKIPPED: str = "skipped"
+
+
+class Tracing:
+    """
+    Class for constant parameters of the tracing spans and the debug overlay.
+    """
+
+    CAPACITY: int = 256
+    OVERLAY_ROWS: int = 10
+    OVERLAY_WIDTH: int = 28
+
+
+class Address:
+    """
+    Class for constant parameters of the static IPv4 addresses.
+    """
+
+    DEFAULT_PREFIX_LENGTH: int = 24
+    SEPARATOR: str = ", "
+    OTHER_INTERFACES_KEY: str = "other-interface-addresses"
+
+
+class Journal:
+    """
+    Class for constant parameters and transaction kinds of the change journal.
+    """
+
+    PATH: str = "~/.cache/nmstate-tui/journal.jsonl"
+    FLUSH_INTERVAL: float = 0.05
+
+    APPLY: str = "apply"
+    UNDO: str = "undo"
+    REDO: str = "redo"
+    REVERT: str = "revert"
+    REPLAY: str = "replay"
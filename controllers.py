@@ -2,16 +2,27 @@
 controllers.py
 --------------
 The module contains controllers for working with the Curses library.
+The controllers are coroutines of one event loop, they await the keys, so the background work
+is checked while any of them waits for the input.
 """
 
 import curses
+import os
 
-from typing import Callable
+from concurrent.futures import Future
+from typing import Callable, TYPE_CHECKING
 
-from views import MenuView, InterfaceView
-from models import NetInterface
-from validators import get_validator
-from consts import Color
+from views import MenuView, InterfaceView, TraceOverlay
+from validators import get_validator, validate_many
+from consts import ApplyResult, Color
+from eventloop import read_key
+from tasks import ApplyTask, run_in_background
+
+if TYPE_CHECKING:
+    from models import NetInterface
+    from hosts import Host
+    from state import NetworkStore
+    from watcher import StateWatcher
 
 
 def get_editor_controller(type: str) -> Callable:
@@ -21,7 +32,7 @@ def get_editor_controller(type: str) -> Callable:
     Args:
         type: type of field to select controller
 
-    Returns: the  controller function for the editor
+    Returns: the coroutine function of the controller for the editor
     """
 
     if type in ("text", "bridge_name", "ipv4address"):
@@ -34,20 +45,27 @@ def get_editor_controller(type: str) -> Callable:
         return apply_button_controller
 
 
-def texteditor_controller(item: dict) -> None:
+async def texteditor_controller(item: dict, stdscr: curses.window) -> None:
     """
     The function handles pressing keyboard keys in the TextEdit widget.
 
     Args:
         item: description of the field and widget for the interface
+        stdscr: main application window
     """
 
     editor = item["editor"]
     editor.color = curses.color_pair(Color.EDITOR_COLOR)
+    finished = False
     curses.curs_set(1)
     while True:
         editor.show()
-        key = editor.window.getch()
+        curses.doupdate()
+        key = await read_key(editor.window, busy=ApplyTask.current is not None and not ApplyTask.current.done())
+        if key == -1:
+            if not finished:
+                finished = show_apply_progress(stdscr)
+            continue
         if key == 27:
             break
         if key in [curses.KEY_ENTER, ord("\n")]:
@@ -63,12 +81,13 @@ def texteditor_controller(item: dict) -> None:
     curses.curs_set(0)
 
 
-def checkbox_controller(item: dict) -> None:
+async def checkbox_controller(item: dict, *args) -> None:
     """
     The function handles pressing enter keys in the CheckBox widget.
 
     Args:
         item: description of the field and widget for the interface
+        args: any positional arguments parameter for compatibility
     """
 
     editor = item["editor"]
@@ -76,7 +95,7 @@ def checkbox_controller(item: dict) -> None:
     item["value"] = editor.value
 
 
-def apply_button_controller(*args) -> str:
+async def apply_button_controller(*args) -> str:
     """
     The function handles pressing enter keys in the apply button widget.
 
@@ -87,19 +106,26 @@ def apply_button_controller(*args) -> str:
     return "apply"
 
 
-def radiogroup_controller(item: dict) -> None:
+async def radiogroup_controller(item: dict, stdscr: curses.window) -> None:
     """
     The function handles pressing keys in the Radiogroup widget.
 
     Args:
         item: description of the field and widget for the interface
+        stdscr: main application window
     """
 
     editor = item["editor"]
+    finished = False
     while True:
         editor.color = curses.A_REVERSE
         editor.show()
-        key = editor.window.getch()
+        curses.doupdate()
+        key = await read_key(editor.window, busy=ApplyTask.current is not None and not ApplyTask.current.done())
+        if key == -1:
+            if not finished:
+                finished = show_apply_progress(stdscr)
+            continue
         if key == 27:
             break
         if key in [curses.KEY_ENTER, ord("\n")]:
@@ -118,14 +144,184 @@ def show_empty_interface_window(interface_win: curses.window) -> None:
         interface_win:  window to show the empty interface
     """
 
-    interface_win.clear()
+    interface_win.erase()
     interface_win.bkgd(" ", curses.color_pair(Color.INACTIVE_COLOR))
     interface_win.box()
     interface_win.addstr(0, 0, "Interface")
     interface_win.refresh()
 
 
-def interface_controller(interface: NetInterface | None, stdscr: curses.window, y: int, x: int) -> None | str:
+def validate_items(items: list[dict]) -> list[str]:
+    """
+    The function validates the values of the interface items.
+
+    Args:
+        items: description of the fields and widgets for the interface
+
+    Returns: names of the fields with errors
+    """
+
+    by_type = dict()
+    for item in items:
+        by_type.setdefault(item["type"], []).append(item)
+    failed = set()
+    for field_type, typed_items in by_type.items():
+        errors = validate_many(field_type, [item["editor"].value for item in typed_items])
+        failed.update(item["name"] for item, error in zip(typed_items, errors) if error is not None)
+    return [item["name"] for item in items if item["name"] in failed]
+
+
+def show_errors(stdscr: curses.window, errors: list[str]) -> None:
+    """
+    The function shows the names of the fields with errors in the status line.
+
+    Args:
+        stdscr: main application window
+        errors: names of the fields with errors
+    """
+
+    stdscr.addstr(1, 2, f"errors field - {', '.join(errors)}", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+    stdscr.refresh()
+
+
+def show_status(stdscr: curses.window, text: str, mode: int = curses.A_NORMAL) -> None:
+    """
+    The function shows the text in the status line.
+
+    Args:
+        stdscr: main application window
+        text: status text
+        mode: color display mode
+    """
+
+    height, width = stdscr.getmaxyx()
+    stdscr.hline(1, 2, " ", width - 2)
+    stdscr.addstr(1, 2, text[: width - 4], mode)
+    stdscr.refresh()
+
+
+def show_results(stdscr: curses.window, results: dict[str, str]) -> None:
+    """
+    The function shows the summary of the apply results in the status line.
+
+    Args:
+        stdscr: main application window
+        results: result apply for each interface
+    """
+
+    failed = {
+        name: res for name, res in results.items()
+        if res not in (ApplyResult.OK, ApplyResult.NO_CHANGE, ApplyResult.CANCELLED)
+    }
+    if failed:
+        summary = f"failed {len(failed)} of {len(results)}: {next(iter(failed.values()))}"
+        show_status(stdscr, summary, curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+    elif ApplyResult.CANCELLED in results.values():
+        show_status(stdscr, f"{ApplyResult.CANCELLED}: {len(results)} interfaces")
+    elif len(results) == 1:
+        show_status(stdscr, next(iter(results.values())))
+    else:
+        show_status(stdscr, f"{ApplyResult.OK}: {len(results)} interfaces")
+
+
+def start_apply(stdscr: curses.window, names: list[str], func: Callable, store: "NetworkStore") -> bool:
+    """
+    The function starts applying the changes in the background.
+
+    Args:
+        stdscr: main application window
+        names: names of the interfaces being changed
+        func: function that applies the changes, it receives the cancellation event
+        store: network state store the results are kept in
+
+    Returns: True if the apply has been started
+    """
+
+    if ApplyTask.current is not None:
+        show_status(stdscr, "apply is already running", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+        return False
+    task = ApplyTask.start(names, func, store)
+    show_status(stdscr, task.status())
+    return True
+
+
+def poll_apply(stdscr: curses.window) -> dict[str, str] | None:
+    """
+    The function shows the progress of the running apply.
+
+    Args:
+        stdscr: main application window
+
+    Returns: result apply for each interface when the apply has been finished, otherwise None
+    """
+
+    if ApplyTask.current is None:
+        return None
+    task = ApplyTask.pop_finished()
+    if task is None:
+        show_status(stdscr, ApplyTask.current.status())
+        return None
+    results = task.result()
+    show_results(stdscr, results)
+    return results
+
+
+def show_apply_progress(stdscr: curses.window) -> bool:
+    """
+    The function shows the progress of the running apply or its results, the finished apply
+    is left for the controller of the menu or the interface.
+
+    Args:
+        stdscr: main application window
+
+    Returns: True if the results of the finished apply have been shown
+    """
+
+    task = ApplyTask.current
+    if task is None:
+        return False
+    if task.done():
+        show_results(stdscr, task.result())
+        return True
+    show_status(stdscr, task.status())
+    return False
+
+
+def cancel_apply(stdscr: curses.window) -> None:
+    """
+    The function requests the cancellation of the running apply.
+
+    Args:
+        stdscr: main application window
+    """
+
+    if ApplyTask.current is None:
+        show_status(stdscr, "no running apply")
+        return
+    ApplyTask.current.cancel()
+    show_status(stdscr, ApplyTask.current.status())
+
+
+def hide_interface_view(interface_view: InterfaceView) -> None:
+    """
+    The function deactivates the interface window.
+
+    Args:
+        interface_view: interface view
+    """
+
+    height, width = interface_view.parent.getmaxyx()
+    interface_view.set_active(False)
+    interface_view.parent.hline(1, 1, " ", width - 2)
+    interface_view.window.erase()
+    interface_view.parent.noutrefresh()
+    interface_view.window.noutrefresh()
+    curses.doupdate()
+
+
+async def interface_controller(
+        interface: "NetInterface | None", stdscr: curses.window, y: int, x: int
+) -> None | str:
     """
     The function handles pressing keys in the InterfaceView.
 
@@ -149,49 +345,60 @@ def interface_controller(interface: NetInterface | None, stdscr: curses.window,
         return
     interface_view = InterfaceView(interfaces_win, interface.serialize(), interface)
     item = None
+    reload = False
     while True:
-        interface_view.parent.bkgd(" ", curses.color_pair(Color.ACTIVE_COLOR))
+        interface_view.set_active(True)
         interface_view.show(item)
         item = None
 
-        key = interface_view.window.getch()
+        TraceOverlay.refresh()
+        key = await read_key(interface_view.window, busy=ApplyTask.current is not None)
+        results = poll_apply(stdscr)
+        if results is not None:
+            reload = True
+            if interface.name in results:
+                hide_interface_view(interface_view)
+                return "reload"
 
         if key == 27:
-            interface_view.parent.bkgd(" ", curses.color_pair(Color.INACTIVE_COLOR))
-            interface_view.parent.hline(1, 1, " ", interfaces_width - 2)
-            interface_view.parent.refresh()
-            stdscr.hline(1, 2, " ", weight - 2)
-            stdscr.refresh()
-            interface_view.window.clear()
-            interface_view.window.refresh()
-            break
+            hide_interface_view(interface_view)
+            if ApplyTask.current is None:
+                stdscr.hline(1, 2, " ", weight - 2)
+                stdscr.refresh()
+            return "reload" if reload else None
         elif key in [curses.KEY_ENTER, ord("\n")]:
             stdscr.hline(1, 2, " ", weight - 2)
             stdscr.refresh()
             item = interface_view.items[interface_view.position]
             editor = get_editor_controller(item["type"])
-            result = editor(item)
+            result = await editor(item, stdscr)
             if result == "apply":
-                errors = []
-                for validate_item in interface_view.items:
-                    editor = validate_item["editor"]
-                    if not get_validator(validate_item["type"])(editor.value):
-                        errors.append(validate_item["name"])
+                errors = validate_items(interface_view.items)
                 if errors:
-                    stdscr.addstr(
-                        1, 2, f"errors field - {', '.join(errors)}", curses.color_pair(Color.ERROR_VALIDATION_COLOR)
-                    )
-                    stdscr.refresh()
+                    show_errors(stdscr, errors)
                 else:
-                    res = interface_view.interface.apply(
-                        **{item["name"]: item["value"] for item in interface_view.items}
-                    )
-                    stdscr.addstr(1, 2, res)
-                    stdscr.refresh()
-                    if res.lower() == "ok":
-                        interface_view.parent.clear()
-                        interface_view.parent.refresh()
-                        return "reload"
+                    values = {item["name"]: item["value"] for item in interface_view.items}
+                    if start_apply(
+                            stdscr,
+                            [interface.name],
+                            lambda cancel: {interface.name: interface.apply(cancel=cancel, **values)},
+                            interface.store,
+                    ):
+                        hide_interface_view(interface_view)
+                        return "reload" if reload else None
+        elif key == ord("a"):
+            stdscr.hline(1, 2, " ", weight - 2)
+            errors = validate_items(interface_view.items)
+            if errors:
+                show_errors(stdscr, errors)
+            else:
+                res = interface_view.interface.queue(
+                    **{item["name"]: item["value"] for item in interface_view.items}
+                )
+                stdscr.addstr(1, 2, f"{interface_view.interface.name}: {res}")
+                stdscr.refresh()
+        elif key == ord("x"):
+            cancel_apply(stdscr)
         elif key == curses.KEY_UP:
             interface_view.navigate(-1)
         elif key == curses.KEY_DOWN:
@@ -200,7 +407,181 @@ def interface_controller(interface: NetInterface | None, stdscr: curses.window,
             return "exit"
 
 
-def menu_controller(stdscr: curses.window, y: int, x: int) -> None:
+def create_store(snapshot_path: str | None = None, full_state: bool = False) -> "NetworkStore":
+    """
+    The function imports the model with the nmstate library and creates the network state store of this machine.
+
+    Args:
+        snapshot_path: file the snapshot is saved to after each refresh
+        full_state: request the whole network state of the nmstate lib instead of reading
+            the Ethernet interfaces and the bridges from the kernel
+
+    Returns: network state store
+    """
+
+    from state import NetworkStore
+
+    backend = None
+    if not full_state:
+        from kernel import KernelBackend
+
+        backend = KernelBackend()
+    return NetworkStore(backend=backend, snapshot_path=snapshot_path)
+
+
+def load_interfaces(
+        store: "NetworkStore | None" = None,
+        force: bool = False,
+        snapshot_path: str | None = None,
+        full_state: bool = False,
+        journal_path: str | None = None,
+) -> "NetworkStore":
+    """
+    The function imports the model with the nmstate library and updates the snapshot of the interfaces,
+    it is called in the background so the first frame is drawn without waiting for it. The journal
+    is opened here too, the store of the stale snapshot does not need it since its editing is disabled.
+
+    Args:
+        store: network state store, a new one is created if omitted
+        force: request the network state even if the cached one is not expired
+        snapshot_path: file the snapshot of the new store is saved to
+        full_state: the new store requests the whole network state of the nmstate lib
+        journal_path: file of the journal the store records the changes to if it has no journal yet
+
+    Returns: store with the loaded snapshot
+    """
+
+    if store is None:
+        store = create_store(snapshot_path, full_state)
+    if journal_path and store.journal is None:
+        from journal import ChangeJournal
+
+        store.journal = ChangeJournal(journal_path)
+    store.update(force=force)
+    return store
+
+
+def filter_menu(menu: MenuView, store: "NetworkStore", query: str) -> None:
+    """
+    The function shows in the menu only the interfaces with the name, MAC, IP or controller containing the query.
+
+    Args:
+        menu: current menu
+        store: network state store
+        query: search string, the string starting with '^' matches the beginning of the fields
+    """
+
+    snapshot = store.state
+    if not query:
+        menu.set_items(list(snapshot.interfaces))
+        return
+    ids = snapshot.search_index().search(query)
+    menu.set_items([snapshot.interfaces[i] for i in ids])
+
+
+def reload_menu(menu: MenuView, store: "NetworkStore", query: str = "") -> MenuView:
+    """
+    The function creates the menu by the current snapshot of the interfaces with the same position,
+    the snapshot is updated by load_interfaces in the background.
+
+    Args:
+        menu: current menu
+        store: network state store
+        query: search string of the menu filter
+
+    Returns: new menu
+    """
+
+    new_menu = MenuView(menu.parent, list(store.state.interfaces), menu.title)
+    if query:
+        filter_menu(new_menu, store, query)
+    new_menu.navigate(menu.position)
+    return new_menu
+
+
+def refresh_menu(menu: MenuView, store: "NetworkStore", query: str = "") -> None:
+    """
+    The function redraws the menu by the patched snapshot of the interfaces, the selected interface stays selected.
+
+    Args:
+        menu: current menu
+        store: network state store
+        query: search string of the menu filter
+    """
+
+    selected = menu.items[menu.position].name if menu.items else None
+    filter_menu(menu, store, query)
+    if selected in menu.indexes:
+        menu.navigate(menu.indexes[selected])
+
+
+def watch_changes(
+        stdscr: curses.window, menu: MenuView, store: "NetworkStore", query: str, watcher: "StateWatcher"
+) -> bool:
+    """
+    The function applies the link and address changes collected by the watcher and redraws the menu.
+
+    Args:
+        stdscr: main application window
+        menu: current menu
+        store: network state store
+        query: search string of the menu filter
+        watcher: started watcher
+
+    Returns: False if the watcher has failed and must not be used anymore
+    """
+
+    from watcher import apply_events
+
+    if apply_events(store, watcher.drain()):
+        refresh_menu(menu, store, query)
+    if watcher.error is not None:
+        show_status(stdscr, f"watcher stopped: {watcher.error}", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+        return False
+    return True
+
+
+def report_journal(
+        stdscr: curses.window, store: "NetworkStore | None", reported: OSError | None, flush: bool = False
+) -> OSError | None:
+    """
+    The function shows the error of the journal once, the changes applied after it are not recorded.
+
+    Args:
+        stdscr: main application window
+        store: network state store
+        reported: error of the journal shown before
+        flush: wait until the appended transactions are written
+
+    Returns: error of the journal, None if it has not failed
+    """
+
+    journal = store.journal if store is not None else None
+    if journal is None:
+        return reported
+    if flush:
+        journal.flush()
+    if journal.error is not None and journal.error is not reported:
+        show_status(
+            stdscr,
+            f"journal failed, the changes are not recorded: {journal.error}",
+            curses.color_pair(Color.ERROR_VALIDATION_COLOR),
+        )
+    return journal.error or reported
+
+
+async def menu_controller(
+        stdscr: curses.window,
+        y: int,
+        x: int,
+        watcher: "StateWatcher | None" = None,
+        store: "NetworkStore | None" = None,
+        title: str = "Menu",
+        query: str = "",
+        snapshot_path: str | None = None,
+        full_state: bool = False,
+        journal_path: str | None = None,
+) -> None | str:
     """
     The function handles pressing keys in the MenuView.
 
@@ -208,6 +589,19 @@ def menu_controller(stdscr: curses.window, y: int, x: int) -> None:
         stdscr: main application window
         y: indent from top edge
         x: indent from left edge
+        watcher: watcher of the link and address changes, without it the list is updated only on reload
+        store: network state store of the host chosen in the host menu, the local one is loaded if omitted
+        title: title of the menu
+        query: initial search string of the menu filter
+        snapshot_path: file of the snapshot saved by the previous run, it is shown as stale
+            until the network state is loaded, the new snapshot is saved to it
+        full_state: request the whole network state of the nmstate lib instead of reading
+            the Ethernet interfaces and the bridges from the kernel
+        journal_path: file of the journal of the local changes, the last change is undone by 'u'
+            and redone by 'U', the journal is closed on return. The error of the journal is shown once,
+            the exit waits for the journal to be written and is cancelled to show its new error
+
+    Returns: "back" if the host menu must be shown again, "exit" to exit, otherwise None
     """
 
     height, width = stdscr.getmaxyx()
@@ -219,30 +613,263 @@ def menu_controller(stdscr: curses.window, y: int, x: int) -> None:
 
     menu_win = stdscr.subwin(menu_height, menu_width, menu_top, menu_left)
 
-    NetInterface.update_interfaces()
-    menu = MenuView(menu_win, NetInterface.ethernet_interfaces)
-    interface_controller(None, stdscr, y, x + x + menu_width)
+    menu = MenuView(menu_win, [], title)
+    await interface_controller(None, stdscr, y, x + x + menu_width)
+    host_mode = store is not None
+    host_store = store
+    if host_store is not None:
+        host_store.results = dict()
+    local_store = None
+    loading: Future | None = None
+    refreshing: Future | None = None
+    reported = None
+    if store is None:
+        if snapshot_path is not None and os.path.exists(os.path.expanduser(snapshot_path)):
+            local_store = create_store(snapshot_path, full_state)
+            if local_store.load_snapshot():
+                store = local_store
+                menu.set_items(list(store.state.interfaces))
+        loading = run_in_background(load_interfaces, local_store, False, snapshot_path, full_state, journal_path)
+        show_status(stdscr, "stale snapshot, loading interfaces..." if store is not None else "loading interfaces...")
+    elif store.cache.peek() is None:
+        loading = run_in_background(load_interfaces, store)
+        show_status(stdscr, "loading interfaces...")
+        store = None
+    else:
+        menu = reload_menu(menu, store, query)
+        refreshing = run_in_background(load_interfaces, store)
+    searching = False
+    try:
+        while True:
+            if refreshing is not None and refreshing.done():
+                try:
+                    refreshing.result()
+                except Exception as e:
+                    show_status(stdscr, f"loading failed: {e}", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+                else:
+                    menu = reload_menu(menu, store, query)
+                refreshing = None
+            if loading is not None and loading.done():
+                try:
+                    store = loading.result()
+                except Exception as e:
+                    show_status(stdscr, f"loading failed: {e}", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+                else:
+                    if not host_mode:
+                        local_store = store
+                    store.results = dict()
+                    stdscr.hline(1, 2, " ", width - 2)
+                    stdscr.refresh()
+                    menu = reload_menu(menu, store, query)
+                loading = None
+
+            if store is not None:
+                menu.set_stale(store.stale)
+                menu.marks = {**store.results, **{name: ApplyResult.QUEUED for name in store.pending}}
+            menu.set_active(True)
+            menu.show()
+            TraceOverlay.refresh()
+            key = await read_key(menu.window, busy=ApplyTask.current is not None)
+            if poll_apply(stdscr) is not None and store is not None:
+                menu = reload_menu(menu, store, query)
+                if refreshing is None:
+                    refreshing = run_in_background(load_interfaces, store)
+            reported = report_journal(stdscr, store, reported)
+            if watcher is not None and store is not None and not watch_changes(stdscr, menu, store, query, watcher):
+                watcher = None
+
+            if searching:
+                if key in [curses.KEY_ENTER, ord("\n")]:
+                    searching = False
+                    show_status(stdscr, f"filter: {query}" if query else "")
+                    continue
+                if key == 27:
+                    searching = False
+                    query = ""
+                elif key in [curses.KEY_BACKSPACE, 127, 8]:
+                    query = query[:-1]
+                elif 32 <= key < 127:
+                    query += chr(key)
+                else:
+                    continue
+                if store is not None:
+                    filter_menu(menu, store, query)
+                show_status(stdscr, f"/{query}" if searching else "")
+            elif key == ord("q"):
+                error = report_journal(stdscr, store, reported, flush=True)
+                if error is not reported:
+                    reported = error
+                    continue
+                return "exit" if host_mode else None
+            elif key == 27 and host_mode:
+                return "back"
+            elif key == curses.KEY_UP:
+                menu.navigate(-1)
+            elif key == curses.KEY_DOWN:
+                menu.navigate(1)
+            elif key == curses.KEY_PPAGE:
+                menu.page(-1)
+            elif key == curses.KEY_NPAGE:
+                menu.page(1)
+            elif key == curses.KEY_HOME:
+                menu.home()
+            elif key == curses.KEY_END:
+                menu.end()
+            elif key == ord("r"):
+                if ApplyTask.current is not None or loading is not None:
+                    show_status(stdscr, "apply or loading is running", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+                else:
+                    if host_mode:
+                        loading = run_in_background(load_interfaces, host_store, True)
+                    else:
+                        local_store = store if store is not None else local_store
+                        loading = run_in_background(
+                            load_interfaces, local_store, True, snapshot_path, full_state, journal_path
+                        )
+                    show_status(stdscr, "loading interfaces...")
+            elif store is None:
+                continue
+            elif store.stale and key in [curses.KEY_ENTER, ord("\n"), ord("c"), ord("u"), ord("U")]:
+                show_status(
+                    stdscr,
+                    "stale snapshot, editing is disabled until the interfaces are loaded",
+                    curses.color_pair(Color.ERROR_VALIDATION_COLOR),
+                )
+            elif key in [curses.KEY_ENTER, ord("\n")] and menu.items:
+                menu.set_active(False)
+                menu.show()
+                res = await interface_controller(
+                    menu.items[menu.position], stdscr, y, x + x + menu_width
+                )
+                if res == "reload":
+                    menu = reload_menu(menu, store, query)
+                    if refreshing is None:
+                        refreshing = run_in_background(load_interfaces, store)
+                elif res == "exit":
+                    error = report_journal(stdscr, store, reported, flush=True)
+                    if error is not reported:
+                        reported = error
+                        continue
+                    return "exit" if host_mode else None
+            elif key == ord("c"):
+                if not store.pending:
+                    show_status(stdscr, "no queued changes")
+                else:
+                    start_apply(stdscr, list(store.pending), store.commit, store)
+            elif key in [ord("u"), ord("U")]:
+                undo = key == ord("u")
+                transaction = None
+                if store.journal is not None:
+                    transaction = store.journal.undo_target() if undo else store.journal.redo_target()
+                if transaction is None:
+                    show_status(stdscr, "nothing to undo" if undo else "nothing to redo")
+                else:
+                    start_apply(stdscr, list(transaction.before), store.undo if undo else store.redo, store)
+            elif key == ord("x"):
+                cancel_apply(stdscr)
+            elif key == ord("/"):
+                searching = True
+                show_status(stdscr, f"/{query}")
+    finally:
+        if local_store is not None and local_store.journal is not None:
+            local_store.journal.close()
+
+
+async def hosts_controller(stdscr: curses.window, y: int, x: int, hosts: list["Host"]) -> None:
+    """
+    The function handles pressing keys in the menu of the hosts, the chosen host is opened in the interface menu.
+    The network states of all hosts are requested concurrently in the background. The '/' key filters the hosts
+    by the name and by the interfaces, the found interfaces are filtered in the menu of the opened host.
+
+    Args:
+        stdscr: main application window
+        y: indent from top edge
+        x: indent from left edge
+        hosts: hosts of the multi-host mode
+    """
+
+    from hosts import filter_hosts, refresh_hosts
+
+    height, width = stdscr.getmaxyx()
+    menu_width = 35
+    menu_win = stdscr.subwin(height - y, menu_width, y, x)
+    menu = MenuView(menu_win, hosts, "Hosts")
+    await interface_controller(None, stdscr, y, x + x + menu_width)
+    loading: Future | None = run_in_background(refresh_hosts, hosts)
+    show_status(stdscr, f"loading {len(hosts)} hosts...")
+    query = ""
+    searching = False
     while True:
-        menu.parent.bkgd(" ", curses.color_pair(Color.ACTIVE_COLOR))
-        menu.window.bkgd(" ", curses.color_pair(Color.ACTIVE_COLOR))
-        menu.show()
-        key = menu.window.getch()
+        if loading is not None and loading.done():
+            try:
+                loading.result()
+            except Exception as e:
+                show_status(stdscr, f"loading failed: {e}", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+            else:
+                failed = [host for host in hosts if host.error is not None]
+                if failed:
+                    show_status(
+                        stdscr,
+                        f"failed {len(failed)} of {len(hosts)} hosts",
+                        curses.color_pair(Color.ERROR_VALIDATION_COLOR),
+                    )
+                else:
+                    show_status(stdscr, f"loaded {len(hosts)} hosts")
+            loading = None
+            menu.set_items(filter_hosts(hosts, query))
 
-        if key in [curses.KEY_ENTER, ord("\n")]:
-            menu.parent.bkgd(" ", curses.color_pair(Color.INACTIVE_COLOR))
-            menu.window.bkgd(" ", curses.color_pair(Color.INACTIVE_COLOR))
-            menu.parent.refresh()
-            res = interface_controller(
-                menu.items[menu.position], stdscr, y, x + x + menu_width
-            )
-            if res == "reload":
-                NetInterface.update_interfaces()
-                menu = MenuView(menu_win, NetInterface.ethernet_interfaces)
-            elif res == "exit":
-                break
+        menu.marks = {host.name: host.status() for host in hosts}
+        menu.set_active(True)
+        menu.show()
+        TraceOverlay.refresh()
+        key = await read_key(menu.window, busy=ApplyTask.current is not None)
+        poll_apply(stdscr)
+
+        if searching:
+            if key in [curses.KEY_ENTER, ord("\n")]:
+                searching = False
+                show_status(stdscr, f"filter: {query}" if query else "")
+                continue
+            if key == 27:
+                searching = False
+                query = ""
+            elif key in [curses.KEY_BACKSPACE, 127, 8]:
+                query = query[:-1]
+            elif 32 <= key < 127:
+                query += chr(key)
+            else:
+                continue
+            menu.set_items(filter_hosts(hosts, query))
+            show_status(stdscr, f"/{query}" if searching else "")
+        elif key == ord("q"):
+            break
         elif key == curses.KEY_UP:
             menu.navigate(-1)
         elif key == curses.KEY_DOWN:
             menu.navigate(1)
-        elif key == ord("q"):
-            break
+        elif key == curses.KEY_PPAGE:
+            menu.page(-1)
+        elif key == curses.KEY_NPAGE:
+            menu.page(1)
+        elif key == curses.KEY_HOME:
+            menu.home()
+        elif key == curses.KEY_END:
+            menu.end()
+        elif key == ord("r"):
+            if loading is not None:
+                show_status(stdscr, "loading is running", curses.color_pair(Color.ERROR_VALIDATION_COLOR))
+            else:
+                loading = run_in_background(refresh_hosts, hosts, True)
+                show_status(stdscr, f"loading {len(hosts)} hosts...")
+        elif key == ord("/"):
+            searching = True
+            show_status(stdscr, f"/{query}")
+        elif key in [curses.KEY_ENTER, ord("\n")] and menu.items:
+            host = menu.items[menu.position]
+            stdscr.hline(1, 2, " ", width - 2)
+            interfaces_query = query if query and host.store.state.search_index().search(query) else ""
+            res = await menu_controller(stdscr, y, x, store=host.store, title=host.name, query=interfaces_query)
+            if res == "exit":
+                break
+            menu.redraw()
+            await interface_controller(None, stdscr, y, x + x + menu_width)
@@ -0,0 +1,60 @@
+"""
+diff.py
+---------
+The module contains functions for comparing the desired state with the current network state,
+so that only the interfaces that actually change are sent to the nmstate library.
+"""
+
+from typing import Any
+
+from libnmstate.schema import Interface
+
+
+def is_subset(desired: Any, current: Any) -> bool:
+    """
+    The function checks whether the desired value is already present in the current one.
+    Dictionaries are compared by the keys of the desired value, lists are compared without taking
+    the order into account, other values are compared for equality.
+
+    Args:
+        desired: desired value
+        current: current value
+
+    Returns: bool - True if the desired value does not change the current one
+    """
+
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        return all(key in current and is_subset(value, current[key]) for key, value in desired.items())
+    if isinstance(desired, list):
+        if not isinstance(current, list) or len(desired) != len(current):
+            return False
+        rest = list(current)
+        for value in desired:
+            for i, item in enumerate(rest):
+                if is_subset(value, item):
+                    del rest[i]
+                    break
+            else:
+                return False
+        return True
+    return desired == current
+
+
+def diff_interfaces(net_state: dict, desired: list[dict]) -> list[dict]:
+    """
+    The function returns the desired interface states that change the current network state.
+
+    Args:
+        net_state: current network state
+        desired: desired interface states
+
+    Returns: list of the changed interface states
+    """
+
+    current = {interface[Interface.NAME]: interface for interface in net_state.get(Interface.KEY, [])}
+    return [
+        interface for interface in desired
+        if not is_subset(interface, current.get(interface[Interface.NAME]))
+    ]
@@ -0,0 +1,119 @@
+"""
+eventloop.py
+--------------
+The module contains the reader of the keys for the asyncio event loop of the user interface. The controllers are
+coroutines awaiting the keys, the loop waits for the terminal input, the wake-ups of the background threads
+and the timers at once, so nothing is polled while the application is idle.
+"""
+
+import asyncio
+import sys
+
+from typing import Awaitable
+
+from consts import Ui
+
+
+class InputReader:
+    """
+    Class - the reader of the curses keys in the event loop.
+
+    The key is awaited until the terminal is readable, a background thread calls wake() or the timeout expires,
+    the wake-up and the timeout return curses.ERR (-1) like getch() of the window with the timeout,
+    so the controllers check the background work on each iteration.
+    """
+
+    current = None
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, fd: int | None = None):
+        """
+        The initialization of the reader, the terminal is watched at once.
+
+        Args:
+            loop: running event loop
+            fd: descriptor of the terminal input, the standard input by default
+        """
+
+        self.loop = loop
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        self.event = asyncio.Event()
+        self.loop.add_reader(self.fd, self.event.set)
+
+    def wake(self) -> None:
+        """The method interrupts the waiting for a key, it can be called from any thread."""
+
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            pass
+
+    async def read_key(self, window, timeout: float | None = None) -> int:
+        """
+        The method waits for the key pressed in the window.
+
+        Args:
+            window: window that reads the keys
+            timeout: maximum time to wait in seconds, None waits until a key or a wake-up
+
+        Returns: key code or -1 on the wake-up or the timeout
+        """
+
+        window.nodelay(True)
+        key = window.getch()
+        if key != -1:
+            return key
+        self.event.clear()
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return -1
+        return window.getch()
+
+    def close(self) -> None:
+        """The method stops watching the terminal."""
+
+        self.loop.remove_reader(self.fd)
+
+
+async def read_key(window, busy: bool = False) -> int:
+    """
+    The function waits for the key pressed in the window by the reader of the running loop.
+
+    Args:
+        window: window that reads the keys
+        busy: the progress is shown, the key is waited only for Ui.POLL_INTERVAL
+
+    Returns: key code or -1 on the wake-up or the timeout
+    """
+
+    return await InputReader.current.read_key(window, Ui.POLL_INTERVAL / 1000 if busy else None)
+
+
+def wake() -> None:
+    """The function interrupts the waiting for a key of the running reader, it can be called from any thread."""
+
+    reader = InputReader.current
+    if reader is not None:
+        reader.wake()
+
+
+def run(controller: Awaitable, fd: int | None = None):
+    """
+    The function runs the controller in the new event loop with the reader of the keys.
+
+    Args:
+        controller: coroutine of the controller
+        fd: descriptor of the terminal input, the standard input by default
+
+    Returns: result of the controller
+    """
+
+    async def main():
+        InputReader.current = InputReader(asyncio.get_running_loop(), fd)
+        try:
+            return await controller
+        finally:
+            InputReader.current.close()
+            InputReader.current = None
+
+    return asyncio.run(main())
@@ -0,0 +1,188 @@
+"""
+hosts.py
+-----------
+The module contains the hosts of the multi-host mode: each host has its own network state store
+backed by the remote agent, the state requests and the applies are fanned out over a bounded thread pool,
+so refreshing many hosts takes about as long as the slowest of them.
+"""
+
+import shlex
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, TextIO
+
+from cache import StateCache
+from consts import ApplyResult, Hosts
+from remote import RemoteNmstate
+from state import NetworkStore
+
+
+class Host:
+    """Class - managed host with the network state store of its agent."""
+
+    __slots__ = ("name", "store", "error")
+
+    def __init__(self, name: str, store: NetworkStore):
+        """
+        The initialization of the host.
+
+        Args:
+            name: host name
+            store: network state store of the host
+        """
+
+        self.name = name
+        self.store = store
+        self.error = None
+
+    @classmethod
+    def connect(cls, name: str, command: list[str] | None = None, timeout: float = Hosts.TIMEOUT) -> "Host":
+        """
+        The method creates the host with the store backed by the remote agent,
+        the agent is started on the first request.
+
+        Args:
+            name: host name
+            command: command starting the agent, Hosts.AGENT_COMMAND for the host by default
+            timeout: maximum time of one call of the agent in seconds
+
+        Returns: host
+        """
+
+        if command is None:
+            command = shlex.split(Hosts.AGENT_COMMAND.format(host=shlex.quote(name)))
+        backend = RemoteNmstate(command, timeout)
+        return cls(name, NetworkStore(StateCache(backend=backend), backend=backend))
+
+    @property
+    def loaded(self) -> bool:
+        """The property returns True if the network state of the host has been received."""
+
+        return self.store.cache.peek() is not None
+
+    def status(self) -> str:
+        """
+        The method returns the status shown next to the host name.
+
+        Returns: status text
+        """
+
+        if self.error is not None:
+            return f"error: {self.error}"
+        if not self.loaded:
+            return "..."
+        pending = f", {len(self.store.pending)} {ApplyResult.QUEUED}" if self.store.pending else ""
+        return f"{len(self.store.state.interfaces)} ifaces{pending}"
+
+    def refresh(self, force: bool = False) -> "Host":
+        """
+        The method updates the snapshot of the host, the error is kept instead of raised,
+        also the failure of the agent or of the process pool of the namespaces.
+
+        Args:
+            force: request the network state even if the cached one is not expired
+
+        Returns: the host
+        """
+
+        try:
+            self.store.update(force=force)
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+        else:
+            self.error = None
+        return self
+
+    def close(self) -> None:
+        """The method stops the agent of the host."""
+
+        self.store.backend.close()
+
+    def __str__(self):
+        return self.name
+
+
+def load_hosts(stream: TextIO) -> list[Host]:
+    """
+    The function reads the hosts file: one host per line, the name is optionally followed by the command
+    starting its agent, the empty lines and the lines starting with '#' are skipped.
+
+    Args:
+        stream: hosts file
+
+    Returns: hosts in the order of the file
+    """
+
+    hosts = []
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, *command = shlex.split(line)
+        hosts.append(Host.connect(name, command or None))
+    return hosts
+
+
+def filter_hosts(hosts: list[Host], query: str) -> list[Host]:
+    """
+    The function returns the hosts with the name containing the query or with the interfaces matching it.
+
+    Args:
+        hosts: hosts
+        query: search string of the interfaces, the string starting with '^' matches the beginning of the fields
+
+    Returns: matching hosts in the order of the hosts
+    """
+
+    if not query:
+        return list(hosts)
+    return [
+        host for host in hosts
+        if query.lstrip("^").lower() in host.name.lower() or host.store.state.search_index().search(query)
+    ]
+
+
+def fan_out(func: Callable, items: Iterable, max_workers: int = Hosts.MAX_WORKERS) -> list:
+    """
+    The function calls the function for each item in the bounded thread pool.
+
+    Args:
+        func: function of one item
+        items: items
+        max_workers: maximum number of the simultaneous calls
+
+    Returns: results in the order of the items
+    """
+
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix="host") as executor:
+        return list(executor.map(func, items))
+
+
+def refresh_hosts(hosts: list[Host], force: bool = False, max_workers: int = Hosts.MAX_WORKERS) -> list[Host]:
+    """
+    The function updates the snapshots of all hosts concurrently.
+
+    Args:
+        hosts: hosts
+        force: request the network state even if the cached one is not expired
+        max_workers: maximum number of the simultaneous requests
+
+    Returns: the hosts
+    """
+
+    return fan_out(lambda host: host.refresh(force), hosts, max_workers)
+
+
+def close_hosts(hosts: list[Host]) -> None:
+    """
+    The function stops the agents of all hosts.
+
+    Args:
+        hosts: hosts
+    """
+
+    for host in hosts:
+        host.close()
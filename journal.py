@@ -0,0 +1,350 @@
+"""
+journal.py
+------------
+The module contains the local journal of the applied changes. Each transaction keeps the desired state
+sent to the backend and the state of each changed interface before it, so the change can be undone,
+redone, replayed on another host or one interface can be reverted to a moment in the past
+without comparing the whole network state.
+
+The journal is a file of JSON lines that is only appended to, the lines are written and synced
+by the writer thread in batches, so the apply does not wait for the disk. The file is locked from
+the first appended transaction until the batch is written, so the processes sharing the journal
+(the application and cli.py) read the transactions of each other and never reuse the same number.
+The schema of the nmstate lib is imported by the functions, so the journal is opened before the lib is loaded.
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+
+from bisect import bisect_right
+from typing import Callable, NamedTuple
+
+from consts import Journal
+
+
+class Transaction(NamedTuple):
+    """Class - applied change: the desired state and the states of the changed interfaces before it."""
+
+    id: int
+    time: float
+    kind: str
+    target: int | None
+    state: dict
+    before: dict[str, dict]
+
+
+def restore_state(name: str, entry: dict | None) -> dict:
+    """
+    The function returns the desired interface state that restores the cached entry of the interface,
+    only the fields the application changes are kept.
+
+    Args:
+        name: interface name
+        entry: cached interface state, None if the interface does not exist
+
+    Returns: desired interface state
+    """
+
+    from libnmstate.schema import Interface, InterfaceIPv4, InterfaceState, InterfaceType, LinuxBridge
+
+    if entry is None:
+        return {Interface.NAME: name, Interface.STATE: InterfaceState.ABSENT}
+    state = {
+        Interface.NAME: name,
+        Interface.TYPE: entry.get(Interface.TYPE),
+        Interface.STATE: entry.get(Interface.STATE),
+    }
+    ipv4 = entry.get(Interface.IPV4)
+    if ipv4 is not None:
+        restored = {InterfaceIPv4.ENABLED: bool(ipv4.get(InterfaceIPv4.ENABLED))}
+        if restored[InterfaceIPv4.ENABLED]:
+            restored[InterfaceIPv4.DHCP] = bool(ipv4.get(InterfaceIPv4.DHCP))
+            if not restored[InterfaceIPv4.DHCP]:
+                restored[InterfaceIPv4.ADDRESS] = [
+                    {
+                        InterfaceIPv4.ADDRESS_IP: address[InterfaceIPv4.ADDRESS_IP],
+                        InterfaceIPv4.ADDRESS_PREFIX_LENGTH: address[InterfaceIPv4.ADDRESS_PREFIX_LENGTH],
+                    }
+                    for address in ipv4.get(InterfaceIPv4.ADDRESS, [])
+                ]
+        state[Interface.IPV4] = restored
+    if entry.get(Interface.TYPE) == InterfaceType.LINUX_BRIDGE:
+        ports = entry.get(LinuxBridge.CONFIG_SUBTREE, {}).get(LinuxBridge.PORT_SUBTREE, [])
+        state[LinuxBridge.CONFIG_SUBTREE] = {
+            LinuxBridge.PORT_SUBTREE: [{LinuxBridge.Port.NAME: port[LinuxBridge.Port.NAME]} for port in ports]
+        }
+    else:
+        state[Interface.CONTROLLER] = entry.get(Interface.CONTROLLER, "")
+    return state
+
+
+def minimal_state(interfaces: list[dict], get_interface: Callable[[str], dict | None]) -> list[dict]:
+    """
+    The function keeps only the desired interface states that change the cached entries of the interfaces,
+    each interface is looked up by its name, so the whole network state is not compared.
+
+    Args:
+        interfaces: desired interface states
+        get_interface: function returning the cached entry of the interface by its name
+
+    Returns: desired interface states that change the network state
+    """
+
+    from libnmstate.schema import Interface, InterfaceState
+
+    from diff import is_subset
+
+    changed = []
+    for iface_state in interfaces:
+        current = get_interface(iface_state[Interface.NAME])
+        if iface_state.get(Interface.STATE) == InterfaceState.ABSENT:
+            if current is not None:
+                changed.append(iface_state)
+            continue
+        if iface_state.get(Interface.CONTROLLER) == "" and not (current or {}).get(Interface.CONTROLLER):
+            iface_state = {key: value for key, value in iface_state.items() if key != Interface.CONTROLLER}
+        if not is_subset(iface_state, current):
+            changed.append(iface_state)
+    return changed
+
+
+class ChangeJournal:
+    """
+    Class - the journal of the applied changes with the indexes of the transactions.
+
+    The transactions are numbered from 1 in the order they have been applied. The done and undone stacks
+    are the transactions undo() and redo() take next, the transactions of each interface are kept
+    by time, so the state of the interface at a moment is the state before the first later transaction.
+    """
+
+    def __init__(self, path: str = Journal.PATH, flush_interval: float = Journal.FLUSH_INTERVAL):
+        """
+        The initialization of the journal, the transactions of the previous runs are read from the file.
+
+        Args:
+            path: file of the journal
+            flush_interval: time the writer waits for more transactions before syncing the file
+        """
+
+        self.path = os.path.expanduser(path)
+        self.flush_interval = flush_interval
+        self.transactions = []
+        self.done = []
+        self.undone = []
+        self.error = None
+        self._by_id = dict()
+        self._times = dict()
+        self._ids = dict()
+        self._torn = False
+        self._offset = 0
+        self._stream = None
+        self._locked = False
+        self._lines = []
+        self._appended = 0
+        self._synced = 0
+        self._closed = False
+        self._writer = None
+        self._condition = threading.Condition()
+        self._load()
+
+    def _load(self) -> None:
+        """
+        The method reads the transactions appended to the file after the last read one, at first
+        the transactions of the previous runs, then the ones of the other processes sharing the journal.
+        The line cut off by a crash is skipped and the next line is written after it.
+        """
+
+        try:
+            with open(self.path, "rb") as stream:
+                stream.seek(self._offset)
+                data = stream.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1
+        self._torn = end < len(data)
+        self._offset += end
+        for line in data[:end].splitlines():
+            try:
+                transaction = Transaction(**json.loads(line))
+            except (ValueError, TypeError):
+                continue
+            if transaction.id not in self._by_id:
+                self._index(transaction)
+
+    def _lock(self) -> None:
+        """
+        The method locks the file until the appended lines are written and reads the transactions
+        the other processes have written before, so the next transaction is numbered after them.
+        """
+
+        try:
+            if self._stream is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._stream = open(self.path, "ab")
+            fcntl.flock(self._stream.fileno(), fcntl.LOCK_EX)
+        except OSError as e:
+            self.error = e
+            return
+        self._locked = True
+        self._load()
+
+    def _unlock(self) -> None:
+        """The method unlocks the file after the appended lines have been written."""
+
+        if self._locked:
+            self._locked = False
+            fcntl.flock(self._stream.fileno(), fcntl.LOCK_UN)
+
+    def _index(self, transaction: Transaction) -> None:
+        """
+        The method adds the transaction to the indexes.
+
+        Args:
+            transaction: applied transaction
+        """
+
+        self.transactions.append(transaction)
+        self._by_id[transaction.id] = transaction
+        for name in transaction.before:
+            self._times.setdefault(name, []).append(transaction.time)
+            self._ids.setdefault(name, []).append(transaction.id)
+        if transaction.kind == Journal.UNDO:
+            if self.done and self.done[-1] == transaction.target:
+                self.undone.append(self.done.pop())
+        elif transaction.kind == Journal.REDO:
+            if self.undone and self.undone[-1] == transaction.target:
+                self.done.append(self.undone.pop())
+        else:
+            self.done.append(transaction.id)
+            self.undone.clear()
+
+    def append(self, kind: str, state: dict, before: dict[str, dict], target: int | None = None) -> Transaction:
+        """
+        The method adds the applied transaction to the journal, the line is written by the writer thread.
+
+        Args:
+            kind: kind of the transaction
+            state: desired state sent to the backend
+            before: desired states restoring the changed interfaces
+            target: transaction undone, redone or replayed by this one
+
+        Returns: added transaction
+        """
+
+        with self._condition:
+            if not self._locked:
+                self._lock()
+            now = time.time()
+            if self.transactions:
+                now = max(now, self.transactions[-1].time)
+            transaction_id = self.transactions[-1].id + 1 if self.transactions else 1
+            transaction = Transaction(transaction_id, now, kind, target, state, before)
+            self._index(transaction)
+            self._lines.append(json.dumps(transaction._asdict(), separators=(",", ":"), default=str) + "\n")
+            self._appended += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write, name="journal", daemon=True)
+                self._writer.start()
+            self._condition.notify_all()
+        return transaction
+
+    def _write(self) -> None:
+        """The method writes the lines of the journal, the lines appended within the interval share one sync."""
+
+        while True:
+            with self._condition:
+                while not self._lines and not self._closed:
+                    self._condition.wait()
+                if not self._lines:
+                    return
+                closed = self._closed
+            if not closed:
+                time.sleep(self.flush_interval)
+            with self._condition:
+                lines, self._lines = self._lines, []
+                count = len(lines)
+                if self._torn:
+                    lines.insert(0, "\n")
+                    self._torn = False
+                stream = self._stream
+            try:
+                if stream is not None:
+                    stream.write("".join(lines).encode())
+                    stream.flush()
+                    os.fsync(stream.fileno())
+                    if self._locked:
+                        self._offset = stream.tell()
+            except OSError as e:
+                self.error = e
+            with self._condition:
+                self._synced += count
+                if not self._lines:
+                    self._unlock()
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """The method waits until the appended transactions are written and synced."""
+
+        with self._condition:
+            appended = self._appended
+            self._condition.wait_for(lambda: self._synced >= appended)
+
+    def close(self) -> None:
+        """The method writes the rest of the transactions and stops the writer."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+        with self._condition:
+            if self._writer is writer:
+                self._writer = None
+            if self._stream is not None:
+                self._unlock()
+                self._stream.close()
+                self._stream = None
+
+    def get(self, transaction_id: int) -> Transaction | None:
+        """
+        The method returns the transaction by its number.
+
+        Args:
+            transaction_id: number of the transaction
+
+        Returns: transaction or None if there is no such transaction
+        """
+
+        return self._by_id.get(transaction_id)
+
+    def undo_target(self) -> Transaction | None:
+        """The method returns the last applied transaction that has not been undone."""
+
+        return self.get(self.done[-1]) if self.done else None
+
+    def redo_target(self) -> Transaction | None:
+        """The method returns the last undone transaction."""
+
+        return self.get(self.undone[-1]) if self.undone else None
+
+    def state_at(self, name: str, timestamp: float) -> dict | None:
+        """
+        The method returns the desired state restoring the interface as it was at the moment,
+        it is the state before the first transaction changing the interface after the moment.
+
+        Args:
+            name: interface name
+            timestamp: moment as the seconds since the epoch
+
+        Returns: desired interface state or None if the interface has not been changed since the moment
+        """
+
+        times = self._times.get(name, [])
+        position = bisect_right(times, timestamp)
+        if position == len(times):
+            return None
+        return self.get(self._ids[name][position]).before[name]
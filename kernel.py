@@ -0,0 +1,139 @@
+"""
+kernel.py
+-----------
+The module contains the slim query of the network state: the links and the IPv4 addresses are dumped
+from the kernel by rtnetlink and only the Ethernet interfaces and the Linux bridges are kept with the fields
+the application reads, instead of the whole network state of the nmstate lib with the routes, DNS and
+all interface types. The changes are still applied by the nmstate lib.
+"""
+
+import itertools
+import os
+import socket
+import struct
+
+from libnmstate.schema import Interface, InterfaceIPv4, InterfaceState, InterfaceType, LinuxBridge
+
+from backends import NmstateBackend
+from consts import Address, Watcher
+from watcher import IFADDRMSG, IFINFOMSG, NLMSG_HEADER, AddressEvent, LinkEvent, parse_messages
+
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+RTM_GETLINK = 18
+RTM_GETADDR = 22
+
+_sequence = itertools.count(1)
+
+
+def dump(sock: socket.socket, type: int, payload: bytes, names: dict[int, str]) -> list[LinkEvent | AddressEvent]:
+    """
+    The function requests the dump of the links or the addresses and parses the replies.
+
+    Args:
+        sock: rtnetlink socket
+        type: type of the request
+        payload: header of the request
+        names: interface names by their indexes, it is updated by the link messages
+
+    Returns: events of the dumped objects
+    """
+
+    sequence = next(_sequence)
+    header = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(payload), type, NLM_F_REQUEST | NLM_F_DUMP, sequence, 0)
+    sock.send(header + payload)
+    events = []
+    while True:
+        data = sock.recv(Watcher.BUFFER_SIZE)
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length, message_type, _, message_sequence, _ = NLMSG_HEADER.unpack_from(data, offset)
+            if length < NLMSG_HEADER.size:
+                break
+            if message_sequence == sequence and message_type == NLMSG_DONE:
+                return events + parse_messages(data[:offset], names)
+            if message_sequence == sequence and message_type == NLMSG_ERROR:
+                error = -struct.unpack_from("=i", data, offset + NLMSG_HEADER.size)[0]
+                raise OSError(error, os.strerror(error))
+            offset += (length + 3) & ~3
+        events.extend(parse_messages(data, names))
+
+
+def show_kernel() -> dict:
+    """
+    The function returns the network state of the Ethernet interfaces and the Linux bridges read from the kernel.
+    The address with a limited lifetime is a lease, so the interface with such address has DHCP enabled.
+    The addresses of the other links are kept under Address.OTHER_INTERFACES_KEY for the address conflicts.
+
+    Returns: network state in the format of the nmstate lib
+    """
+
+    names = dict()
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE) as sock:
+        sock.bind((0, 0))
+        links = dump(sock, RTM_GETLINK, IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0), names)
+        addresses = dump(sock, RTM_GETADDR, IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0), names)
+
+    by_name = dict()
+    for address in addresses:
+        by_name.setdefault(address.name, []).append(address)
+    ports = dict()
+    for link in links:
+        if link.controller:
+            ports.setdefault(link.controller, []).append({LinuxBridge.Port.NAME: link.name})
+
+    interfaces = []
+    kept = set()
+    for link in links:
+        if link.type not in (InterfaceType.ETHERNET, InterfaceType.LINUX_BRIDGE):
+            continue
+        kept.add(link.name)
+        link_addresses = by_name.get(link.name, [])
+        iface = {
+            Interface.NAME: link.name,
+            Interface.TYPE: link.type,
+            Interface.STATE: InterfaceState.UP if link.state == "up" else InterfaceState.DOWN,
+            Interface.MAC: link.mac,
+            Interface.IPV4: {
+                InterfaceIPv4.ENABLED: bool(link_addresses),
+                InterfaceIPv4.DHCP: any(address.dynamic for address in link_addresses),
+                InterfaceIPv4.ADDRESS: [
+                    {InterfaceIPv4.ADDRESS_IP: address.ip, InterfaceIPv4.ADDRESS_PREFIX_LENGTH: address.prefix_length}
+                    for address in link_addresses
+                ],
+            },
+        }
+        if link.controller:
+            iface[Interface.CONTROLLER] = link.controller
+        if link.type == InterfaceType.LINUX_BRIDGE:
+            iface[LinuxBridge.CONFIG_SUBTREE] = {LinuxBridge.PORT_SUBTREE: ports.get(link.name, [])}
+        interfaces.append(iface)
+    others = [
+        {
+            Interface.NAME: address.name,
+            InterfaceIPv4.ADDRESS_IP: address.ip,
+            InterfaceIPv4.ADDRESS_PREFIX_LENGTH: address.prefix_length,
+        }
+        for address in addresses
+        if address.name not in kept
+    ]
+    return {Interface.KEY: interfaces, Address.OTHER_INTERFACES_KEY: others}
+
+
+class KernelBackend(NmstateBackend):
+    """
+    Class - the backend of the local host reading the slim network state from the kernel,
+    the whole network state of the nmstate lib is requested only if rtnetlink is not available.
+    """
+
+    def show(self) -> dict:
+        """The method returns the network state of the Ethernet interfaces and the Linux bridges."""
+
+        try:
+            return show_kernel()
+        except OSError:
+            return super().show()
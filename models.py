@@ -5,8 +5,9 @@ The module contains classes and methods for the application to work with the nms
 """
 
 import logging
+import threading
 
-import libnmstate
+from typing import TYPE_CHECKING
 
 from libnmstate.schema import (
     Interface,
@@ -15,10 +16,18 @@ from libnmstate.schema import (
     LinuxBridge,
     InterfaceType,
 )
-from libnmstate.error import NmstateError
 
-APPLY_RESULT_NO_CHANGE = "no change"
-APPLY_RESULT_OK = "Ok"
+if TYPE_CHECKING:
+    from state import NetworkStore
+
+from consts import Address, ApplyResult
+from validators import parse_ipv4_addresses
+
+APPLY_RESULT_NO_CHANGE = ApplyResult.NO_CHANGE
+APPLY_RESULT_OK = ApplyResult.OK
+APPLY_RESULT_ADDRESS_CONFLICT = ApplyResult.ADDRESS_CONFLICT
+APPLY_RESULT_QUEUED = ApplyResult.QUEUED
+APPLY_RESULT_CANCELLED = ApplyResult.CANCELLED
 
 
 logging.getLogger("libnmstate").propagate = False
@@ -28,18 +37,23 @@ logging.getLogger("requests").propagate = False
 
 
 class NetInterface:
-    """Class - ethernet interface wrapper."""
+    """
+    Class - ethernet interface wrapper.
 
-    net_state = dict()
-    ethernet_interfaces = list()
-    bridges = list()
+    The interface is a record of one network state snapshot, it is not changed after the creation,
+    the changes are applied through the store the snapshot belongs to.
+    """
 
-    def __init__(self, *, name: str, type: str, state: str, ipv4: dict, **kwargs):
+    __slots__ = ("name", "type", "state", "controller", "mac", "ipv4", "store")
+
+    def __init__(self, *, name: str, type: str, state: str, ipv4: dict, store: "NetworkStore | None" = None, **kwargs):
         self.name = name
         self.type = type
         self.state = state
         self.controller = kwargs.get(Interface.CONTROLLER, "")
+        self.mac = kwargs.get(Interface.MAC, "")
         self.ipv4 = ipv4
+        self.store = store
 
     def state_up(self) -> dict:
         """
@@ -76,12 +90,12 @@ class NetInterface:
             },
         }
 
-    def dhcp_down(self, ip) -> dict:
+    def dhcp_down(self, addresses: str) -> dict:
         """
         The method generates the interface state with manual IP input for the netstate lib.
 
         Args:
-            ip: ip addres
+            addresses: IPv4 addresses with the optional prefix lengths, for example "10.0.2.10/24, 10.0.3.10"
 
         Returns: interface state
         """
@@ -94,8 +108,9 @@ class NetInterface:
                 InterfaceIPv4.ADDRESS: [
                     {
                         InterfaceIPv4.ADDRESS_IP: ip,
-                        InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 24,
-                    },
+                        InterfaceIPv4.ADDRESS_PREFIX_LENGTH: prefix_length,
+                    }
+                    for ip, prefix_length in parse_ipv4_addresses(addresses)
                 ],
                 InterfaceIPv4.DHCP: False,
             },
@@ -118,80 +133,89 @@ class NetInterface:
             Interface.CONTROLLER: bridge,
         }
 
-    def _create_bridge(self, bridge: str) -> None:
+    def _create_bridge(self, bridge: str) -> dict:
         """
-        The method adds the LinuxBridge configuration for the netstate library
-        to the list of bridges.
+        The method generates the LinuxBridge configuration for the netstate library
+        with the interface as the only port.
         Args:
             bridge: bridge name
+
+        Returns: bridge configuration
         """
 
-        self.bridges.append(
-            {
-                Interface.NAME: bridge,
-                Interface.TYPE: InterfaceType.LINUX_BRIDGE,
-                Interface.STATE: InterfaceState.UP,
-                Interface.IPV4: {
-                    InterfaceIPv4.ENABLED: True,
-                    InterfaceIPv4.DHCP: True,
-                },
-                LinuxBridge.CONFIG_SUBTREE: {
-                    LinuxBridge.PORT_SUBTREE: [{LinuxBridge.Port.NAME: self.name}]
-                },
-            }
-        )
+        return {
+            Interface.NAME: bridge,
+            Interface.TYPE: InterfaceType.LINUX_BRIDGE,
+            Interface.STATE: InterfaceState.UP,
+            Interface.IPV4: {
+                InterfaceIPv4.ENABLED: True,
+                InterfaceIPv4.DHCP: True,
+            },
+            LinuxBridge.CONFIG_SUBTREE: {
+                LinuxBridge.PORT_SUBTREE: [{LinuxBridge.Port.NAME: self.name}]
+            },
+        }
 
-    def _add_bridge(self, bridge: str) -> None:
+    def _add_bridge(self, bridges: dict[str, dict], bridge: str) -> None:
         """
         The method modifies or adds a bridge configuration for the netstate lib
-        to the list of bridges.
+        in the bridges by name, the modified configuration is replaced by a new one.
         Args:
+            bridges: bridge configurations by name
             bridge: bridge name
         """
 
         if not bridge:
             return
-        for item in self.bridges:
-            if item[Interface.NAME] == bridge:
-                ports = [
-                    port
-                    for port in item.get(LinuxBridge.CONFIG_SUBTREE, {}).get(
-                        LinuxBridge.PORT_SUBTREE, []
-                    )
-                ]
-                ports.append({LinuxBridge.Port.NAME: self.name})
-                item[LinuxBridge.CONFIG_SUBTREE] = {LinuxBridge.PORT_SUBTREE: ports}
-                return
-        self._create_bridge(bridge)
-
-    def _remove_bridge(self) -> None:
-        """The method removes a port from the bridge configuration for the netstate lib."""
-
-        for item in self.bridges:
-            if item[Interface.NAME] == self.controller:
-                ports = [
-                    port
-                    for port in item.get(LinuxBridge.CONFIG_SUBTREE, {}).get(
-                        LinuxBridge.PORT_SUBTREE, []
-                    )
-                    if port["name"] != self.name
-                ]
-                item[LinuxBridge.CONFIG_SUBTREE] = {LinuxBridge.PORT_SUBTREE: ports}
-                break
-
-    def update_bridges(self, bridge: str) -> None:
+        item = bridges.get(bridge)
+        if item is None:
+            bridges[bridge] = self._create_bridge(bridge)
+            return
+        ports = [
+            port
+            for port in item.get(LinuxBridge.CONFIG_SUBTREE, {}).get(
+                LinuxBridge.PORT_SUBTREE, []
+            )
+        ]
+        ports.append({LinuxBridge.Port.NAME: self.name})
+        bridges[bridge] = {**item, LinuxBridge.CONFIG_SUBTREE: {LinuxBridge.PORT_SUBTREE: ports}}
+
+    def _remove_bridge(self, bridges: dict[str, dict]) -> None:
+        """
+        The method removes a port from the bridge configuration for the netstate lib,
+        the modified configuration is replaced by a new one.
+        Args:
+            bridges: bridge configurations by name
         """
-        The method updates the bridge configuration for the netstate lib in the bridge list.
+
+        item = bridges.get(self.controller)
+        if item is None:
+            return
+        ports = [
+            port
+            for port in item.get(LinuxBridge.CONFIG_SUBTREE, {}).get(
+                LinuxBridge.PORT_SUBTREE, []
+            )
+            if port["name"] != self.name
+        ]
+        bridges[self.controller] = {**item, LinuxBridge.CONFIG_SUBTREE: {LinuxBridge.PORT_SUBTREE: ports}}
+
+    def update_bridges(self, bridges: dict[str, dict], bridge: str) -> None:
+        """
+        The method updates the bridge configuration for the netstate lib in the bridges by name.
+        The configurations are not changed in place, so the bridges of the snapshot
+        can be passed as a shallow copy.
 
         Args:
+            bridges: bridge configurations by name
             bridge: bridge name
         """
 
         if self.controller == bridge:
             return
-        self._add_bridge(bridge)
+        self._add_bridge(bridges, bridge)
         if self.controller:
-            self._remove_bridge()
+            self._remove_bridge(bridges)
 
     def _get_new_iface_state(self, **kwargs) -> dict:
         """
@@ -211,42 +235,65 @@ class NetInterface:
             return self.dhcp_up()
         elif "bridge name" in kwargs and kwargs["bridge name"]:
             return self.add_bridge(kwargs["bridge name"])
+        elif "state" in kwargs and kwargs["state"].lower() == "up":
+            return self.state_up()
         return {}
 
-    def apply(self, **kwargs) -> str:
+    def _has_changes(self, **kwargs) -> bool:
         """
-        The method applies the interface state using the netstate lib.
+        The method checks whether the values differ from the current interface values,
+        the values are compared with the record of the current snapshot of the store,
+        since this record may belong to an older snapshot.
 
         Args:
             **kwargs:
 
-        Returns: result apply
+        Returns: True if there are changes
         """
 
-        self.update_interfaces()
+        current = self
+        if self.store is not None:
+            current = self.store.state.interfaces_by_name.get(self.name, self)
         origin = {
             item["name"]: item["value"]
-            for item in self.serialize()
+            for item in current.serialize()
             if item["name"] in kwargs
         }
-        if origin == kwargs:
-            return APPLY_RESULT_NO_CHANGE
+        return origin != kwargs
+
+    def apply(self, cancel: threading.Event | None = None, **kwargs) -> str:
+        """
+        The method applies the interface state using the netstate lib.
 
-        iface = self._get_new_iface_state(**kwargs)
+        Args:
+            cancel: event to roll back the change after the verification
+            **kwargs:
+
+        Returns: result apply
+        """
 
-        if not iface:
+        if not self._has_changes(**kwargs):
             return APPLY_RESULT_NO_CHANGE
 
-        bridge_name = kwargs.get("bridge name", "") or ""
+        return self.store.apply_changes([(self, kwargs)], cancel).get(self.name, APPLY_RESULT_NO_CHANGE)
+
+    def queue(self, **kwargs) -> str:
+        """
+        The method puts the interface changes into the queue of pending changes of the store,
+        they are applied all at once by the commit method of the store.
+
+        Args:
+            **kwargs:
+
+        Returns: result of queuing
+        """
 
-        self.update_bridges(bridge_name)
+        if not self._has_changes(**kwargs) or not self._get_new_iface_state(**kwargs):
+            self.store.pending.pop(self.name, None)
+            return APPLY_RESULT_NO_CHANGE
 
-        state = {Interface.KEY: [*self.bridges, iface]}
-        try:
-            libnmstate.apply(state, verify_change=True, rollback_timeout=30)
-            return APPLY_RESULT_OK
-        except NmstateError as e:
-            return str(e)
+        self.store.pending[self.name] = (self, kwargs)
+        return APPLY_RESULT_QUEUED
 
     def __str__(self):
         ip4_address = []
@@ -274,8 +321,10 @@ class NetInterface:
 
         address = ""
         if self.state == InterfaceState.UP:
-            if InterfaceIPv4.ADDRESS in self.ipv4.keys():
-                address = self.ipv4[InterfaceIPv4.ADDRESS][0][InterfaceIPv4.ADDRESS_IP]
+            address = Address.SEPARATOR.join(
+                f"{address[InterfaceIPv4.ADDRESS_IP]}/{address[InterfaceIPv4.ADDRESS_PREFIX_LENGTH]}"
+                for address in self.ipv4.get(InterfaceIPv4.ADDRESS, [])
+            )
 
         items.append(dict(name="ipv4 address", value=address, type="ipv4address"))
         items.append(dict(name="bridge", value=bool(self.controller), type="bool"))
@@ -284,39 +333,15 @@ class NetInterface:
 
         return items
 
-    @classmethod
-    def update_interfaces(cls) -> None:
-        """The method updates the list of Ethernet interfaces, the list of bridges, and network state information."""
-
-        cls.net_state = libnmstate.show()
-        interfaces = cls.get_interfaces(cls.net_state)
-
-        cls.ethernet_interfaces = [
-            NetInterface(**interface) for interface in interfaces
-            if interface[Interface.TYPE] == InterfaceType.ETHERNET
-        ]
+    def search_fields(self) -> tuple[str, ...]:
+        """
+        The method returns the fields used to find the interface in the menu.
 
-        bridge_interfaces = [
-            interface for interface in cls.net_state[Interface.KEY]
-            if interface[Interface.TYPE] == InterfaceType.LINUX_BRIDGE
-        ]
+        Returns: name, MAC, IPv4 addresses and controller
+        """
 
-        cls.bridges = []
-        for bridge in bridge_interfaces:
-            ports = cls.get_bridge_ports(bridge)
-
-            cls.bridges.append(
-                {
-                    Interface.NAME: bridge[Interface.NAME],
-                    Interface.TYPE: InterfaceType.LINUX_BRIDGE,
-                    Interface.STATE: InterfaceState.UP,
-                    Interface.IPV4: {
-                        InterfaceIPv4.ENABLED: True,
-                        InterfaceIPv4.DHCP: True,
-                    },
-                    LinuxBridge.CONFIG_SUBTREE: {LinuxBridge.PORT_SUBTREE: [*ports]},
-                }
-            )
+        addresses = [address[InterfaceIPv4.ADDRESS_IP] for address in self.ipv4.get(InterfaceIPv4.ADDRESS, [])]
+        return self.name, self.mac, *addresses, self.controller
 
     @staticmethod
     def get_interfaces(net_state: dict) -> list:
@@ -324,6 +349,21 @@ class NetInterface:
 
         return net_state[Interface.KEY]
 
+    @staticmethod
+    def get_bridge_state(bridge: dict) -> dict:
+        """The method returns the LinuxBridge configuration for the netstate lib from bridge interface."""
+
+        return {
+            Interface.NAME: bridge[Interface.NAME],
+            Interface.TYPE: InterfaceType.LINUX_BRIDGE,
+            Interface.STATE: InterfaceState.UP,
+            Interface.IPV4: {
+                InterfaceIPv4.ENABLED: True,
+                InterfaceIPv4.DHCP: True,
+            },
+            LinuxBridge.CONFIG_SUBTREE: {LinuxBridge.PORT_SUBTREE: NetInterface.get_bridge_ports(bridge)},
+        }
+
     @staticmethod
     def get_bridge_ports(bridge: dict) -> list[dict]:
         """The method returns bridge ports from bridge interface."""
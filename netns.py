@@ -0,0 +1,261 @@
+"""
+netns.py
+----------
+The module contains the network namespaces of the host: each namespace is shown as a host of the multi-host mode
+with its own network state store. The namespace is switched per thread by setns(), so the calls of the nmstate lib
+run in the processes of the shared pool, each call enters the namespace and returns to the namespace of the process.
+"""
+
+import ctypes
+import itertools
+import multiprocessing
+import os
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+
+import libnmstate
+
+from libnmstate.schema import Interface, InterfaceState
+
+from cache import StateCache
+from consts import Netns
+from hosts import Host
+from state import NetworkStore
+
+
+def list_namespaces(run_dir: str = Netns.RUN_DIR) -> list[str]:
+    """
+    The function returns the names of the network namespaces created by "ip netns add".
+
+    Args:
+        run_dir: directory of the namespace files
+
+    Returns: sorted names, empty if there are no namespaces
+    """
+
+    try:
+        return sorted(os.listdir(run_dir))
+    except FileNotFoundError:
+        return []
+
+
+def setns(fd: int) -> None:
+    """
+    The function moves the calling thread to the network namespace.
+
+    Args:
+        fd: open file of the namespace
+    """
+
+    if hasattr(os, "setns"):
+        os.setns(fd, Netns.CLONE_NEWNET)
+        return
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.setns(fd, Netns.CLONE_NEWNET) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+@contextmanager
+def enter_namespace(namespace: str | None, run_dir: str = Netns.RUN_DIR) -> Iterator[None]:
+    """
+    The function runs the with block in the network namespace.
+
+    Args:
+        namespace: namespace name, None for the namespace of the process
+        run_dir: directory of the namespace files
+    """
+
+    if namespace is None:
+        yield
+        return
+    with open("/proc/thread-self/ns/net") as current, open(os.path.join(run_dir, namespace)) as target:
+        setns(target.fileno())
+        try:
+            yield
+        finally:
+            setns(current.fileno())
+
+
+def show_namespace(namespace: str | None) -> dict:
+    """
+    The function returns the network state of the namespace, it is called in the pool process.
+    NetworkManager manages only the namespace of the host, so the other namespaces are read from the kernel.
+
+    Args:
+        namespace: namespace name, None for the namespace of the host
+
+    Returns: network state
+    """
+
+    with enter_namespace(namespace):
+        return libnmstate.show(kernel_only=namespace is not None)
+
+
+def apply_namespace(
+        namespace: str | None,
+        desired_state: dict,
+        verify_change: bool = True,
+        commit: bool = True,
+        rollback_timeout: int = 60,
+) -> str | None:
+    """
+    The function applies the desired state in the namespace, it is called in the pool process.
+    The change of the namespace of the host is kept by the checkpoint of NetworkManager, the kernel mode
+    of the other namespaces has no checkpoints, so the change is kept at once.
+
+    Args:
+        namespace: namespace name, None for the namespace of the host
+        desired_state: desired network state
+        verify_change: verify the applied state
+        commit: keep the change of the namespace of the host at once, otherwise it waits for commit or rollback
+        rollback_timeout: seconds before the uncommitted change of the namespace of the host is rolled back
+
+    Returns: checkpoint of the uncommitted change of the namespace of the host, otherwise None
+    """
+
+    with enter_namespace(namespace):
+        if namespace is None:
+            return libnmstate.apply(
+                desired_state, verify_change=verify_change, commit=commit, rollback_timeout=rollback_timeout
+            )
+        libnmstate.apply(desired_state, verify_change=verify_change, kernel_only=True)
+        return None
+
+
+class NamespaceBackend:
+    """
+    Class - the backend of one network namespace, the calls are run in the process pool.
+
+    The namespace of the host uses the checkpoints of NetworkManager, so the uncommitted change
+    is rolled back by NetworkManager after the timeout even if the application has died.
+    The kernel mode of the other namespaces has no checkpoints, so their uncommitted change keeps
+    the previous states of the changed interfaces and the rollback applies them.
+    """
+
+    def __init__(self, namespace: str | None, executor: Executor):
+        """
+        The initialization of the backend.
+
+        Args:
+            namespace: namespace name, None for the namespace of the host
+            executor: process pool shared by the namespaces
+        """
+
+        self.namespace = namespace
+        self.executor = executor
+        self.checkpoints = dict()
+        self._ids = itertools.count(1)
+
+    def show(self) -> dict:
+        """The method returns the network state of the namespace."""
+
+        return self.executor.submit(show_namespace, self.namespace).result()
+
+    def apply(
+            self, desired_state: dict, verify_change: bool = True, commit: bool = True, rollback_timeout: int = 60
+    ) -> str | None:
+        """
+        The method applies the desired state in the namespace.
+
+        Args:
+            desired_state: desired network state
+            verify_change: verify the applied state
+            commit: keep the change at once, otherwise it waits for commit or rollback
+            rollback_timeout: seconds before the uncommitted change of the namespace of the host is rolled back,
+                the uncommitted change of the other namespaces is kept until commit or rollback
+
+        Returns: checkpoint of the uncommitted change
+        """
+
+        if self.namespace is None:
+            return self.executor.submit(
+                apply_namespace, None, desired_state, verify_change, commit, rollback_timeout
+            ).result()
+        previous = None
+        if not commit:
+            names = {iface[Interface.NAME] for iface in desired_state.get(Interface.KEY, [])}
+            current = {
+                iface[Interface.NAME]: iface
+                for iface in self.show().get(Interface.KEY, [])
+                if iface[Interface.NAME] in names
+            }
+            previous = {
+                Interface.KEY: [
+                    current.get(name, {Interface.NAME: name, Interface.STATE: InterfaceState.ABSENT})
+                    for name in sorted(names)
+                ]
+            }
+        self.executor.submit(apply_namespace, self.namespace, desired_state, verify_change).result()
+        if previous is None:
+            return None
+        checkpoint = f"checkpoint-{next(self._ids)}"
+        self.checkpoints[checkpoint] = previous
+        return checkpoint
+
+    def commit(self, checkpoint: str | None = None) -> None:
+        """
+        The method keeps the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        if self.namespace is None:
+            self.executor.submit(libnmstate.commit, checkpoint=checkpoint).result()
+            return
+        self.checkpoints.pop(checkpoint, None)
+
+    def rollback(self, checkpoint: str | None = None) -> None:
+        """
+        The method restores the previous states of the interfaces of the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        if self.namespace is None:
+            self.executor.submit(libnmstate.rollback, checkpoint=checkpoint).result()
+            return
+        previous = self.checkpoints.pop(checkpoint, None)
+        if previous is not None:
+            self.executor.submit(apply_namespace, self.namespace, previous, False).result()
+
+    def close(self) -> None:
+        """The method does nothing, the process pool is shut down by its owner."""
+
+
+def namespace_hosts(executor: Executor, run_dir: str = Netns.RUN_DIR) -> list[Host]:
+    """
+    The function creates the hosts of the namespace of the host and of all network namespaces,
+    the host is named by the namespace.
+
+    Args:
+        executor: process pool shared by the namespaces
+        run_dir: directory of the namespace files
+
+    Returns: hosts, the namespace of the host is the first
+    """
+
+    hosts = []
+    for namespace in [None, *list_namespaces(run_dir)]:
+        backend = NamespaceBackend(namespace, executor)
+        name = Netns.ROOT if namespace is None else namespace
+        hosts.append(Host(name, NetworkStore(StateCache(backend=backend), backend=backend)))
+    return hosts
+
+
+def namespace_pool(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """
+    The function creates the process pool of the namespace calls. The processes are started by the fork server,
+    the application has threads and forking it could copy a lock held by another thread.
+
+    Args:
+        max_workers: number of processes, the number of CPUs by default
+
+    Returns: process pool
+    """
+
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("forkserver"))
@@ -0,0 +1,196 @@
+"""
+remote.py
+-----------
+The module contains the client of the agent of the multi-host mode, it replaces the nmstate lib
+for the network state store of the remote host.
+"""
+
+import json
+import os
+import select
+import subprocess
+import threading
+import time
+
+from libnmstate.error import NmstateError
+
+from consts import Hosts
+
+
+class AgentError(NmstateError):
+    """Class - the agent has failed to execute the call or the connection to it is lost."""
+
+
+class RemoteNmstate:
+    """
+    Class - the nmstate lib of the remote host, the calls are sent to the agent started by the command.
+    The agent is started on the first call and again after the connection is lost.
+    """
+
+    def __init__(self, command: list[str], timeout: float = Hosts.TIMEOUT):
+        """
+        The initialization of the client.
+
+        Args:
+            command: command starting the agent, for example ssh to the host
+            timeout: maximum time of one call in seconds
+        """
+
+        self.command = command
+        self.timeout = timeout
+        self._process = None
+        self._buffer = b""
+        self._ids = 0
+        self._lock = threading.Lock()
+
+    def _start(self) -> subprocess.Popen:
+        """
+        The method starts the agent if it is not running.
+
+        Returns: agent process
+        """
+
+        if self._process is None or self._process.poll() is not None:
+            try:
+                self._process = subprocess.Popen(
+                    self.command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    bufsize=0,
+                )
+            except OSError as e:
+                raise AgentError(f"failed to start the agent: {e}")
+            self._buffer = b""
+        return self._process
+
+    def _read_line(self, process: subprocess.Popen, deadline: float) -> bytes | None:
+        """
+        The method reads one response line from the raw output of the agent, the line written in parts
+        is collected until the deadline.
+
+        Args:
+            process: agent process
+            deadline: time of time.monotonic() the line must be received by
+
+        Returns: line, empty if the agent has exited or None if the deadline has passed
+        """
+
+        fd = process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            data = os.read(fd, Hosts.READ_SIZE)
+            if not data:
+                return b""
+            self._buffer += data
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line + b"\n"
+
+    def _call(self, method: str, **params):
+        """
+        The method sends the request to the agent and waits for the response.
+
+        Args:
+            method: name of the nmstate lib function
+            **params: keyword arguments of the function
+
+        Returns: result of the function
+        """
+
+        with self._lock:
+            process = self._start()
+            self._ids += 1
+            request_id = self._ids
+            deadline = time.monotonic() + self.timeout
+            try:
+                request = json.dumps({"id": request_id, "method": method, "params": params}) + "\n"
+                process.stdin.write(request.encode())
+                process.stdin.flush()
+                line = self._read_line(process, deadline)
+            except OSError as e:
+                self.close()
+                raise AgentError(f"connection to the agent is lost: {e}")
+            if not line:
+                self.close()
+                raise AgentError("the agent has not responded" if line is None else "the agent has exited")
+
+            try:
+                response = json.loads(line)
+            except ValueError:
+                self.close()
+                raise AgentError(f"bad response of the agent: {line.strip()[:200].decode(errors='replace')}")
+            if not isinstance(response, dict) or response.get("id") not in (request_id, None):
+                self.close()
+                raise AgentError(f"the agent has responded to another request instead of {request_id}")
+        if "error" in response:
+            raise AgentError(response["error"])
+        return response.get("result")
+
+    def show(self) -> dict:
+        """The method returns the network state of the remote host."""
+
+        return self._call("show")
+
+    def apply(self, desired_state: dict, verify_change: bool = True, commit: bool = True, rollback_timeout: int = 60):
+        """
+        The method applies the desired state on the remote host.
+
+        Args:
+            desired_state: desired network state
+            verify_change: verify the applied state
+            commit: keep the change at once, otherwise it waits for commit or rollback
+            rollback_timeout: time in seconds the uncommitted change is rolled back after
+
+        Returns: checkpoint of the uncommitted change
+        """
+
+        return self._call(
+            "apply",
+            desired_state=desired_state,
+            verify_change=verify_change,
+            commit=commit,
+            rollback_timeout=rollback_timeout,
+        )
+
+    def commit(self, checkpoint: str | None = None) -> None:
+        """
+        The method keeps the uncommitted change on the remote host.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        self._call("commit", checkpoint=checkpoint)
+
+    def rollback(self, checkpoint: str | None = None) -> None:
+        """
+        The method rolls back the uncommitted change on the remote host.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        self._call("rollback", checkpoint=checkpoint)
+
+    def close(self) -> None:
+        """The method stops the agent."""
+
+        process, self._process = self._process, None
+        self._buffer = b""
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
@@ -0,0 +1,188 @@
+"""
+rollout.py
+-----------
+The module contains the rollout of one desired interface configuration to many targets, for example hosts
+or network namespaces served by their agents. The targets are applied concurrently within the window,
+so the time the nmstate lib spends on the verification of one target overlaps with the others.
+The canary batch goes first and must succeed completely, then the rollout halts as soon as
+the share of the failed targets exceeds the threshold: the targets not started yet are skipped,
+the changes of the targets being verified are rolled back.
+"""
+
+import threading
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple
+
+from consts import ApplyResult, Rollout
+
+
+class TargetResult(NamedTuple):
+    """Class - result of the rollout on one target."""
+
+    status: str
+    results: dict[str, str] = {}
+    error: str = ""
+
+
+class RolloutReport:
+    """Class - results of the rollout by target name."""
+
+    def __init__(self):
+        self.targets = dict()
+        self.halted = ""
+
+    @property
+    def failed(self) -> int:
+        """The property returns the number of the failed targets."""
+
+        return sum(result.status == Rollout.FAILED for result in self.targets.values())
+
+    @property
+    def ok(self) -> bool:
+        """The property returns True if the rollout has been completed on all targets."""
+
+        return not self.halted and all(result.status == Rollout.OK for result in self.targets.values())
+
+    def serialize(self) -> dict:
+        """
+        The method returns the report as a dictionary for the JSON output.
+
+        Returns: report
+        """
+
+        return {
+            "ok": self.ok,
+            "halted": self.halted,
+            "targets": {
+                name: {"status": result.status, "results": result.results, "error": result.error}
+                for name, result in self.targets.items()
+            },
+        }
+
+
+def target_status(results: dict[str, str]) -> str:
+    """
+    The function sums up the apply results of the interfaces of one target.
+
+    Args:
+        results: result apply for each interface
+
+    Returns: target status
+    """
+
+    if ApplyResult.CANCELLED in results.values():
+        return Rollout.CANCELLED
+    if all(result in (ApplyResult.OK, ApplyResult.NO_CHANGE) for result in results.values()):
+        return Rollout.OK
+    return Rollout.FAILED
+
+
+class RolloutScheduler:
+    """
+    Class - the scheduler applying the function to the targets in the canary batch and then in the window.
+    The function receives the target and the halt event, it must roll back the change verified after the event
+    is set, as NetworkStore.commit does with its cancellation event.
+    """
+
+    def __init__(
+            self,
+            apply: Callable[[object, threading.Event], dict[str, str]],
+            canary: int = Rollout.CANARY,
+            window: int = Rollout.WINDOW,
+            max_failure_rate: float = Rollout.MAX_FAILURE_RATE,
+            on_result: Callable[[str, TargetResult], None] | None = None,
+    ):
+        """
+        The initialization of the scheduler.
+
+        Args:
+            apply: function applying the configuration to one target, it returns the result for each interface
+            canary: number of the first targets that must succeed before the others are started
+            window: maximum number of the targets applied at the same time
+            max_failure_rate: share of the failed targets after which the rollout is halted
+            on_result: function called in the calling thread after each target is finished
+        """
+
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.apply = apply
+        self.canary = max(0, canary)
+        self.window = window
+        self.max_failure_rate = max_failure_rate
+        self.on_result = on_result
+        self.halt = threading.Event()
+
+    def run(self, targets: list) -> RolloutReport:
+        """
+        The method rolls out the configuration to the targets.
+
+        Args:
+            targets: targets with the name attribute
+
+        Returns: report of the rollout
+        """
+
+        report = RolloutReport()
+        self.halt.clear()
+        canary, rest = targets[: self.canary], targets[self.canary:]
+        workers = min(self.window, max(1, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rollout") as executor:
+            for batch in (canary, rest):
+                self._run_batch(executor, batch, report)
+                if batch is canary and report.failed and not self.halt.is_set():
+                    self.halt.set()
+                    report.halted = f"canary failed on {report.failed} of {len(canary)} targets"
+        return report
+
+    def _run_batch(self, executor: ThreadPoolExecutor, batch: list, report: RolloutReport) -> None:
+        """
+        The method applies the batch of targets keeping at most the window of them running,
+        the next target is started when one is finished, so the halt stops the targets not started yet.
+
+        Args:
+            executor: thread pool of the window size
+            batch: targets of the batch
+            report: report of the rollout
+        """
+
+        pending = iter(batch)
+        running = dict()
+        while True:
+            for target in pending:
+                if self.halt.is_set():
+                    report.targets[target.name] = TargetResult(Rollout.SKIPPED)
+                    continue
+                running[executor.submit(self._apply, target)] = target.name
+                if len(running) >= self.window:
+                    break
+            if not running:
+                return
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                report.targets[name] = future.result()
+                if self.on_result is not None:
+                    self.on_result(name, report.targets[name])
+                finished = [result for result in report.targets.values() if result.status != Rollout.SKIPPED]
+                if not self.halt.is_set() and report.failed > self.max_failure_rate * len(finished):
+                    self.halt.set()
+                    report.halted = f"failed {report.failed} of {len(finished)} targets"
+
+    def _apply(self, target) -> TargetResult:
+        """
+        The method applies the configuration to one target unless the rollout is halted.
+
+        Args:
+            target: target
+
+        Returns: result of the target
+        """
+
+        if self.halt.is_set():
+            return TargetResult(Rollout.SKIPPED)
+        try:
+            results = self.apply(target, self.halt)
+        except Exception as e:
+            return TargetResult(Rollout.FAILED, error=str(e) or type(e).__name__)
+        return TargetResult(target_status(results), results)
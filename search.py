@@ -0,0 +1,98 @@
+"""
+search.py
+-----------
+The module contains the index for the type-to-filter search of the interfaces by name, MAC, IP and controller.
+"""
+
+from bisect import bisect_left
+
+NGRAM = 3
+FIELD_SEPARATOR = "\0"
+PREFIX_ANCHOR = "^"
+PREFIX_END = "\U0010ffff"
+
+
+class SearchIndex:
+    """
+    Class - search index over the fields of the records.
+
+    The posting lists of all substrings up to three characters answer short queries directly,
+    longer queries check only the records of the rarest trigram of the query, or the previous result
+    when the query extends the previous one and it is smaller. Prefix lookups use the sorted list of the field values.
+    """
+
+    def __init__(self, records: list[tuple[str, ...]]):
+        """
+        The initialization of the index.
+
+        Args:
+            records: searchable fields of each record, the position in the list is the record id
+        """
+
+        self.keys = [FIELD_SEPARATOR.join(field.lower() for field in fields if field) for fields in records]
+        self.grams = dict()
+        for record_id, key in enumerate(self.keys):
+            grams = {key[i: i + n] for n in range(1, NGRAM + 1) for i in range(len(key) - n + 1)}
+            for gram in grams:
+                self.grams.setdefault(gram, []).append(record_id)
+
+        values = sorted(
+            (field.lower(), record_id)
+            for record_id, fields in enumerate(records)
+            for field in fields if field
+        )
+        self.values = [value for value, _ in values]
+        self.value_ids = [record_id for _, record_id in values]
+        self._last = ("", [])
+
+    def search(self, query: str) -> list[int]:
+        """
+        The method finds the records with a field containing the query,
+        the query starting with '^' finds the records with a field starting with it.
+
+        Args:
+            query: search string
+
+        Returns: sorted ids of the found records
+        """
+
+        query = query.lower()
+        if query.startswith(PREFIX_ANCHOR):
+            return self.prefix(query[len(PREFIX_ANCHOR):])
+        if FIELD_SEPARATOR in query:
+            return []
+
+        if not query:
+            return list(range(len(self.keys)))
+        if len(query) <= NGRAM:
+            ids = self.grams.get(query, [])
+            self._last = (query, ids)
+            return list(ids)
+
+        candidates = min(
+            (self.grams.get(query[i: i + NGRAM], []) for i in range(len(query) - NGRAM + 1)),
+            key=len,
+        )
+        last_query, last_ids = self._last
+        if last_query and last_query in query and len(last_ids) < len(candidates):
+            candidates = last_ids
+
+        keys = self.keys
+        ids = [record_id for record_id in candidates if query in keys[record_id]]
+        self._last = (query, ids)
+        return ids
+
+    def prefix(self, query: str) -> list[int]:
+        """
+        The method finds the records with a field starting with the query.
+
+        Args:
+            query: beginning of the field
+
+        Returns: sorted ids of the found records
+        """
+
+        query = query.lower()
+        start = bisect_left(self.values, query)
+        end = bisect_left(self.values, query + PREFIX_END, start)
+        return sorted(set(self.value_ids[start:end]))
@@ -0,0 +1,192 @@
+"""
+simulator.py
+--------------
+The module contains the in-memory simulator of the network state backend and the generators of large network states,
+they allow to test and benchmark the model, the diffing and the user interface without root and NetworkManager.
+"""
+
+import itertools
+import math
+import threading
+import time
+
+from types import SimpleNamespace
+
+from libnmstate.error import NmstateValueError
+from libnmstate.schema import Interface, InterfaceIPv4, InterfaceState, InterfaceType, LinuxBridge
+
+from cache import StateCache
+
+
+class MemoryBackend:
+    """
+    Class - the backend keeping the network state in memory.
+
+    The applied interface states are merged the way the nmstate lib does it, the controllers of the ports
+    and the ports of the bridges are kept in sync. The state is never changed in place, so show()
+    returns the current state without copying it.
+    """
+
+    def __init__(self, state: dict, delay: float = 0.0):
+        """
+        The initialization of the simulator.
+
+        Args:
+            state: initial network state, for example the fixture of the tests or the generated state
+            delay: delay of each call in seconds, it emulates the time of the verification
+        """
+
+        self.delay = delay
+        self.checkpoints = dict()
+        self.applies = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._load(state)
+
+    def _load(self, state: dict) -> None:
+        """
+        The method replaces the network state.
+
+        Args:
+            state: network state
+        """
+
+        self._cache = StateCache(math.inf, SimpleNamespace(show=lambda: state))
+        self._cache.get()
+
+    def show(self) -> dict:
+        """The method returns the network state, it must not be changed."""
+
+        if self.delay:
+            time.sleep(self.delay)
+        return self._cache.peek()
+
+    def apply(
+            self, desired_state: dict, verify_change: bool = True, commit: bool = True, rollback_timeout: int = 60
+    ) -> str | None:
+        """
+        The method applies the desired interface states.
+
+        Args:
+            desired_state: desired network state
+            verify_change: ignored, the merged state always matches
+            commit: keep the change at once, otherwise it waits for commit or rollback
+            rollback_timeout: ignored
+
+        Returns: checkpoint of the uncommitted change
+        """
+
+        if self.delay:
+            time.sleep(self.delay)
+        interfaces = desired_state.get(Interface.KEY, [])
+        with self._lock:
+            self._validate(interfaces)
+            previous = self._cache.peek()
+            for iface_state in interfaces:
+                if iface_state.get(Interface.STATE) == InterfaceState.ABSENT:
+                    self._cache.remove_interface(iface_state[Interface.NAME])
+                else:
+                    self._cache.refresh_interface(iface_state)
+            self.applies += 1
+            if commit:
+                return None
+            checkpoint = f"checkpoint-{next(self._ids)}"
+            self.checkpoints[checkpoint] = previous
+            return checkpoint
+
+    def commit(self, checkpoint: str | None = None) -> None:
+        """
+        The method keeps the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        self.checkpoints.pop(checkpoint, None)
+
+    def rollback(self, checkpoint: str | None = None) -> None:
+        """
+        The method restores the network state of the uncommitted change.
+
+        Args:
+            checkpoint: checkpoint of the change
+        """
+
+        with self._lock:
+            if checkpoint in self.checkpoints:
+                self._load(self.checkpoints.pop(checkpoint))
+
+    def _validate(self, interfaces: list[dict]) -> None:
+        """
+        The method rejects the desired state the nmstate lib would reject: the unnamed interfaces
+        and the controllers that are not bridges.
+
+        Args:
+            interfaces: desired interface states
+        """
+
+        bridges = {
+            iface[Interface.NAME] for iface in interfaces if iface.get(Interface.TYPE) == InterfaceType.LINUX_BRIDGE
+        }
+        for iface_state in interfaces:
+            if not iface_state.get(Interface.NAME):
+                raise NmstateValueError("interface name is required")
+            controller = iface_state.get(Interface.CONTROLLER)
+            if not controller or controller in bridges:
+                continue
+            current = self._cache.get_interface(controller)
+            if current is None or current.get(Interface.TYPE) != InterfaceType.LINUX_BRIDGE:
+                raise NmstateValueError(f"controller {controller} of {iface_state[Interface.NAME]} is not a bridge")
+
+
+def generate_state(interfaces: int = 10000, bridges: int = 1000) -> dict:
+    """
+    The function generates the network state with the Ethernet interfaces distributed between the bridges,
+    every other interface is a port of a bridge.
+
+    Args:
+        interfaces: number of Ethernet interfaces
+        bridges: number of bridges
+
+    Returns: network state
+    """
+
+    ethernets = []
+    ports = [[] for _ in range(bridges)]
+    for i in range(interfaces):
+        iface = {
+            Interface.NAME: f"eth{i}",
+            Interface.TYPE: InterfaceType.ETHERNET,
+            Interface.STATE: InterfaceState.UP,
+            Interface.MAC: f"02:00:{i >> 24 & 0xff:02X}:{i >> 16 & 0xff:02X}:{i >> 8 & 0xff:02X}:{i & 0xff:02X}",
+        }
+        if bridges and i % 2:
+            bridge = i // 2 % bridges
+            iface[Interface.CONTROLLER] = f"br{bridge}"
+            iface[Interface.IPV4] = {InterfaceIPv4.ENABLED: False}
+            ports[bridge].append({LinuxBridge.Port.NAME: iface[Interface.NAME]})
+        else:
+            iface[Interface.IPV4] = {
+                InterfaceIPv4.ENABLED: True,
+                InterfaceIPv4.DHCP: False,
+                InterfaceIPv4.ADDRESS: [{
+                    InterfaceIPv4.ADDRESS_IP: f"10.{i >> 16 & 0xff}.{i >> 8 & 0xff}.{i & 0xff}",
+                    InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 8,
+                }],
+            }
+        ethernets.append(iface)
+    return {
+        Interface.KEY: [
+            *(
+                {
+                    Interface.NAME: f"br{i}",
+                    Interface.TYPE: InterfaceType.LINUX_BRIDGE,
+                    Interface.STATE: InterfaceState.UP,
+                    Interface.IPV4: {InterfaceIPv4.ENABLED: False},
+                    LinuxBridge.CONFIG_SUBTREE: {LinuxBridge.PORT_SUBTREE: bridge_ports},
+                }
+                for i, bridge_ports in enumerate(ports)
+            ),
+            *ethernets,
+        ],
+    }
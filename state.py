@@ -0,0 +1,660 @@
+"""
+state.py
+----------
+The module contains the snapshot of the network state and the store that owns the snapshots of one host.
+"""
+
+import json
+import os
+import threading
+
+from types import MappingProxyType
+from typing import Callable, Iterable
+
+from libnmstate.schema import Interface, InterfaceIPv4, InterfaceState, InterfaceType, LinuxBridge
+from libnmstate.error import NmstateError
+
+from addresses import AddressEntry, AddressIndex, network_range
+from backends import Backend, NmstateBackend
+from cache import StateCache
+from consts import Journal
+from diff import diff_interfaces
+from journal import ChangeJournal, minimal_state, restore_state
+from models import (
+    NetInterface,
+    APPLY_RESULT_ADDRESS_CONFLICT,
+    APPLY_RESULT_CANCELLED,
+    APPLY_RESULT_NO_CHANGE,
+    APPLY_RESULT_OK,
+)
+from search import SearchIndex
+from tracing import span, traced
+from validators import parse_ipv4_addresses
+
+
+class NetworkState:
+    """
+    Class - immutable snapshot of the network state: the Ethernet interfaces, the bridges and their indexes.
+
+    The snapshot is never changed, a change produces a new snapshot that shares the unchanged
+    interfaces and bridges with the previous one, so readers use it without locks.
+    """
+
+    __slots__ = (
+        "raw",
+        "interfaces",
+        "interfaces_by_name",
+        "bridges",
+        "bridges_by_name",
+        "port_bridges",
+        "_search_index",
+        "_address_index",
+    )
+
+    def __init__(
+            self,
+            raw: dict,
+            interfaces: dict[str, NetInterface],
+            bridges: dict[str, dict],
+            port_bridges: dict[str, str] | None = None,
+    ):
+        """
+        The initialization of the snapshot.
+
+        Args:
+            raw: network state of the nmstate lib the snapshot is built from
+            interfaces: Ethernet interfaces by name
+            bridges: bridge configurations for the netstate lib by name
+            port_bridges: bridge names by port name, computed from the bridges if omitted
+        """
+
+        if port_bridges is None:
+            port_bridges = {
+                port[LinuxBridge.Port.NAME]: name
+                for name, bridge in bridges.items()
+                for port in NetInterface.get_bridge_ports(bridge)
+            }
+        self.raw = raw
+        self.interfaces = tuple(interfaces.values())
+        self.interfaces_by_name = MappingProxyType(interfaces)
+        self.bridges = tuple(bridges.values())
+        self.bridges_by_name = MappingProxyType(bridges)
+        self.port_bridges = MappingProxyType(port_bridges)
+        self._search_index = None
+        self._address_index = None
+
+    @classmethod
+    def empty(cls) -> "NetworkState":
+        """
+        The method returns the snapshot without interfaces, it is used until the network state is loaded.
+
+        Returns: empty snapshot
+        """
+
+        return cls({Interface.KEY: []}, {}, {}, {})
+
+    @classmethod
+    def from_raw(cls, raw: dict, store: "NetworkStore | None" = None) -> "NetworkState":
+        """
+        The method builds the snapshot from the network state of the nmstate lib.
+
+        Args:
+            raw: network state
+            store: store the interfaces apply their changes through
+
+        Returns: snapshot
+        """
+
+        interfaces = dict()
+        bridges = dict()
+        for interface in NetInterface.get_interfaces(raw):
+            if interface[Interface.TYPE] == InterfaceType.ETHERNET:
+                interfaces[interface[Interface.NAME]] = NetInterface(**interface, store=store)
+            elif interface[Interface.TYPE] == InterfaceType.LINUX_BRIDGE:
+                bridges[interface[Interface.NAME]] = NetInterface.get_bridge_state(interface)
+        return cls(raw, interfaces, bridges)
+
+    def patched(
+            self,
+            raw: dict,
+            lookup: Callable[[str], dict | None],
+            names: Iterable[str],
+            store: "NetworkStore | None" = None,
+    ) -> "NetworkState":
+        """
+        The method returns the new snapshot where the interfaces with the given names, their previous and
+        new controllers and the ports of the changed bridges are rebuilt from the network state.
+
+        Args:
+            raw: new network state
+            lookup: function returning the entry of the interface in the new network state by name
+            names: names of the changed interfaces
+            store: store the interfaces apply their changes through
+
+        Returns: new snapshot
+        """
+
+        affected = set()
+        for name in names:
+            entry = lookup(name)
+            affected.add(name)
+            affected.add(self.port_bridges.get(name, ""))
+            if name in self.interfaces_by_name:
+                affected.add(self.interfaces_by_name[name].controller)
+            if entry is not None:
+                affected.add(entry.get(Interface.CONTROLLER, ""))
+            if name in self.bridges_by_name:
+                ports = NetInterface.get_bridge_ports(self.bridges_by_name[name])
+                affected.update(port[LinuxBridge.Port.NAME] for port in ports)
+            if entry is not None and entry[Interface.TYPE] == InterfaceType.LINUX_BRIDGE:
+                affected.update(port[LinuxBridge.Port.NAME] for port in NetInterface.get_bridge_ports(entry))
+        affected.discard("")
+
+        interfaces = dict(self.interfaces_by_name)
+        bridges = dict(self.bridges_by_name)
+        port_bridges = dict(self.port_bridges)
+        for name in affected:
+            entry = lookup(name)
+            if entry is not None and entry[Interface.TYPE] == InterfaceType.ETHERNET:
+                interfaces[name] = NetInterface(**entry, store=store)
+            else:
+                interfaces.pop(name, None)
+
+            if name in bridges:
+                for port in NetInterface.get_bridge_ports(bridges.pop(name)):
+                    if port_bridges.get(port[LinuxBridge.Port.NAME]) == name:
+                        del port_bridges[port[LinuxBridge.Port.NAME]]
+            if entry is not None and entry[Interface.TYPE] == InterfaceType.LINUX_BRIDGE:
+                bridges[name] = NetInterface.get_bridge_state(entry)
+                for port in NetInterface.get_bridge_ports(entry):
+                    port_bridges[port[LinuxBridge.Port.NAME]] = name
+        return NetworkState(raw, interfaces, bridges, port_bridges)
+
+    def search_index(self) -> SearchIndex:
+        """
+        The method returns the search index of the Ethernet interfaces, it is built once for the snapshot.
+
+        Returns: search index, record ids are the positions in the interfaces of the snapshot
+        """
+
+        if self._search_index is None:
+            self._search_index = SearchIndex([interface.search_fields() for interface in self.interfaces])
+        return self._search_index
+
+    def address_index(self) -> AddressIndex:
+        """
+        The method returns the index of the IPv4 addresses of all interfaces, it is built once for the snapshot.
+
+        Returns: address index
+        """
+
+        if self._address_index is None:
+            self._address_index = AddressIndex.from_raw(self.raw)
+        return self._address_index
+
+
+class NetworkStore:
+    """
+    Class - the network state of one host: the cache of the nmstate lib, the current snapshot
+    and the queue of pending changes.
+
+    The snapshot is replaced as a whole, the readers take the current one and never lock.
+    The writers - applies and observed changes - are serialized by the store lock. The network state
+    is requested outside the lock and replaces the cache under it, unless the cache has been changed
+    by a writer meanwhile, so the state requested before an apply never overwrites the applied entries.
+    The results of the last apply of the user interface are kept until the next apply or reload.
+    """
+
+    def __init__(
+            self,
+            cache: StateCache | None = None,
+            backend: Backend | None = None,
+            snapshot_path: str | None = None,
+            journal: ChangeJournal | None = None,
+    ):
+        """
+        The initialization of the store.
+
+        Args:
+            cache: network state cache, a new one by default
+            backend: network state backend, the nmstate lib of the local host by default,
+                the remote agent in the multi-host mode
+            snapshot_path: file the interfaces and the bridges are saved to after each refresh,
+                they are not saved if omitted
+            journal: journal the applied changes are recorded to, they are not recorded if omitted
+        """
+
+        self.backend = NmstateBackend() if backend is None else backend
+        self.cache = cache if cache is not None else StateCache(backend=self.backend)
+        self.state = NetworkState.empty()
+        self.stale = False
+        self.pending = dict()
+        self.results = dict()
+        self.snapshot_path = snapshot_path
+        self.journal = journal
+        self._lock = threading.Lock()
+
+    @traced("store.update")
+    def update(self, force: bool = False) -> NetworkState:
+        """
+        The method returns the snapshot of the network state, a new snapshot is built
+        only when the cached network state has been requested again.
+
+        Args:
+            force: request the network state from the nmstate lib even if the cached one is not expired
+
+        Returns: current snapshot
+        """
+
+        requested = None
+        if force or self.cache.expired:
+            generation = self.cache.generation
+            requested = self.cache.request()
+        with self._lock:
+            if requested is not None and self.cache.generation == generation:
+                self.cache.store(requested)
+            raw = self.cache.peek()
+            if raw is None or raw is self.state.raw:
+                return self.state
+            with span("snapshot.build", interfaces=len(raw[Interface.KEY])):
+                self.state = NetworkState.from_raw(raw, self)
+            self.stale = False
+            snapshot = self.state
+        self.save_snapshot(snapshot)
+        return snapshot
+
+    def load_snapshot(self) -> bool:
+        """
+        The method publishes the snapshot saved by the previous run, it is stale until the first update.
+
+        Returns: True if the saved snapshot has been loaded
+        """
+
+        if self.snapshot_path is None:
+            return False
+        try:
+            with open(os.path.expanduser(self.snapshot_path)) as stream:
+                raw = json.load(stream)
+            snapshot = NetworkState.from_raw(raw, self)
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        with self._lock:
+            if self.state.raw[Interface.KEY]:
+                return False
+            self.state = snapshot
+            self.stale = True
+        return True
+
+    def save_snapshot(self, snapshot: NetworkState) -> None:
+        """
+        The method saves the Ethernet interfaces and the bridges of the snapshot, the file is replaced atomically
+        so the concurrent runs read either the previous or the new snapshot. A failure is ignored,
+        the snapshot only speeds up the next start.
+
+        Args:
+            snapshot: snapshot of the network state
+        """
+
+        if self.snapshot_path is None:
+            return
+        path = os.path.expanduser(self.snapshot_path)
+        raw = {
+            Interface.KEY: [
+                iface for iface in snapshot.raw[Interface.KEY]
+                if iface.get(Interface.TYPE) in (InterfaceType.ETHERNET, InterfaceType.LINUX_BRIDGE)
+            ]
+        }
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with span("snapshot.save", interfaces=len(raw[Interface.KEY])):
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(temporary, "w") as stream:
+                    json.dump(raw, stream, separators=(",", ":"), default=str)
+                os.replace(temporary, path)
+        except OSError:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+
+    def _refresh(self, names: Iterable[str]) -> None:
+        """
+        The method publishes the snapshot patched by the cached entries of the changed interfaces,
+        it must be called with the store lock held.
+
+        Args:
+            names: names of the changed interfaces
+        """
+
+        raw = self.cache.peek()
+        if raw is not None:
+            self.state = self.state.patched(raw, self.cache.get_interface, names, self)
+
+    def patch_interface(self, iface_state: dict) -> None:
+        """
+        The method applies an observed change of one interface to the cached network state
+        and publishes the patched snapshot without requesting the whole network state.
+
+        Args:
+            iface_state: changed part of the interface state, the name is required
+        """
+
+        with self._lock:
+            name = iface_state[Interface.NAME]
+            if self.cache.get_interface(name) is None:
+                iface_state = {
+                    Interface.IPV4: {InterfaceIPv4.ENABLED: False, InterfaceIPv4.DHCP: False},
+                    **iface_state,
+                }
+            else:
+                iface_state = {key: value for key, value in iface_state.items() if key != Interface.TYPE}
+            self.cache.refresh_interface(iface_state)
+            self._refresh([name])
+
+    def patch_address(self, name: str, ip: str, prefix_length: int, removed: bool = False) -> None:
+        """
+        The method adds an observed IPv4 address to the interface or removes it.
+
+        Args:
+            name: interface name
+            ip: IPv4 address
+            prefix_length: prefix length of the address
+            removed: the address has been removed from the interface
+        """
+
+        current = self.cache.get_interface(name)
+        if current is None:
+            return
+        addresses = [
+            address for address in current.get(Interface.IPV4, {}).get(InterfaceIPv4.ADDRESS, [])
+            if address[InterfaceIPv4.ADDRESS_IP] != ip
+        ]
+        if not removed:
+            addresses.append({InterfaceIPv4.ADDRESS_IP: ip, InterfaceIPv4.ADDRESS_PREFIX_LENGTH: prefix_length})
+        ipv4 = {InterfaceIPv4.ADDRESS: addresses}
+        if addresses:
+            ipv4[InterfaceIPv4.ENABLED] = True
+        self.patch_interface({Interface.NAME: name, Interface.IPV4: ipv4})
+
+    def remove_interface(self, name: str) -> None:
+        """
+        The method removes the deleted interface from the cached network state and publishes the patched snapshot.
+
+        Args:
+            name: interface name
+        """
+
+        with self._lock:
+            if self.cache.get_interface(name) is None:
+                return
+            self.cache.remove_interface(name)
+            self._refresh([name])
+
+    def discard_pending(self) -> None:
+        """The method clears the queue of pending changes."""
+
+        self.pending.clear()
+
+    def commit(self, cancel: threading.Event | None = None) -> dict[str, str]:
+        """
+        The method applies all pending changes using the netstate lib in one transaction.
+
+        Args:
+            cancel: event to roll back the changes after the verification
+
+        Returns: result apply for each interface
+        """
+
+        changes = list(self.pending.values())
+        self.pending.clear()
+        return self.apply_changes(changes, cancel)
+
+    @staticmethod
+    def _address_conflicts(
+            snapshot: NetworkState, states: list[tuple[NetInterface, dict, dict]]
+    ) -> dict[str, str]:
+        """
+        The method checks the new static IPv4 addresses against the addresses of the other interfaces
+        of the snapshot and of the same changes, the addresses of the interfaces whose IPv4 configuration
+        is replaced by the changes are ignored.
+
+        Args:
+            snapshot: snapshot of the network state
+            states: interfaces with their new values and new interface states
+
+        Returns: first conflicting address by interface name
+        """
+
+        new = [
+            (interface.name, parse_ipv4_addresses(kwargs["ipv4 address"]))
+            for interface, kwargs, iface in states
+            if iface and InterfaceIPv4.ADDRESS in iface.get(Interface.IPV4, {})
+        ]
+        if not new:
+            return {}
+        replaced = {interface.name for interface, _, iface in states if iface and Interface.IPV4 in iface}
+        index = snapshot.address_index()
+        conflicts = dict()
+        for name, addresses in new:
+            for ip, prefix_length in addresses:
+                found = index.conflicts(ip, prefix_length, exclude=replaced)
+                if found:
+                    conflicts[name] = str(found[0])
+                    break
+        batch = AddressIndex(
+            AddressEntry(*network_range(ip, prefix_length), prefix_length, ip, name)
+            for name, addresses in new
+            for ip, prefix_length in addresses
+        )
+        for name, addresses in new:
+            if name in conflicts:
+                continue
+            for ip, prefix_length in addresses:
+                found = batch.conflicts(ip, prefix_length, exclude={name})
+                if found:
+                    conflicts[name] = str(found[0])
+                    break
+        return conflicts
+
+    @traced("store.apply")
+    def apply_changes(
+            self, changes: list[tuple[NetInterface, dict]], cancel: threading.Event | None = None
+    ) -> dict[str, str]:
+        """
+        The method merges the changes of the interfaces and the bridges into one desired state
+        and applies it using the netstate lib.
+
+        Args:
+            changes: interfaces with their new values
+            cancel: event to roll back the changes after the verification, without it
+                the changes are committed at once
+
+        Returns: result apply for each interface
+        """
+
+        snapshot = self.update()
+        results = dict()
+        ifaces = []
+        related = dict()
+        bridges = dict(snapshot.bridges_by_name)
+        states = [(interface, kwargs, interface._get_new_iface_state(**kwargs)) for interface, kwargs in changes]
+        conflicts = self._address_conflicts(snapshot, states)
+        for interface, kwargs, iface in states:
+            if not iface:
+                results[interface.name] = APPLY_RESULT_NO_CHANGE
+                continue
+            if interface.name in conflicts:
+                results[interface.name] = f"{APPLY_RESULT_ADDRESS_CONFLICT}: {conflicts[interface.name]}"
+                continue
+
+            bridge_name = kwargs.get("bridge name", "") or ""
+
+            interface.update_bridges(bridges, bridge_name)
+            ifaces.append(iface)
+            related[interface.name] = {interface.name, bridge_name, interface.controller}
+
+        state = {Interface.KEY: diff_interfaces(snapshot.raw, [*bridges.values(), *ifaces])}
+        changed = {iface[Interface.NAME] for iface in state[Interface.KEY]}
+        for name, names in related.items():
+            if not names & changed:
+                results[name] = APPLY_RESULT_NO_CHANGE
+        ifaces = [iface for iface in ifaces if related[iface[Interface.NAME]] & changed]
+        if not state[Interface.KEY]:
+            return results
+
+        before = self._before(state)
+        error = self._apply(state, cancel)
+        if error is not None:
+            results.update({iface[Interface.NAME]: error for iface in ifaces})
+            return results
+        self._record(Journal.APPLY, state, before)
+        results.update({iface[Interface.NAME]: APPLY_RESULT_OK for iface in ifaces})
+        return results
+
+    def _before(self, state: dict) -> dict[str, dict]:
+        """
+        The method returns the desired states restoring the interfaces of the desired state as they are cached.
+
+        Args:
+            state: desired network state
+
+        Returns: desired interface states by name
+        """
+
+        names = [iface[Interface.NAME] for iface in state[Interface.KEY]]
+        return {name: restore_state(name, self.cache.get_interface(name)) for name in names}
+
+    def _record(self, kind: str, state: dict, before: dict[str, dict], target: int | None = None) -> None:
+        """
+        The method adds the applied transaction to the journal of the store, if there is one.
+
+        Args:
+            kind: kind of the transaction
+            state: applied desired state
+            before: desired states restoring the changed interfaces
+            target: transaction undone, redone or replayed by this one
+        """
+
+        if self.journal is not None:
+            self.journal.append(kind, state, before, target)
+
+    def _apply(self, state: dict, cancel: threading.Event | None = None) -> str | None:
+        """
+        The method applies the desired state by the backend and refreshes the cached entries of its interfaces.
+
+        Args:
+            state: desired network state
+            cancel: event to roll back the changes after the verification, without it
+                the changes are committed at once
+
+        Returns: None if the state has been applied, otherwise the result for its interfaces
+        """
+
+        try:
+            if cancel is None:
+                with span("backend.apply", interfaces=len(state[Interface.KEY]), commit=True):
+                    self.backend.apply(state, verify_change=True, rollback_timeout=30)
+            else:
+                if cancel.is_set():
+                    return APPLY_RESULT_CANCELLED
+                with span("backend.apply", interfaces=len(state[Interface.KEY]), commit=False):
+                    checkpoint = self.backend.apply(state, verify_change=True, commit=False, rollback_timeout=30)
+                if cancel.is_set():
+                    with span("backend.rollback"):
+                        self.backend.rollback(checkpoint=checkpoint)
+                    return APPLY_RESULT_CANCELLED
+                with span("backend.commit"):
+                    self.backend.commit(checkpoint=checkpoint)
+        except NmstateError as e:
+            with self._lock:
+                self.cache.invalidate()
+            return str(e)
+        with self._lock:
+            for iface_state in state[Interface.KEY]:
+                if iface_state.get(Interface.STATE) == InterfaceState.ABSENT:
+                    self.cache.remove_interface(iface_state[Interface.NAME])
+                else:
+                    self.cache.refresh_interface(iface_state)
+            self._refresh([iface[Interface.NAME] for iface in state[Interface.KEY]])
+        return None
+
+    @traced("store.apply_state")
+    def apply_state(
+            self,
+            interfaces: list[dict],
+            cancel: threading.Event | None = None,
+            kind: str = Journal.APPLY,
+            target: int | None = None,
+    ) -> dict[str, str]:
+        """
+        The method applies the desired interface states of the journal, only the states that change
+        the cached entries of their interfaces are sent to the backend.
+
+        Args:
+            interfaces: desired interface states
+            cancel: event to roll back the changes after the verification
+            kind: kind of the transaction recorded to the journal
+            target: transaction undone, redone or replayed by this one
+
+        Returns: result apply for each interface
+        """
+
+        self.update()
+        state = {Interface.KEY: minimal_state(interfaces, self.cache.get_interface)}
+        results = {iface[Interface.NAME]: APPLY_RESULT_NO_CHANGE for iface in interfaces}
+        if not state[Interface.KEY] and target is None:
+            return results
+        before = self._before(state)
+        error = self._apply(state, cancel) if state[Interface.KEY] else None
+        result = APPLY_RESULT_OK if error is None else error
+        results.update({iface[Interface.NAME]: result for iface in state[Interface.KEY]})
+        if error is None:
+            self._record(kind, state, before, target)
+        return results
+
+    def undo(self, cancel: threading.Event | None = None) -> dict[str, str]:
+        """
+        The method restores the interfaces changed by the last transaction of the journal that has not been undone.
+
+        Args:
+            cancel: event to roll back the changes after the verification
+
+        Returns: result apply for each interface, empty if there is nothing to undo
+        """
+
+        transaction = self.journal.undo_target() if self.journal is not None else None
+        if transaction is None:
+            return dict()
+        return self.apply_state(list(transaction.before.values()), cancel, Journal.UNDO, transaction.id)
+
+    def redo(self, cancel: threading.Event | None = None) -> dict[str, str]:
+        """
+        The method applies again the last undone transaction of the journal.
+
+        Args:
+            cancel: event to roll back the changes after the verification
+
+        Returns: result apply for each interface, empty if there is nothing to redo
+        """
+
+        transaction = self.journal.redo_target() if self.journal is not None else None
+        if transaction is None:
+            return dict()
+        return self.apply_state(transaction.state[Interface.KEY], cancel, Journal.REDO, transaction.id)
+
+    def revert(self, name: str, timestamp: float, cancel: threading.Event | None = None) -> dict[str, str]:
+        """
+        The method restores the interface as it was at the moment by the journal.
+
+        Args:
+            name: interface name
+            timestamp: moment as the seconds since the epoch
+            cancel: event to roll back the changes after the verification
+
+        Returns: result apply for the interface
+        """
+
+        iface_state = self.journal.state_at(name, timestamp) if self.journal is not None else None
+        if iface_state is None:
+            return {name: APPLY_RESULT_NO_CHANGE}
+        return self.apply_state([iface_state], cancel, Journal.REVERT)
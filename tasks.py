@@ -0,0 +1,146 @@
+"""
+tasks.py
+----------
+The module contains the background tasks that apply the interface changes without blocking the user interface.
+"""
+
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TYPE_CHECKING
+
+from eventloop import wake
+
+if TYPE_CHECKING:
+    from state import NetworkStore
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="apply")
+_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="load")
+
+
+def run_in_background(func: Callable, *args) -> Future:
+    """
+    The function runs the function in the loader thread, so the user interface is not blocked,
+    the waiting for a key is interrupted when the function is finished.
+
+    Args:
+        func: function to run
+        *args: arguments of the function
+
+    Returns: future with the result of the function
+    """
+
+    future = _loader.submit(func, *args)
+    future.add_done_callback(lambda _: wake())
+    return future
+
+
+class ApplyTask:
+    """Class - applying the interface changes in the worker thread."""
+
+    SPINNER = "|/-\\"
+
+    current = None
+
+    def __init__(
+            self,
+            names: list[str],
+            func: Callable[[threading.Event], dict[str, str]],
+            store: "NetworkStore | None" = None,
+    ):
+        """
+        The initialization of the task, the function is started in the worker thread.
+
+        Args:
+            names: names of the interfaces being changed
+            func: function that applies the changes, it receives the cancellation event
+            store: network state store the results of the task are kept in
+        """
+
+        self.names = names
+        self.store = store
+        self.cancel_event = threading.Event()
+        self.started = time.monotonic()
+        self.future = _executor.submit(func, self.cancel_event)
+        self.future.add_done_callback(lambda _: wake())
+
+    @classmethod
+    def start(
+            cls,
+            names: list[str],
+            func: Callable[[threading.Event], dict[str, str]],
+            store: "NetworkStore | None" = None,
+    ) -> "ApplyTask":
+        """
+        The method starts the task and makes it the current one, the results of the previous task
+        are cleared from the store.
+
+        Args:
+            names: names of the interfaces being changed
+            func: function that applies the changes, it receives the cancellation event
+            store: network state store the results of the task are kept in
+
+        Returns: started task
+        """
+
+        if store is not None:
+            store.results = dict()
+        cls.current = cls(names, func, store)
+        return cls.current
+
+    @classmethod
+    def pop_finished(cls) -> "ApplyTask | None":
+        """
+        The method releases the current task if it has been finished and keeps its result in the store.
+
+        Returns: finished task or None
+        """
+
+        task = cls.current
+        if task is None or not task.done():
+            return None
+        cls.current = None
+        if task.store is not None:
+            task.store.results = task.result()
+        return task
+
+    @property
+    def elapsed(self) -> float:
+        """The property returns the time in seconds since the start of the task."""
+
+        return time.monotonic() - self.started
+
+    def done(self) -> bool:
+        """The method returns True if the task has been finished."""
+
+        return self.future.done()
+
+    def cancel(self) -> None:
+        """The method requests the cancellation of the task, the applied changes are rolled back."""
+
+        self.cancel_event.set()
+
+    def result(self) -> dict[str, str]:
+        """
+        The method returns the result of the finished task.
+
+        Returns: result apply for each interface
+        """
+
+        try:
+            return self.future.result()
+        except Exception as e:
+            return {name: str(e) for name in self.names}
+
+    def status(self) -> str:
+        """
+        The method returns the progress line of the task.
+
+        Returns: spinner, interface names and elapsed time
+        """
+
+        elapsed = self.elapsed
+        spinner = self.SPINNER[int(elapsed * 10) % len(self.SPINNER)]
+        action = "cancelling" if self.cancel_event.is_set() else "applying"
+        return f"{spinner} {action} {', '.join(self.names)} {elapsed:.0f}s"
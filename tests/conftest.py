@@ -1,10 +1,19 @@
 import pytest
 
 from models import NetInterface
+from simulator import MemoryBackend
+from state import NetworkStore
 
 
 @pytest.fixture()
-def iface():
+def store():
+    """The fixture creates an empty network state store for each test."""
+
+    return NetworkStore()
+
+
+@pytest.fixture()
+def iface(store):
     """The fixture creates an instance of the NetInterface class for each test."""
 
     return NetInterface(**{
@@ -13,6 +22,7 @@ def iface():
         "state": "up",
         "controller": "fdsfs",
         "ipv4": {"enabled": True, "dhcp": True},
+        "store": store,
     })
 
 
@@ -473,3 +483,10 @@ def net_state() -> dict:
             }
         ]
     }
+
+
+@pytest.fixture()
+def memory_store(net_state) -> NetworkStore:
+    """The fixture creates the network state store backed by the in-memory simulator seeded with the network state."""
+
+    return NetworkStore(backend=MemoryBackend(net_state))
@@ -0,0 +1,125 @@
+"""
+test_addresses.py
+-----------------
+module for the IPv4 address index and the address conflict check tests
+"""
+
+import pytest
+
+from addresses import AddressEntry, AddressIndex, network_range
+from consts import ApplyResult
+from simulator import generate_state
+
+
+def test_network_range():
+    """Function network_range test"""
+
+    assert network_range("10.0.2.15", 24) == (0x0A000200, 0x0A0002FF)
+    assert network_range("10.0.2.15", 32) == (0x0A00020F, 0x0A00020F)
+    assert network_range("10.0.2.15", 0) == (0, 0xFFFFFFFF)
+
+
+@pytest.mark.parametrize(
+    "ip, prefix_length, expected",
+    [
+        ("10.0.2.20", 24, ["enp0s3"]),
+        ("10.0.2.20", 28, ["enp0s3"]),
+        ("10.0.0.1", 16, ["br0", "enp0s3"]),
+        ("10.0.3.1", 24, ["br0"]),
+        ("10.0.4.1", 24, []),
+        ("127.1.2.3", 24, ["lo"]),
+        ("192.168.1.1", 24, []),
+    ],
+)
+def test_conflicts(net_state, ip, prefix_length, expected):
+    """Method AddressIndex.conflicts test, the containing, contained and equal networks overlap"""
+
+    index = AddressIndex.from_raw(net_state)
+    assert sorted(entry.name for entry in index.conflicts(ip, prefix_length)) == expected
+
+
+def test_conflicts_exclude(net_state):
+    """Method AddressIndex.conflicts test, the addresses of the excluded interfaces are ignored"""
+
+    index = AddressIndex.from_raw(net_state)
+    assert index.conflicts("10.0.2.20", 24, exclude={"enp0s3"}) == []
+
+
+def test_conflicts_nested():
+    """Method AddressIndex.conflicts test, all networks inside the new one are found"""
+
+    index = AddressIndex(
+        AddressEntry(*network_range(ip, prefix_length), prefix_length, ip, name)
+        for ip, prefix_length, name in [
+            ("10.1.0.1", 16, "a"),
+            ("10.1.2.1", 24, "b"),
+            ("10.1.2.129", 25, "c"),
+            ("10.2.0.1", 24, "d"),
+        ]
+    )
+    assert sorted(entry.name for entry in index.conflicts("10.0.0.1", 8)) == ["a", "b", "c", "d"]
+    assert sorted(entry.name for entry in index.conflicts("10.1.2.200", 30)) == ["a", "b", "c"]
+    assert sorted(entry.name for entry in index.conflicts("10.1.3.1", 24)) == ["a"]
+
+
+def test_generated_state():
+    """Method AddressIndex.conflicts test on the generated network state"""
+
+    index = AddressIndex.from_raw(generate_state(1000, 100))
+    assert len(index.conflicts("10.0.0.100", 32)) == 500
+    assert index.conflicts("11.0.0.1", 24) == []
+
+
+def test_snapshot_index(memory_store):
+    """Method NetworkState.address_index test, the index is built once for the snapshot"""
+
+    snapshot = memory_store.update()
+    assert snapshot.address_index() is snapshot.address_index()
+
+
+def test_apply_conflict(memory_store):
+    """Method NetworkStore.apply_changes test, the address overlapping another interface is not applied"""
+
+    iface = memory_store.update().interfaces_by_name["enp0s8"]
+    result = iface.apply(**{"ipv4 address": "10.0.2.15/24"})
+    assert result.startswith(ApplyResult.ADDRESS_CONFLICT)
+    assert "10.0.2.15/24 on enp0s3" in result
+    assert memory_store.backend.applies == 0
+
+
+def test_apply_replaced_addresses(memory_store):
+    """Method NetworkStore.apply_changes test, the own address and the replaced addresses do not conflict"""
+
+    snapshot = memory_store.update()
+    enp0s3 = snapshot.interfaces_by_name["enp0s3"]
+    enp0s8 = snapshot.interfaces_by_name["enp0s8"]
+    assert enp0s3.apply(**{"ipv4 address": "10.0.2.16/24"}) == ApplyResult.OK
+    results = memory_store.apply_changes([
+        (enp0s3, {"ipv4 dhcp": True}),
+        (enp0s8, {"ipv4 address": "10.0.2.17/24, 10.0.5.1/30"}),
+    ])
+    assert results == {"enp0s3": ApplyResult.OK, "enp0s8": ApplyResult.OK}
+    fields = {item["name"]: item["value"] for item in memory_store.state.interfaces_by_name["enp0s8"].serialize()}
+    assert fields["ipv4 address"] == "10.0.2.17/24, 10.0.5.1/30"
+
+
+def test_apply_batch_conflict(memory_store):
+    """Method NetworkStore.apply_changes test, the addresses of the same changes conflict with each other"""
+
+    snapshot = memory_store.update()
+    results = memory_store.apply_changes([
+        (snapshot.interfaces_by_name["enp0s8"], {"ipv4 address": "192.168.0.1/16"}),
+        (snapshot.interfaces_by_name["enp0s9"], {"ipv4 address": "192.168.10.1/24"}),
+    ])
+    assert results["enp0s8"] == f"{ApplyResult.ADDRESS_CONFLICT}: 192.168.10.1/24 on enp0s9"
+    assert results["enp0s9"] == f"{ApplyResult.ADDRESS_CONFLICT}: 192.168.0.1/16 on enp0s8"
+
+
+def test_apply_after_dhcp(memory_store):
+    """Method NetworkStore.apply_changes test, the static address replaced by DHCP does not conflict"""
+
+    interfaces = memory_store.update().interfaces_by_name
+    assert interfaces["enp0s8"].apply(**{"ipv4 address": "192.168.7.1/24"}) == ApplyResult.OK
+    assert memory_store.state.interfaces_by_name["enp0s8"].apply(**{"ipv4 dhcp": True}) == ApplyResult.OK
+    assert memory_store.state.interfaces_by_name["enp0s9"].apply(**{"ipv4 address": "192.168.7.2/24"}) == ApplyResult.OK
+    assert not memory_store.state.address_index().conflicts("192.168.7.1", 24, exclude={"enp0s9"})
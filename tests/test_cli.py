@@ -0,0 +1,113 @@
+"""
+test_cli.py
+-----------
+Tests for the headless mode.
+"""
+
+import io
+import json
+
+from unittest.mock import patch
+
+import pytest
+
+from cli import load_changes, main, queue_changes
+
+
+def test_load_changes_json():
+    """Function load_changes test, the field names with underscores are accepted"""
+
+    stream = io.StringIO(json.dumps({"interfaces": [{"name": "enp0s3", "ipv4_dhcp": True}]}))
+    assert load_changes(stream) == [{"name": "enp0s3", "ipv4 dhcp": True}]
+
+
+def test_load_changes_yaml():
+    """Function load_changes test for YAML"""
+
+    pytest.importorskip("yaml")
+    stream = io.StringIO("- name: enp0s9\n  bridge name: br0\n")
+    assert load_changes(stream, "yaml") == [{"name": "enp0s9", "bridge name": "br0"}]
+
+
+@pytest.mark.parametrize("document", ['{"interfaces": {}}', '[{"state": "up"}]', "[1]", "{"])
+def test_load_changes_error(document):
+    """Function load_changes test with the wrong documents"""
+
+    with pytest.raises(ValueError):
+        load_changes(io.StringIO(document))
+
+
+def test_main(net_state, tmp_path, capsys):
+    """Function main test, the changes are applied in one transaction and printed as JSON"""
+
+    changes = tmp_path / "changes.json"
+    changes.write_text(json.dumps([
+        {"name": "enp0s3", "state": "down"},
+        {"name": "enp0s10", "state": "up"},
+        {"name": "enp0s9", "ipv4 address": "300.1.1.1"},
+        {"name": "eth9", "state": "down"},
+    ]))
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply') as mock_apply:
+        mock_show.return_value = net_state
+        code = main([str(changes), "--journal", str(tmp_path / "journal.jsonl")])
+
+    output = json.loads(capsys.readouterr().out)
+    assert code == 1
+    assert mock_apply.call_count == 1
+    assert output["results"] == {
+        "enp0s3": "Ok",
+        "enp0s10": "Ok",
+        "enp0s9": "errors field - ipv4 address",
+        "eth9": "unknown interface",
+    }
+
+
+def test_main_undo(net_state, tmp_path, capsys):
+    """Function main test, the last change of the journal is undone"""
+
+    changes = tmp_path / "changes.json"
+    changes.write_text(json.dumps([{"name": "enp0s10", "state": "up"}]))
+    journal = str(tmp_path / "journal.jsonl")
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply') as mock_apply:
+        mock_show.return_value = net_state
+        assert main([str(changes), "--journal", journal]) == 0
+        mock_show.return_value = {
+            **net_state,
+            "interfaces": [
+                {**iface, "state": "up"} if iface["name"] == "enp0s10" else iface for iface in net_state["interfaces"]
+            ],
+        }
+        assert main(["--undo", "--journal", journal]) == 0
+
+    output = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert output["results"] == {"enp0s10": "Ok"}
+    assert mock_apply.call_args.args[0]["interfaces"] == [
+        {"name": "enp0s10", "type": "ethernet", "state": "down", "ipv4": {"enabled": False}}
+    ]
+
+
+def test_main_journal_error(net_state, tmp_path, capsys):
+    """Function main test, the journal that cannot be written fails the apply and undo reports nothing to undo"""
+
+    changes = tmp_path / "changes.json"
+    changes.write_text(json.dumps([{"name": "enp0s10", "state": "up"}]))
+    journal = str(tmp_path / "changes.json" / "journal.jsonl")
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply'):
+        mock_show.return_value = net_state
+        assert main([str(changes), "--journal", journal]) == 1
+        output = json.loads(capsys.readouterr().out)
+        assert main(["--undo", "--journal", journal]) == 2
+
+    assert output["results"] == {"enp0s10": "Ok"}
+    assert "not recorded" in output["journal"]
+    assert json.loads(capsys.readouterr().out) == {"error": "nothing to undo"}
+
+
+def test_queue_changes_state(net_state, store):
+    """Function queue_changes test, the state that is not up or down is reported as an error field"""
+
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        store.update()
+    assert queue_changes(store, [{"name": "enp0s3", "state": True}]) == {"enp0s3": "errors field - state"}
+    assert not store.pending
@@ -0,0 +1,40 @@
+"""
+test_diff.py
+------------
+Tests for the desired state diff functions.
+"""
+
+import pytest
+
+from diff import diff_interfaces, is_subset
+
+
+@pytest.mark.parametrize("desired, current, expected", [
+    ({"enabled": True}, {"enabled": True, "dhcp": True}, True),
+    ({"enabled": True, "dhcp": False}, {"enabled": True, "dhcp": True}, False),
+    ([{"name": "a"}, {"name": "b"}], [{"name": "b", "stp": 1}, {"name": "a", "stp": 1}], True),
+    ([{"name": "a"}], [{"name": "a"}, {"name": "b"}], False),
+    ("up", "down", False),
+    ({"ipv4": {"enabled": True}}, None, False),
+])
+def test_is_subset(desired, current, expected):
+    assert is_subset(desired, current) == expected
+
+
+def test_diff_interfaces(net_state):
+    """Function diff_interfaces test, only the changed interfaces are returned"""
+
+    desired = [
+        {
+            "name": "br0",
+            "type": "linux-bridge",
+            "state": "up",
+            "ipv4": {"enabled": True, "dhcp": True},
+            "bridge": {"port": [{"name": "enp0s8"}, {"name": "enp0s9"}]},
+        },
+        {"name": "enp0s10", "state": "down"},
+        {"name": "enp0s3", "state": "down"},
+        {"name": "br1", "type": "linux-bridge", "state": "up"},
+    ]
+    res = diff_interfaces(net_state, desired)
+    assert [iface["name"] for iface in res] == ["enp0s3", "br1"]
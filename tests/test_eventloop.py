@@ -0,0 +1,106 @@
+"""
+test_eventloop.py
+-----------------
+module for the reader of the keys in the event loop tests, the terminal is replaced by a pipe
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import eventloop
+
+from eventloop import InputReader, read_key, wake
+
+
+class PipeWindow:
+    """Class - window reading the keys from the pipe like getch() of curses in the no-delay mode."""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.reads = 0
+        os.set_blocking(fd, False)
+
+    def nodelay(self, flag: bool) -> None:
+        pass
+
+    def getch(self) -> int:
+        self.reads += 1
+        try:
+            data = os.read(self.fd, 1)
+        except BlockingIOError:
+            return -1
+        return data[0] if data else -1
+
+
+@pytest.fixture()
+def pipe():
+    """The fixture creates the pipe of the terminal input."""
+
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def test_read_keys(pipe):
+    """Function read_key test, the keys are returned in the order they have been typed"""
+
+    read_fd, write_fd = pipe
+    window = PipeWindow(read_fd)
+
+    async def controller():
+        os.write(write_fd, b"ab")
+        keys = [await read_key(window), await read_key(window)]
+        threading.Timer(0.05, os.write, (write_fd, b"q")).start()
+        keys.append(await read_key(window))
+        return keys
+
+    assert eventloop.run(controller(), read_fd) == [ord("a"), ord("b"), ord("q")]
+    assert InputReader.current is None
+
+
+def test_idle_wait(pipe):
+    """Function read_key test, the idle reader does not poll the window"""
+
+    read_fd, write_fd = pipe
+    window = PipeWindow(read_fd)
+
+    async def controller():
+        threading.Timer(0.3, os.write, (write_fd, b"x")).start()
+        return await read_key(window)
+
+    assert eventloop.run(controller(), read_fd) == ord("x")
+    assert window.reads <= 3
+
+
+def test_busy_timeout(pipe):
+    """Function read_key test, the busy reader returns -1 after the poll interval"""
+
+    read_fd, _ = pipe
+    window = PipeWindow(read_fd)
+
+    async def controller():
+        started = time.monotonic()
+        key = await read_key(window, busy=True)
+        return key, time.monotonic() - started
+
+    key, elapsed = eventloop.run(controller(), read_fd)
+    assert key == -1
+    assert 0.05 < elapsed < 1
+
+
+def test_wake(pipe):
+    """Function wake test, the background thread interrupts the waiting for a key"""
+
+    read_fd, _ = pipe
+    window = PipeWindow(read_fd)
+
+    async def controller():
+        threading.Timer(0.05, wake).start()
+        return await read_key(window)
+
+    assert eventloop.run(controller(), read_fd) == -1
+    wake()
@@ -0,0 +1,122 @@
+"""
+test_hosts.py
+---------------
+module for the multi-host mode tests, the agents are started as local subprocesses with the fake network state
+"""
+
+import io
+import json
+import os
+import sys
+import time
+
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+
+from cli import apply_hosts
+from consts import ApplyResult
+from hosts import Host, close_hosts, load_hosts, refresh_hosts
+from remote import AgentError
+from simulator import MemoryBackend
+from state import NetworkStore
+
+AGENT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent.py")
+
+
+@pytest.fixture()
+def state_file(tmp_path, net_state):
+    """The fixture writes the network state served by the fake agents."""
+
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps(net_state))
+    return str(path)
+
+
+def fake_host(name: str, state_file: str, delay: float = 0.0) -> Host:
+    """The function creates the host with the local fake agent."""
+
+    return Host.connect(name, [sys.executable, AGENT, "--fake", state_file, "--delay", str(delay)])
+
+
+def test_remote_store(state_file):
+    """Class Host test, the state is requested and the changes are applied through the agent"""
+
+    host = fake_host("server1", state_file)
+    try:
+        assert host.refresh().error is None
+        assert host.status() == f"{len(host.store.state.interfaces)} ifaces"
+        assert "enp0s10" in host.store.state.interfaces_by_name
+        report = apply_hosts([{"name": "enp0s10", "state": "up"}, {"name": "eth9", "state": "down"}], [host])
+        assert report.targets["server1"].results == {"enp0s10": ApplyResult.OK, "eth9": "unknown interface"}
+        assert host.store.update(force=True).interfaces_by_name["enp0s10"].state == "up"
+    finally:
+        host.close()
+
+
+def test_refresh_hosts_concurrently(state_file):
+    """Function refresh_hosts test, the hosts are requested at the same time"""
+
+    delay = 0.5
+    hosts = [fake_host(f"server{i}", state_file, delay) for i in range(8)]
+    try:
+        started = time.monotonic()
+        refresh_hosts(hosts)
+        elapsed = time.monotonic() - started
+    finally:
+        close_hosts(hosts)
+    assert all(host.loaded and host.error is None for host in hosts)
+    assert elapsed < delay * 4
+
+
+def test_agent_failure():
+    """Class Host test, the failure of the agent is kept as the host error"""
+
+    host = Host.connect("server1", [sys.executable, "-c", "pass"])
+    assert host.refresh().error is not None
+    assert host.status().startswith("error")
+    with pytest.raises(AgentError):
+        host.store.update()
+    host.close()
+
+
+def test_refresh_pool_failure(net_state):
+    """Function refresh_hosts test, the failure of the process pool is kept as the host error"""
+
+    hosts = [Host(name, NetworkStore(backend=MemoryBackend(net_state))) for name in ["root", "ns1"]]
+    with patch.object(hosts[1].store.backend, "show", side_effect=BrokenProcessPool("the pool has died")):
+        refresh_hosts(hosts)
+    assert hosts[0].error is None
+    assert hosts[1].status() == "error: the pool has died"
+
+
+def test_load_hosts():
+    """Function load_hosts test, the default and the custom agent commands"""
+
+    hosts = load_hosts(io.StringIO("# hosts\n\nserver1\nserver2 ssh -p 2222 admin@server2 python3 agent.py\n"))
+    assert [host.name for host in hosts] == ["server1", "server2"]
+    assert hosts[0].store.backend.command == ["ssh", "server1", "sudo", "python3", "agent.py"]
+    assert hosts[1].store.backend.command == ["ssh", "-p", "2222", "admin@server2", "python3", "agent.py"]
+
+
+def test_agent_stalled_line():
+    """Class RemoteNmstate test, the timeout is kept when the agent stalls in the middle of the line"""
+
+    script = "import sys, time; sys.stdin.readline(); print('{\"id\": 1,', end='', flush=True); time.sleep(30)"
+    host = Host.connect("server1", [sys.executable, "-c", script], timeout=0.5)
+    started = time.monotonic()
+    with pytest.raises(AgentError, match="not responded"):
+        host.store.backend.show()
+    assert time.monotonic() - started < 5
+    host.close()
+
+
+def test_agent_wrong_id():
+    """Class RemoteNmstate test, the response to another request is rejected"""
+
+    script = "import sys; sys.stdin.readline(); print('{\"id\": 7, \"result\": {}}', flush=True); sys.stdin.readline()"
+    host = Host.connect("server1", [sys.executable, "-c", script])
+    with pytest.raises(AgentError, match="another request"):
+        host.store.backend.show()
+    host.close()
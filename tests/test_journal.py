@@ -0,0 +1,182 @@
+"""
+test_journal.py
+-----------------
+module for the change journal tests, the changes are applied to the in-memory simulator
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from consts import ApplyResult, Journal
+from journal import ChangeJournal, minimal_state, restore_state
+from simulator import MemoryBackend
+from state import NetworkStore
+
+
+@pytest.fixture()
+def journal(tmp_path):
+    """The fixture creates the journal in the temporary directory and closes it after the test."""
+
+    journal = ChangeJournal(str(tmp_path / "journal.jsonl"), flush_interval=0.01)
+    yield journal
+    journal.close()
+
+
+@pytest.fixture()
+def journal_store(memory_store, journal) -> NetworkStore:
+    """The fixture attaches the journal to the store backed by the simulator."""
+
+    memory_store.journal = journal
+    return memory_store
+
+
+def fields(store: NetworkStore, name: str) -> dict:
+    """The function returns the serialized fields of the interface by name."""
+
+    return {item["name"]: item["value"] for item in store.state.interfaces_by_name[name].serialize()}
+
+
+def test_restore_state(net_state):
+    """Function restore_state test, only the fields changed by the application are kept"""
+
+    interfaces = {iface["name"]: iface for iface in net_state["interfaces"]}
+    assert restore_state("enp0s3", interfaces["enp0s3"]) == {
+        "name": "enp0s3",
+        "type": "ethernet",
+        "state": "up",
+        "ipv4": {"enabled": True, "dhcp": True},
+        "controller": "",
+    }
+    assert restore_state("br0", interfaces["br0"])["bridge"] == {"port": [{"name": "enp0s8"}, {"name": "enp0s9"}]}
+    assert restore_state("br1", None) == {"name": "br1", "state": "absent"}
+
+
+def test_minimal_state(net_state):
+    """Function minimal_state test, the states matching the cached entries are dropped"""
+
+    interfaces = {iface["name"]: iface for iface in net_state["interfaces"]}
+    desired = [
+        restore_state("enp0s3", interfaces["enp0s3"]),
+        {"name": "enp0s10", "state": "up"},
+        {"name": "br1", "state": "absent"},
+    ]
+    assert minimal_state(desired, interfaces.get) == [{"name": "enp0s10", "state": "up"}]
+
+
+def test_undo_redo(journal_store, journal):
+    """Methods NetworkStore.undo and redo test, the interfaces are restored by the journal"""
+
+    enp0s3 = journal_store.update().interfaces_by_name["enp0s3"]
+    assert enp0s3.apply(**{"ipv4 address": "10.0.2.16/24"}) == ApplyResult.OK
+    applies = journal_store.backend.applies
+
+    assert journal_store.undo() == {"enp0s3": ApplyResult.OK}
+    assert fields(journal_store, "enp0s3")["ipv4 dhcp"] is True
+    assert journal_store.redo() == {"enp0s3": ApplyResult.OK}
+    assert fields(journal_store, "enp0s3")["ipv4 address"] == "10.0.2.16/24"
+    assert journal_store.backend.applies == applies + 2
+    assert [transaction.kind for transaction in journal.transactions] == [Journal.APPLY, Journal.UNDO, Journal.REDO]
+    assert journal.done == [1]
+    assert journal_store.redo() == {}
+
+
+def test_undo_bridge(journal_store):
+    """Method NetworkStore.undo test, the created bridge is removed and the port is returned"""
+
+    enp0s3 = journal_store.update().interfaces_by_name["enp0s3"]
+    assert enp0s3.apply(**{"bridge name": "br1"}) == ApplyResult.OK
+    assert journal_store.state.port_bridges["enp0s3"] == "br1"
+
+    results = journal_store.undo()
+    assert results["br1"] == ApplyResult.OK
+    assert "br1" not in journal_store.state.bridges_by_name
+    assert "enp0s3" not in journal_store.state.port_bridges
+
+
+def test_revert(journal_store, journal):
+    """Method NetworkStore.revert test, the interface is restored as it was at the moment"""
+
+    enp0s10 = journal_store.update().interfaces_by_name["enp0s10"]
+    enp0s10.apply(**{"state": "up"})
+    moment = journal.transactions[-1].time
+    journal_store.state.interfaces_by_name["enp0s10"].apply(**{"ipv4 address": "192.168.1.1/24"})
+    journal_store.state.interfaces_by_name["enp0s10"].apply(**{"state": "down"})
+
+    assert journal_store.revert("enp0s10", moment) == {"enp0s10": ApplyResult.OK}
+    assert fields(journal_store, "enp0s10")["state"] == "up"
+    assert journal.transactions[-1].kind == Journal.REVERT
+    assert journal_store.revert("enp0s10", journal.transactions[-1].time) == {"enp0s10": ApplyResult.NO_CHANGE}
+
+
+def test_replay(journal_store, journal, net_state):
+    """Method NetworkStore.apply_state test, the transaction is replayed on another host"""
+
+    enp0s3 = journal_store.update().interfaces_by_name["enp0s3"]
+    enp0s3.apply(**{"state": "down"})
+    other = NetworkStore(backend=MemoryBackend(net_state))
+
+    transaction = journal.get(1)
+    assert other.apply_state(transaction.state["interfaces"], kind=Journal.REPLAY, target=1) == {
+        "enp0s3": ApplyResult.OK
+    }
+    assert fields(other, "enp0s3")["state"] == "down"
+    assert other.apply_state(transaction.state["interfaces"]) == {"enp0s3": ApplyResult.NO_CHANGE}
+
+
+def test_persistence(journal_store, journal):
+    """Class ChangeJournal test, the transactions are read back and the cut off line is skipped"""
+
+    enp0s10 = journal_store.update().interfaces_by_name["enp0s10"]
+    enp0s10.apply(**{"state": "up"})
+    journal_store.undo()
+    journal.close()
+    with open(journal.path, "a") as stream:
+        stream.write('{"id": 3, "ti')
+
+    reopened = ChangeJournal(journal.path)
+    assert [transaction.kind for transaction in reopened.transactions] == [Journal.APPLY, Journal.UNDO]
+    assert reopened.undone == [1]
+    assert reopened.redo_target().before == journal.get(1).before
+    reopened.append(Journal.REDO, {"interfaces": []}, {}, 1)
+    reopened.close()
+    assert [transaction.id for transaction in ChangeJournal(journal.path).transactions] == [1, 2, 3]
+
+
+def test_batched_sync(tmp_path):
+    """Class ChangeJournal test, the transactions appended within the interval are written at once"""
+
+    journal = ChangeJournal(str(tmp_path / "journal.jsonl"), flush_interval=0.2)
+    for _ in range(3):
+        journal.append(Journal.APPLY, {"interfaces": []}, {})
+    assert (tmp_path / "journal.jsonl").read_text() == ""
+    journal.flush()
+    assert len((tmp_path / "journal.jsonl").read_text().splitlines()) == 3
+    journal.close()
+
+
+def test_shared_journal(tmp_path, journal):
+    """Class ChangeJournal test, the journals sharing the file number the transactions after each other"""
+
+    other = ChangeJournal(journal.path, flush_interval=0.01)
+    journal.append(Journal.APPLY, {"interfaces": []}, {"enp0s3": {}})
+    other.append(Journal.APPLY, {"interfaces": []}, {"enp0s8": {}})
+    journal.append(Journal.UNDO, {"interfaces": []}, {"enp0s8": {}}, 2)
+    other.close()
+    journal.close()
+
+    assert [transaction.id for transaction in other.transactions] == [1, 2]
+    assert [transaction.id for transaction in journal.transactions] == [1, 2, 3]
+    assert (journal.done, journal.undone) == ([1], [2])
+    assert [transaction.id for transaction in ChangeJournal(journal.path).transactions] == [1, 2, 3]
+
+
+def test_lazy_schema():
+    """Module journal test, the journal and the application are imported without loading the nmstate lib"""
+
+    code = "import sys, app, journal; print('libnmstate' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,152 @@
+"""
+test_kernel.py
+----------------
+module for the slim query of the network state from the kernel tests, the rtnetlink socket is replaced
+by the fake one replying with the packed messages
+"""
+
+import socket
+import struct
+
+from unittest.mock import patch
+
+import pytest
+
+from kernel import KernelBackend, show_kernel
+from state import NetworkStore
+from tests.test_watcher import attribute
+
+
+def message(type: int, payload: bytes, sequence: int) -> bytes:
+    """The function packs the netlink message of the dump."""
+
+    return struct.pack("=IHHII", 16 + len(payload), type, 2, sequence, 0) + payload
+
+
+def link(index: int, name: str, arphrd: int = 1, kind: str = "", master: int = 0, up: bool = True) -> bytes:
+    """The function packs the link of the dump."""
+
+    payload = struct.pack("=BxHiII", 0, arphrd, index, int(up), 0)
+    payload += attribute(3, name.encode() + b"\0") + attribute(1, bytes([2, 0, 0, 0, 0, index]))
+    if kind:
+        payload += attribute(18, attribute(1, kind.encode() + b"\0"))
+    if master:
+        payload += attribute(10, struct.pack("=I", master))
+    return payload
+
+
+def address(index: int, ip: str, prefix_length: int, valid: int = 0xFFFFFFFF) -> bytes:
+    """The function packs the IPv4 address of the dump."""
+
+    payload = struct.pack("=BBBBI", socket.AF_INET, prefix_length, 0, 0, index)
+    return payload + attribute(2, socket.inet_aton(ip)) + attribute(6, struct.pack("=IIII", valid, valid, 0, 0))
+
+
+class FakeSocket:
+    """Class - rtnetlink socket replying to the dump requests, each dump is split into two datagrams."""
+
+    def __init__(self, dumps: dict[int, list[bytes]], error: int = 0):
+        self.dumps = dumps
+        self.error = error
+        self.replies = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def bind(self, address):
+        pass
+
+    def send(self, data: bytes) -> int:
+        _, type, _, sequence, _ = struct.unpack_from("=IHHII", data)
+        if self.error:
+            self.replies.append(message(2, struct.pack("=i", -self.error) + data[:16], sequence))
+            return len(data)
+        messages = [message(type - 2, payload, sequence) for payload in self.dumps[type]]
+        self.replies.append(b"".join(messages[:1]))
+        self.replies.append(b"".join(messages[1:]) + message(3, struct.pack("=i", 0), sequence))
+        return len(data)
+
+    def recv(self, size: int) -> bytes:
+        return self.replies.pop(0)
+
+
+@pytest.fixture()
+def kernel_socket():
+    """The fixture replaces the rtnetlink socket by the fake one with two ports of the bridge and a VLAN."""
+
+    fake = FakeSocket({
+        18: [
+            link(1, "lo", arphrd=772),
+            link(2, "enp0s3"),
+            link(3, "br0", kind="bridge"),
+            link(4, "enp0s8", master=3),
+            link(5, "veth0", kind="veth", master=3),
+            link(6, "enp0s9", up=False),
+            link(7, "enp0s3.50", kind="vlan"),
+        ],
+        22: [
+            address(1, "127.0.0.1", 8),
+            address(2, "10.0.2.15", 24, valid=80415),
+            address(3, "10.0.3.15", 24),
+            address(3, "10.0.4.15", 16),
+            address(7, "192.168.50.1", 24),
+        ],
+    })
+    with patch("kernel.socket.socket", return_value=fake):
+        yield fake
+
+
+def test_show_kernel(kernel_socket):
+    """Function show_kernel test, only the Ethernet interfaces and the bridges with the used fields are returned"""
+
+    interfaces = {iface["name"]: iface for iface in show_kernel()["interfaces"]}
+    assert list(interfaces) == ["enp0s3", "br0", "enp0s8", "enp0s9"]
+    assert interfaces["enp0s3"] == {
+        "name": "enp0s3",
+        "type": "ethernet",
+        "state": "up",
+        "mac-address": "02:00:00:00:00:02",
+        "ipv4": {"enabled": True, "dhcp": True, "address": [{"ip": "10.0.2.15", "prefix-length": 24}]},
+    }
+    assert interfaces["br0"]["type"] == "linux-bridge"
+    assert interfaces["br0"]["ipv4"]["dhcp"] is False
+    assert [address["ip"] for address in interfaces["br0"]["ipv4"]["address"]] == ["10.0.3.15", "10.0.4.15"]
+    assert interfaces["br0"]["bridge"] == {"port": [{"name": "enp0s8"}, {"name": "veth0"}]}
+    assert interfaces["enp0s8"]["controller"] == "br0"
+    assert interfaces["enp0s9"]["state"] == "down"
+    assert interfaces["enp0s9"]["ipv4"] == {"enabled": False, "dhcp": False, "address": []}
+
+
+def test_store(kernel_socket):
+    """Class KernelBackend test, the snapshot is built from the slim network state"""
+
+    snapshot = NetworkStore(backend=KernelBackend()).update()
+    assert [interface.name for interface in snapshot.interfaces] == ["enp0s3", "enp0s8", "enp0s9"]
+    assert dict(snapshot.port_bridges) == {"enp0s8": "br0", "veth0": "br0"}
+    assert snapshot.search_index().search("10.0.2.15") == [0]
+
+
+def test_dump_error(net_state):
+    """Class KernelBackend test, the whole network state is requested if the dump fails"""
+
+    with patch("kernel.socket.socket", return_value=FakeSocket({}, error=1)):
+        with pytest.raises(PermissionError):
+            show_kernel()
+        with patch("libnmstate.show", return_value=net_state):
+            assert KernelBackend().show() is net_state
+
+
+def test_other_addresses(kernel_socket):
+    """Function show_kernel test, the addresses of the other links are kept for the address conflicts"""
+
+    state = show_kernel()
+    assert "enp0s3.50" not in {iface["name"] for iface in state["interfaces"]}
+    assert {"name": "enp0s3.50", "ip": "192.168.50.1", "prefix-length": 24} in state["other-interface-addresses"]
+
+    snapshot = NetworkStore(backend=KernelBackend()).update()
+    assert [str(entry) for entry in snapshot.address_index().conflicts("192.168.50.2", 24)] == [
+        "192.168.50.1/24 on enp0s3.50"
+    ]
@@ -4,6 +4,8 @@ test_netinterface_model.py
 module for NetInterface class tests
 """
 
+import threading
+
 from unittest.mock import patch
 
 import libnmstate
@@ -71,11 +73,10 @@ def test_update_bridges(iface):
     """Method update_bridges test"""
 
     bridge_name = "br0"
-    iface.update_bridges(bridge_name)
-    assert iface.bridges
-    bridges = [b for b in iface.bridges if b["name"] == bridge_name]
-    assert len(bridges) == 1
-    bridge = bridges[0]
+    bridges = dict()
+    iface.update_bridges(bridges, bridge_name)
+    assert bridges
+    bridge = bridges[bridge_name]
     assert bridge["type"] == "linux-bridge"
     assert bridge["state"] == "up"
     assert bridge["ipv4"]["enabled"] is True
@@ -101,15 +102,15 @@ def test_serialize(iface):
     assert res == expected
 
 
-def test_update_interfaces(iface, net_state):
-    """Method update_interfaces test"""
+def test_update_interfaces(store, net_state):
+    """Method update test of the store"""
 
     with patch('libnmstate.show') as mock_show:
         mock_show.return_value = net_state
-        iface.update_interfaces()
+        snapshot = store.update()
 
-    assert len(iface.bridges) == 1
-    assert len(iface.ethernet_interfaces) == 4
+    assert len(snapshot.bridges) == 1
+    assert len(snapshot.interfaces) == 4
 
 
 def test_get_interfaces(net_state):
@@ -127,3 +128,90 @@ def test_get_bridge_ports(iface, net_state):
     bridge = bridges[0]
     ports = iface.get_bridge_ports(bridge)
     assert len(ports) == len(bridge["bridge"]["port"])
+
+
+def test_queue(iface):
+    """Method queue test"""
+
+    res = iface.queue(state="down")
+    assert res == "queued"
+    assert iface.name in iface.store.pending
+    res = iface.queue(state="up")
+    assert res == "no change"
+    assert iface.name not in iface.store.pending
+
+
+def test_commit(store, net_state):
+    """Method commit test, the queued changes are applied in one transaction"""
+
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply') as mock_apply:
+        mock_show.return_value = net_state
+        interfaces = store.update().interfaces_by_name
+        interfaces["enp0s3"].queue(state="down")
+        interfaces["enp0s9"].queue(**{"bridge name": "br0"})
+        results = store.commit()
+
+    assert mock_apply.call_count == 1
+    assert results == {"enp0s3": "Ok", "enp0s9": "Ok"}
+    assert not store.pending
+    state = mock_apply.call_args.args[0]
+    names = [iface["name"] for iface in state["interfaces"]]
+    assert "enp0s3" in names
+    assert "enp0s9" in names
+
+
+def test_apply_sends_changed_interfaces(store, net_state):
+    """Method apply test, the unchanged bridges are not sent to the nmstate lib"""
+
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply') as mock_apply:
+        mock_show.return_value = net_state
+        interfaces = store.update().interfaces_by_name
+        res = interfaces["enp0s3"].apply(state="down")
+
+    assert res == "Ok"
+    state = mock_apply.call_args.args[0]
+    assert [iface["name"] for iface in state["interfaces"]] == ["enp0s3"]
+
+
+def test_apply_cancelled(store, net_state):
+    """Method apply test, the cancelled change is rolled back after the verification"""
+
+    cancel = threading.Event()
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply') as mock_apply, \
+            patch('libnmstate.rollback') as mock_rollback, patch('libnmstate.commit') as mock_commit:
+        mock_show.return_value = net_state
+        mock_apply.side_effect = lambda *args, **kwargs: cancel.set()
+        interfaces = store.update().interfaces_by_name
+        res = interfaces["enp0s3"].apply(cancel=cancel, state="down")
+
+    assert res == "cancelled"
+    assert mock_apply.call_args.kwargs["commit"] is False
+    assert mock_rollback.call_count == 1
+    assert mock_commit.call_count == 0
+
+
+def test_slots(iface):
+    """The interface keeps no per-instance dictionary"""
+
+    assert not hasattr(iface, "__dict__")
+    with pytest.raises(AttributeError):
+        iface.unknown = True
+
+
+def test_dhcp_down_prefix_length(iface):
+    """Method dhcp_down test, the addresses with the prefix lengths"""
+
+    res = iface.dhcp_down("10.0.2.10/16, 10.0.3.10")
+    assert res["ipv4"]["address"] == [
+        {"ip": "10.0.2.10", "prefix-length": 16},
+        {"ip": "10.0.3.10", "prefix-length": 24},
+    ]
+
+
+def test_apply_after_external_change(memory_store):
+    """Method apply test, the values are compared with the current snapshot, not with the older record"""
+
+    record = memory_store.update().interfaces_by_name["enp0s3"]
+    memory_store.patch_interface({"name": "enp0s3", "state": "down"})
+    assert record.apply(state="up") == "Ok"
+    assert memory_store.state.interfaces_by_name["enp0s3"].state == "up"
@@ -0,0 +1,118 @@
+"""
+test_netns.py
+---------------
+module for the network namespace tests, the calls of the pool are run in the threads
+and the namespace is not switched
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from hosts import Host, filter_hosts
+from netns import NamespaceBackend, list_namespaces, namespace_hosts
+from simulator import MemoryBackend
+from state import NetworkStore
+
+
+@pytest.fixture()
+def executor():
+    """The fixture creates the pool of the namespace calls."""
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture()
+def enter_namespace():
+    """The fixture records the entered namespaces instead of switching them."""
+
+    with patch("netns.enter_namespace") as enter_namespace:
+        yield enter_namespace
+
+
+def test_list_namespaces(tmp_path):
+    """Function list_namespaces test"""
+
+    for name in ["ns2", "ns1"]:
+        (tmp_path / name).touch()
+    assert list_namespaces(str(tmp_path)) == ["ns1", "ns2"]
+    assert list_namespaces(str(tmp_path / "missing")) == []
+
+
+def test_namespace_hosts(tmp_path, executor):
+    """Function namespace_hosts test, the namespace of the host is the first"""
+
+    (tmp_path / "ns1").touch()
+    hosts = namespace_hosts(executor, str(tmp_path))
+    assert [host.name for host in hosts] == ["root", "ns1"]
+    assert [host.store.backend.namespace for host in hosts] == [None, "ns1"]
+
+
+def test_show(net_state, executor, enter_namespace):
+    """Class NamespaceBackend test, the namespace is read from the kernel, the host through NetworkManager"""
+
+    with patch("libnmstate.show", return_value=net_state) as show:
+        assert NamespaceBackend("ns1", executor).show() is net_state
+        show.assert_called_with(kernel_only=True)
+        NamespaceBackend(None, executor).show()
+        show.assert_called_with(kernel_only=False)
+    assert [call.args[0] for call in enter_namespace.call_args_list] == ["ns1", None]
+
+
+def test_store(net_state, executor, enter_namespace):
+    """Class NamespaceBackend test, the store of the namespace applies the changes in the namespace"""
+
+    store = NetworkStore(backend=NamespaceBackend("ns1", executor))
+    with patch("libnmstate.show", return_value=net_state), patch("libnmstate.apply") as apply:
+        result = store.update().interfaces_by_name["enp0s8"].apply(state="down")
+    assert result == "Ok"
+    assert apply.call_args.args[0]["interfaces"][-1] == {"name": "enp0s8", "state": "down"}
+    assert apply.call_args.kwargs["kernel_only"] is True
+
+
+def test_rollback(net_state, executor, enter_namespace):
+    """Class NamespaceBackend test, the rollback applies the previous states of the changed interfaces"""
+
+    backend = NamespaceBackend("ns1", executor)
+    desired = {"interfaces": [{"name": "enp0s8", "state": "down"}, {"name": "veth0", "type": "veth"}]}
+    with patch("libnmstate.show", return_value=net_state), patch("libnmstate.apply") as apply:
+        checkpoint = backend.apply(desired, commit=False)
+        assert apply.call_args.args[0] is desired
+        backend.rollback(checkpoint=checkpoint)
+    previous = apply.call_args.args[0]["interfaces"]
+    assert previous[0] == next(iface for iface in net_state["interfaces"] if iface["name"] == "enp0s8")
+    assert previous[1] == {"name": "veth0", "state": "absent"}
+    assert backend.checkpoints == {}
+
+
+def test_host_checkpoint(executor, enter_namespace):
+    """Class NamespaceBackend test, the namespace of the host uses the checkpoints of NetworkManager"""
+
+    backend = NamespaceBackend(None, executor)
+    desired = {"interfaces": [{"name": "enp0s8", "state": "down"}]}
+    with patch("libnmstate.apply", return_value="/checkpoint/1") as apply, \
+            patch("libnmstate.commit") as commit, patch("libnmstate.rollback") as rollback:
+        assert backend.apply(desired, commit=False, rollback_timeout=30) == "/checkpoint/1"
+        backend.commit(checkpoint="/checkpoint/1")
+        backend.rollback(checkpoint="/checkpoint/2")
+    assert apply.call_args.kwargs == {"verify_change": True, "commit": False, "rollback_timeout": 30}
+    commit.assert_called_once_with(checkpoint="/checkpoint/1")
+    rollback.assert_called_once_with(checkpoint="/checkpoint/2")
+    assert backend.checkpoints == {}
+
+
+def test_filter_hosts(net_state):
+    """Function filter_hosts test, the hosts are found by the name and by the interfaces"""
+
+    hosts = []
+    for name in ["ns1", "ns2"]:
+        store = NetworkStore(backend=MemoryBackend(net_state))
+        store.update()
+        hosts.append(Host(name, store))
+    hosts.append(Host("ns3", NetworkStore(backend=MemoryBackend({"interfaces": []}))))
+    assert filter_hosts(hosts, "") == hosts
+    assert [host.name for host in filter_hosts(hosts, "ns2")] == ["ns2"]
+    assert [host.name for host in filter_hosts(hosts, "enp0s8")] == ["ns1", "ns2"]
+    assert filter_hosts(hosts, "eth9") == []
@@ -0,0 +1,96 @@
+"""
+test_rollout.py
+---------------
+module for the rollout of the interface configuration to many targets tests, the targets are served
+by the in-memory simulator of the backend
+"""
+
+import time
+
+from libnmstate.error import NmstateError
+
+from cache import StateCache
+from cli import apply_changes
+from consts import Rollout
+from hosts import Host
+from rollout import RolloutScheduler
+from simulator import MemoryBackend
+from state import NetworkStore
+
+CHANGES = [{"name": "enp0s10", "state": "up"}]
+
+
+class FailingBackend(MemoryBackend):
+    """Class - the simulator failing the verification of each apply."""
+
+    def apply(self, *args, **kwargs):
+        raise NmstateError("verification failed")
+
+
+def fake_target(name: str, net_state: dict, backend_class: type = MemoryBackend, delay: float = 0.0) -> Host:
+    """The function creates the target with the in-memory network state."""
+
+    backend = backend_class(net_state, delay)
+    return Host(name, NetworkStore(StateCache(backend=backend), backend=backend))
+
+
+def scheduler(**kwargs) -> RolloutScheduler:
+    """The function creates the scheduler applying the changes to the store of the target."""
+
+    return RolloutScheduler(lambda target, cancel: apply_changes(CHANGES, target.store, cancel), **kwargs)
+
+
+def state_of(target: Host) -> str:
+    """The function returns the state of the changed interface served by the simulator."""
+
+    return next(iface for iface in target.store.backend.show()["interfaces"] if iface["name"] == "enp0s10")["state"]
+
+
+def test_rollout_overlaps_targets(net_state):
+    """Class RolloutScheduler test, the targets are applied concurrently within the window"""
+
+    delay = 0.2
+    targets = [fake_target(f"target{i}", net_state, delay=delay) for i in range(8)]
+    started = time.monotonic()
+    report = scheduler(canary=1, window=8).run(targets)
+    elapsed = time.monotonic() - started
+    assert report.ok
+    assert all(state_of(target) == "up" for target in targets)
+    assert elapsed < delay * 2 * 8 / 2
+
+
+def test_rollout_canary_failure(net_state):
+    """Class RolloutScheduler test, the failed canary halts the rollout before the other targets"""
+
+    targets = [fake_target("canary", net_state, FailingBackend)]
+    targets += [fake_target(f"target{i}", net_state) for i in range(3)]
+    report = scheduler(canary=1, max_failure_rate=1.0).run(targets)
+    assert report.halted
+    assert report.targets["canary"].status == Rollout.FAILED
+    assert [report.targets[f"target{i}"].status for i in range(3)] == [Rollout.SKIPPED] * 3
+    assert all(state_of(target) == "down" for target in targets)
+
+
+def test_rollout_failure_rate(net_state):
+    """Class RolloutScheduler test, the rollout halts when the share of the failed targets exceeds the threshold"""
+
+    targets = [fake_target("canary", net_state), fake_target("target1", net_state, FailingBackend)]
+    targets += [fake_target(f"target{i}", net_state) for i in range(2, 5)]
+    report = scheduler(canary=1, window=1, max_failure_rate=0.3).run(targets)
+    assert report.halted == "failed 1 of 2 targets"
+    assert [result.status for result in report.targets.values()] == [
+        Rollout.OK, Rollout.FAILED, Rollout.SKIPPED, Rollout.SKIPPED, Rollout.SKIPPED
+    ]
+
+
+def test_rollout_rolls_back_running_targets(net_state):
+    """Class RolloutScheduler test, the change verified after the halt is rolled back"""
+
+    slow = fake_target("slow", net_state, delay=0.5)
+    slow.store.update()
+    targets = [fake_target("failing", net_state, FailingBackend, delay=0.1), slow]
+    report = scheduler(canary=0, window=2, max_failure_rate=0.2).run(targets)
+    assert report.targets["failing"].status == Rollout.FAILED
+    assert report.targets["slow"].status == Rollout.CANCELLED
+    assert state_of(slow) == "down"
+    assert not slow.store.backend.checkpoints
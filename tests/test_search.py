@@ -0,0 +1,50 @@
+"""
+test_search.py
+--------------
+Tests for the search index of the interfaces.
+"""
+
+import pytest
+
+from search import SearchIndex
+
+
+@pytest.fixture()
+def index():
+    """The fixture creates the index of the interface fields: name, MAC, IP, controller."""
+
+    return SearchIndex([
+        ("enp0s3", "08:00:27:F6:06:F3", "10.0.2.15", ""),
+        ("enp0s8", "08:00:27:C8:5E:4A", "", "br0"),
+        ("enp0s9", "08:00:27:89:A6:71", "", "br10"),
+        ("veth100", "", "192.168.10.5", ""),
+    ])
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("", [0, 1, 2, 3]),
+    ("e", [0, 1, 2, 3]),
+    ("ENP", [0, 1, 2]),
+    ("enp0s", [0, 1, 2]),
+    ("c8:5e", [1]),
+    ("10.", [0, 3]),
+    ("192.168", [3]),
+    ("br1", [2]),
+    ("s3\0", []),
+    ("missing", []),
+    ("^br", [1, 2]),
+    ("^10", [0]),
+    ("^0s", []),
+])
+def test_search(index, query, expected):
+    assert index.search(query) == expected
+
+
+def test_search_incremental(index):
+    """Method search test, typing the query char by char gives the same result as the whole query"""
+
+    for query in ("e", "en", "enp", "enp0", "enp0s", "enp0s9"):
+        res = index.search(query)
+    assert res == [2]
+    assert index.search("enp0s8") == [1]
+    assert index.search("veth") == [3]
@@ -0,0 +1,74 @@
+"""
+test_simulator.py
+-----------------
+module for the in-memory simulator of the network state backend tests
+"""
+
+import pytest
+
+from libnmstate.error import NmstateError
+
+from consts import ApplyResult
+from simulator import MemoryBackend, generate_state
+
+
+def test_show_shares_state(net_state):
+    """Class MemoryBackend test, the unchanged state is returned without copying"""
+
+    backend = MemoryBackend(net_state)
+    assert backend.show() is backend.show()
+    names = [iface["name"] for iface in net_state["interfaces"]]
+    assert [iface["name"] for iface in backend.show()["interfaces"]] == names
+
+
+def test_apply_syncs_bridge_ports(net_state):
+    """Class MemoryBackend test, the controller of the port and the ports of the bridge are kept in sync"""
+
+    backend = MemoryBackend(net_state)
+    before = backend.show()
+    backend.apply({"interfaces": [{"name": "enp0s10", "controller": "br0"}]})
+    interfaces = {iface["name"]: iface for iface in backend.show()["interfaces"]}
+    assert interfaces["enp0s10"]["controller"] == "br0"
+    assert {"name": "enp0s10"} in interfaces["br0"]["bridge"]["port"]
+    assert before is not backend.show()
+    assert "controller" not in next(iface for iface in before["interfaces"] if iface["name"] == "enp0s10")
+
+
+def test_apply_rejects_unknown_controller(net_state):
+    """Class MemoryBackend test, the controller must be a bridge"""
+
+    backend = MemoryBackend(net_state)
+    with pytest.raises(NmstateError):
+        backend.apply({"interfaces": [{"name": "enp0s10", "controller": "enp0s3"}]})
+    assert backend.applies == 0
+
+
+def test_rollback(net_state):
+    """Class MemoryBackend test, the uncommitted change is rolled back"""
+
+    backend = MemoryBackend(net_state)
+    before = backend.show()
+    checkpoint = backend.apply({"interfaces": [{"name": "enp0s3", "state": "absent"}]}, commit=False)
+    assert "enp0s3" not in {iface["name"] for iface in backend.show()["interfaces"]}
+    backend.rollback(checkpoint=checkpoint)
+    assert backend.show() is before
+
+
+def test_store_without_patching(memory_store):
+    """Class NetworkStore test, the changes are applied to the simulator without patching the nmstate lib"""
+
+    interface = memory_store.update().interfaces_by_name["enp0s10"]
+    assert interface.apply(**{"state": "up"}) == ApplyResult.OK
+    assert memory_store.backend.show() is memory_store.update(force=True).raw
+    assert memory_store.state.interfaces_by_name["enp0s10"].state == "up"
+
+
+def test_generate_state():
+    """Function generate_state test, the generated bridges and ports are consistent"""
+
+    state = generate_state(1000, 100)
+    interfaces = {iface["name"]: iface for iface in state["interfaces"]}
+    assert len(interfaces) == 1100
+    ports = [port["name"] for i in range(100) for port in interfaces[f"br{i}"]["bridge"]["port"]]
+    assert len(ports) == 500
+    assert all(interfaces[name]["controller"].startswith("br") for name in ports)
@@ -0,0 +1,162 @@
+"""
+test_state.py
+-------------
+module for NetworkState and NetworkStore classes tests
+"""
+
+import copy
+import json
+import threading
+
+from unittest.mock import patch
+
+from simulator import MemoryBackend
+from state import NetworkStore
+from tasks import ApplyTask
+
+
+def test_indexes(store, net_state):
+    """Class NetworkState test, the interfaces, the bridges and the ports are indexed by name"""
+
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        snapshot = store.update()
+
+    assert [interface.name for interface in snapshot.interfaces] == ["enp0s10", "enp0s3", "enp0s8", "enp0s9"]
+    assert snapshot.interfaces_by_name["enp0s3"] is snapshot.interfaces[1]
+    assert snapshot.bridges_by_name["br0"] is snapshot.bridges[0]
+    assert dict(snapshot.port_bridges) == {"enp0s8": "br0", "enp0s9": "br0"}
+    assert all(interface.store is store for interface in snapshot.interfaces)
+
+
+def test_update_reuses_snapshot(store, net_state):
+    """Method update test, the snapshot is rebuilt only when the network state is requested again"""
+
+    with patch('libnmstate.show') as mock_show:
+        mock_show.side_effect = lambda: copy.deepcopy(net_state)
+        snapshot = store.update()
+        assert store.update() is snapshot
+        assert store.update(force=True) is not snapshot
+
+
+def test_apply_copy_on_write(store, net_state):
+    """Method apply_changes test, the applied change publishes a new snapshot and keeps the previous one"""
+
+    origin = copy.deepcopy(net_state)
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply'):
+        mock_show.return_value = net_state
+        before = store.update()
+        before.interfaces_by_name["enp0s10"].apply(**{"bridge name": "br0"})
+        after = store.update()
+
+    assert mock_show.call_count == 1
+    assert net_state == origin
+    assert before.interfaces_by_name["enp0s10"].controller == ""
+    assert after.interfaces_by_name["enp0s10"].controller == "br0"
+    assert after.port_bridges["enp0s10"] == "br0"
+    assert "enp0s10" not in before.port_bridges
+    assert after.interfaces_by_name["enp0s3"] is before.interfaces_by_name["enp0s3"]
+
+
+def test_stores_apply_in_parallel(net_state):
+    """Class NetworkStore test, the stores of two hosts apply their changes in parallel threads"""
+
+    stores = [NetworkStore(), NetworkStore()]
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply') as mock_apply:
+        mock_show.side_effect = lambda: copy.deepcopy(net_state)
+        snapshots = [store.update() for store in stores]
+        threads = [
+            threading.Thread(target=snapshots[0].interfaces_by_name["enp0s3"].apply, kwargs={"state": "down"}),
+            threading.Thread(target=snapshots[1].interfaces_by_name["enp0s10"].apply, kwargs={"state": "up"}),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert mock_apply.call_count == 2
+    assert stores[0].state.interfaces_by_name["enp0s3"].state == "down"
+    assert stores[0].state.interfaces_by_name["enp0s10"].state == "down"
+    assert stores[1].state.interfaces_by_name["enp0s10"].state == "up"
+    assert stores[1].state.interfaces_by_name["enp0s3"].state == "up"
+
+
+def test_snapshot_stale_first(tmp_path, net_state):
+    """Methods save_snapshot and load_snapshot test, the saved snapshot is shown stale until the update"""
+
+    path = str(tmp_path / "cache" / "state.json")
+    NetworkStore(backend=MemoryBackend(net_state), snapshot_path=path).update()
+    saved = json.loads((tmp_path / "cache" / "state.json").read_text())
+    assert {iface["type"] for iface in saved["interfaces"]} == {"ethernet", "linux-bridge"}
+
+    backend = MemoryBackend(net_state)
+    store = NetworkStore(backend=backend, snapshot_path=path)
+    assert store.load_snapshot()
+    assert store.stale
+    assert backend.applies == 0 and store.cache.peek() is None
+    assert [interface.name for interface in store.state.interfaces] == ["enp0s10", "enp0s3", "enp0s8", "enp0s9"]
+    assert dict(store.state.port_bridges) == {"enp0s8": "br0", "enp0s9": "br0"}
+
+    snapshot = store.update()
+    assert not store.stale
+    assert snapshot.raw is backend.show()
+    assert not store.load_snapshot()
+
+
+def test_snapshot_missing_or_broken(tmp_path, net_state):
+    """Method load_snapshot test, the missing or broken file is ignored"""
+
+    path = tmp_path / "state.json"
+    store = NetworkStore(backend=MemoryBackend(net_state), snapshot_path=str(path))
+    assert not store.load_snapshot()
+    path.write_text('{"interfaces": [')
+    assert not store.load_snapshot()
+    assert not store.stale
+
+    (tmp_path / "file").touch()
+    store = NetworkStore(backend=MemoryBackend(net_state), snapshot_path=str(tmp_path / "file" / "state.json"))
+    store.update()
+    assert store.state.interfaces
+
+
+def test_update_during_apply(store, net_state):
+    """Method update test, the network state requested before an apply does not replace the applied entries"""
+
+    requested = threading.Event()
+    applied = threading.Event()
+
+    def show():
+        state = copy.deepcopy(net_state)
+        if threading.current_thread() is not threading.main_thread():
+            requested.set()
+            applied.wait()
+        return state
+
+    with patch('libnmstate.show') as mock_show, patch('libnmstate.apply'):
+        mock_show.side_effect = show
+        interface = store.update().interfaces_by_name["enp0s10"]
+        thread = threading.Thread(target=store.update, kwargs={"force": True})
+        thread.start()
+        requested.wait()
+        assert store.apply_changes([(interface, {"state": "up"})]) == {"enp0s10": "Ok"}
+        applied.set()
+        thread.join()
+
+    assert store.cache.get_interface("enp0s10")["state"] == "up"
+    assert store.state.interfaces_by_name["enp0s10"].state == "up"
+
+
+def test_apply_results(memory_store):
+    """Class ApplyTask test, the results are kept in the store of the task until the next apply"""
+
+    task = ApplyTask.start(["enp0s10"], lambda cancel: {"enp0s10": "Ok"}, memory_store)
+    task.future.result()
+    assert ApplyTask.pop_finished() is task
+    assert memory_store.results == {"enp0s10": "Ok"}
+
+    task = ApplyTask.start(["enp0s10"], lambda cancel: {"enp0s10": "no change"}, memory_store)
+    assert memory_store.results == {}
+    task.future.result()
+    ApplyTask.pop_finished()
+    assert memory_store.results == {"enp0s10": "no change"}
+    assert ApplyTask.current is None
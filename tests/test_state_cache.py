@@ -0,0 +1,104 @@
+"""
+test_state_cache.py
+-------------------
+module for StateCache class tests
+"""
+
+from unittest.mock import patch
+
+from cache import StateCache
+
+
+def test_get_uses_cache(net_state):
+    """Method get test, the nmstate lib is requested once while the cache is not expired"""
+
+    cache = StateCache(ttl=60)
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        cache.get()
+        cache.get()
+    assert mock_show.call_count == 1
+
+
+def test_get_expired(net_state):
+    """Method get test, the expired cache requests the network state again"""
+
+    cache = StateCache(ttl=0)
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        cache.get()
+        cache.get()
+    assert mock_show.call_count == 2
+
+
+def test_invalidate(net_state):
+    """Method invalidate test"""
+
+    cache = StateCache(ttl=60)
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        cache.get()
+        cache.invalidate()
+        cache.get()
+    assert mock_show.call_count == 2
+
+
+def test_refresh_interface(net_state):
+    """Method refresh_interface test"""
+
+    cache = StateCache(ttl=60)
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        cache.get()
+        cache.refresh_interface({"name": "enp0s10", "state": "up", "ipv4": {"enabled": True, "dhcp": True}})
+        state = cache.get()
+    assert mock_show.call_count == 1
+    iface = [i for i in state["interfaces"] if i["name"] == "enp0s10"][0]
+    assert iface["state"] == "up"
+    assert iface["ipv4"] == {"enabled": True, "dhcp": True}
+    assert iface["type"] == "ethernet"
+
+
+def test_refresh_interface_bridge_ports(net_state):
+    """Method refresh_interface test, the bridge ports update the controller of the interfaces"""
+
+    cache = StateCache(ttl=60)
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        cache.get()
+    cache.refresh_interface({
+        "name": "br0",
+        "type": "linux-bridge",
+        "state": "up",
+        "bridge": {"port": [{"name": "enp0s9"}]},
+    })
+    interfaces = {i["name"]: i for i in cache.get()["interfaces"]}
+    assert interfaces["enp0s9"]["controller"] == "br0"
+    assert "controller" not in interfaces["enp0s8"]
+
+
+def test_refresh_interface_controller(net_state):
+    """Method refresh_interface test, the new controller of the interface moves it between the bridge ports"""
+
+    cache = StateCache(ttl=60)
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        cache.get()
+    cache.refresh_interface({"name": "enp0s10", "controller": "br0"})
+    cache.refresh_interface({"name": "enp0s8", "controller": ""})
+    assert [port["name"] for port in cache.get_interface("br0")["bridge"]["port"]] == ["enp0s9", "enp0s10"]
+    assert "controller" not in cache.get_interface("enp0s8")
+
+
+def test_remove_interface(net_state):
+    """Method remove_interface test"""
+
+    cache = StateCache(ttl=60)
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        cache.get()
+    cache.remove_interface("enp0s8")
+    cache.remove_interface("br0")
+    assert cache.get_interface("enp0s8") is None
+    assert cache.get_interface("br0") is None
+    assert cache.get_interface("enp0s3") is not None
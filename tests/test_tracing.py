@@ -0,0 +1,66 @@
+"""
+test_tracing.py
+---------------
+module for the tracing spans tests
+"""
+
+import json
+
+import pytest
+
+from tracing import Tracer, TRACER
+
+
+def test_nested_spans():
+    """Class Tracer test, the span started inside another one is its child"""
+
+    tracer = Tracer()
+    with tracer.span("outer", size=2):
+        with tracer.span("inner") as inner:
+            inner.attributes["rows"] = 1
+    inner, outer = tracer.recent(2)
+    assert (outer.name, inner.name) == ("outer", "inner")
+    assert inner.parent_id == outer.span_id
+    assert inner.trace_id == outer.trace_id
+    assert outer.parent_id is None
+    assert outer.duration >= inner.duration
+    assert inner.attributes == {"rows": 1}
+
+
+def test_span_error_and_capacity():
+    """Class Tracer test, the error is kept in the span and only the last spans are kept"""
+
+    tracer = Tracer(capacity=2)
+    for i in range(3):
+        with tracer.span(f"span{i}"):
+            pass
+    with pytest.raises(ValueError):
+        with tracer.span("failed"):
+            raise ValueError("bad value")
+    assert [span.name for span in tracer.recent(10)] == ["span2", "failed"]
+    assert tracer.recent(1)[0].serialize()["status"] == {"code": "ERROR", "message": "bad value"}
+
+
+def test_export(tmp_path):
+    """Method Tracer.export test, the spans are written as JSON lines"""
+
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer()
+    tracer.export(str(path))
+    with tracer.span("store.update"):
+        pass
+    tracer.close()
+    with tracer.span("not exported"):
+        pass
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["store.update"]
+    assert lines[0]["end_time_unix_nano"] >= lines[0]["start_time_unix_nano"]
+
+
+def test_store_spans(memory_store):
+    """Class NetworkStore test, the backend calls and the apply are traced"""
+
+    memory_store.update().interfaces_by_name["enp0s10"].apply(**{"state": "up"})
+    names = [span.name for span in TRACER.recent(10)]
+    assert names[-2:] == ["backend.apply", "store.apply"]
+    assert {"backend.show", "snapshot.build", "store.update"} <= set(names)
@@ -6,7 +6,7 @@ Tests for validators.
 
 import pytest
 
-from validators import ipv4_validator, bridge_name_validator
+from validators import ipv4_validator, bridge_name_validator, parse_ipv4_addresses, validate_many
 
 
 @pytest.mark.parametrize("ip, expected", [
@@ -17,6 +17,12 @@ from validators import ipv4_validator, bridge_name_validator
     ("192.168.1", False),
     ("192.168.1.1.1", False),
     ("a.b.c.d", False),
+    ("010.0.0.1", False),
+    ("1.2.3.0004", False),
+    ("1..2.3", False),
+    ("1.2.3.4\n", False),
+    (" 1.2.3.4", False),
+    ("1.2.3.\u0664", False),
     ("", False),
     (None, False),
 ])
@@ -32,8 +38,40 @@ def test_validate_ipv4(ip, expected):
     ("1", False),
     ("qazwsxedcrfvtgby", False),
     ("1name", False),
+    ("br1\n", False),
     ("", False),
     (None, False),
 ])
 def test_bridge_name_validator(name, expected):
     assert bridge_name_validator(value=name) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("10.0.2.10", [("10.0.2.10", 24)]),
+    ("10.0.2.10/16", [("10.0.2.10", 16)]),
+    ("10.0.2.10/32, 10.0.3.10/0", [("10.0.2.10", 32), ("10.0.3.10", 0)]),
+    (" 10.0.2.10  10.0.3.10,10.0.4.10 ", [("10.0.2.10", 24), ("10.0.3.10", 24), ("10.0.4.10", 24)]),
+])
+def test_parse_ipv4_addresses(value, expected):
+    assert parse_ipv4_addresses(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    "", " , ", "10.0.2.10/33", "10.0.2.10/", "10.0.2.10/-1", "10.0.2.10/2٤", "10.0.2.300/24",
+    "10.0.2.10, 10.0.2.10/16", None,
+])
+def test_parse_ipv4_addresses_invalid(value):
+    with pytest.raises(ValueError):
+        parse_ipv4_addresses(value)
+
+
+def test_validate_many():
+    """Function validate_many test, the error of each value in the order of the values"""
+
+    values = ["10.0.0.1", "10.0.0.300", None, "10.0.0.1", ["list"]]
+    assert validate_many("ipv4address", values) == [
+        None, "invalid IPv4 address", "invalid IPv4 address", None, "invalid IPv4 address"
+    ]
+    assert validate_many("bridge_name", ["br0", "0br"]) == [None, "invalid bridge name"]
+    assert validate_many("text", ["anything", None]) == [None, None]
+    assert validate_many("state_bool", ["up", "DOWN", True, "absent"]) == [None, None, "invalid state", "invalid state"]
@@ -0,0 +1,132 @@
+"""
+test_views.py
+-------------
+Tests for the views, the curses windows are replaced by the FakeWindow class.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from views import MenuView
+
+
+class FakeWindow:
+    """Class - curses window stub that records the drawn rows."""
+
+    def __init__(self, height: int, width: int, begin_y: int = 0, begin_x: int = 0):
+        self.height = height
+        self.width = width
+        self.begin_y = begin_y
+        self.begin_x = begin_x
+        self.rows = dict()
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def getbegyx(self):
+        return self.begin_y, self.begin_x
+
+    def subwin(self, height, width, begin_y, begin_x):
+        return FakeWindow(height, width, begin_y, begin_x)
+
+    def addstr(self, y, x, text, *args):
+        self.rows[y] = text
+
+    def erase(self):
+        self.rows.clear()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture(autouse=True)
+def curses_stub():
+    """The fixture replaces the curses functions that require the initialized terminal."""
+
+    with patch("curses.doupdate"), patch("curses.ACS_HLINE", ord("-"), create=True):
+        yield
+
+
+@pytest.fixture()
+def menu():
+    """The fixture creates a menu of 1000 interfaces in a window of 24 rows."""
+
+    items = [SimpleNamespace(name=f"eth{i}") for i in range(1000)]
+    view = MenuView(FakeWindow(24, 35), items)
+    view.show()
+    return view
+
+
+def test_menu_draws_visible_slice(menu):
+    """MenuView.show test, only the rows that fit into the window are drawn"""
+
+    assert len(menu.window.rows) == menu.height
+    assert menu.window.rows[1] == "0. eth0"
+
+
+def test_menu_navigate_draws_two_rows(menu):
+    """MenuView.navigate test, the old and new position rows are redrawn"""
+
+    menu.window.rows.clear()
+    menu.navigate(1)
+    menu.show()
+    assert sorted(menu.window.rows) == [1, 2]
+
+
+def test_menu_page_and_end(menu):
+    """MenuView.page and MenuView.end test, the window scrolls to the position"""
+
+    menu.page(1)
+    assert menu.position == menu.height
+    assert menu.top == 1
+    menu.end()
+    assert menu.position == 999
+    assert menu.visible_range() == range(1000 - menu.height, 1000)
+    menu.home()
+    assert menu.position == 0
+    assert menu.top == 0
+
+
+def test_text_edit_keeps_cursor():
+    """Method TextEdit.update test, the cursor is kept while the value is the same"""
+
+    from widgets import TextEdit
+
+    with patch("curses.color_pair", return_value=0):
+        editor = TextEdit(FakeWindow(24, 70), 0, 0, 0, "ipv4 address", 0)
+        editor.value = "10.0.2.1"
+        for key in b"5/24":
+            editor.handle_input(key)
+        editor.update(editor.value, 0)
+        assert editor.cursor_pos == 4
+        editor.update("10.0.3.1", 0)
+        assert editor.cursor_pos == 0
+
+
+def test_interface_frame_rows(memory_store):
+    """Method InterfaceView.show test, the frame that has drawn nothing is traced with zero rows"""
+
+    from tracing import TRACER
+    from views import InterfaceView
+
+    interface = memory_store.update().interfaces_by_name["enp0s3"]
+    with patch("curses.color_pair", return_value=0):
+        view = InterfaceView(FakeWindow(24, 60), interface.serialize(), interface)
+        view.show()
+        view.show()
+    frames = [item for item in TRACER.recent(2) if item.name == "frame.interface"]
+    assert frames[0].attributes["rows"] > 0
+    assert frames[1].attributes["rows"] == 0
+
+
+def test_menu_stale_title(menu):
+    """Method MenuView.set_stale test, the title is marked while the items are stale"""
+
+    menu.set_stale(True)
+    assert menu.parent.rows[0] == "Menu [stale]"
+    menu.redraw()
+    assert menu.parent.rows[0] == "Menu [stale]"
+    menu.set_stale(False)
+    assert menu.parent.rows[0] == "Menu"
@@ -0,0 +1,126 @@
+"""
+test_watcher.py
+---------------
+module for the watcher of the link and address changes tests
+"""
+
+import socket
+import struct
+import threading
+import time
+
+from unittest.mock import patch
+
+from watcher import (
+    AddressEvent,
+    LinkEvent,
+    QueueEventSource,
+    StateWatcher,
+    apply_events,
+    parse_messages,
+)
+
+
+def attribute(type: int, value: bytes) -> bytes:
+    """The function packs the routing attribute with the padding."""
+
+    data = struct.pack("=HH", 4 + len(value), type) + value
+    return data + b"\0" * (-len(data) % 4)
+
+
+def message(type: int, payload: bytes) -> bytes:
+    """The function packs the netlink message."""
+
+    return struct.pack("=IHHII", 16 + len(payload), type, 0, 0, 0) + payload
+
+
+def test_parse_link_messages():
+    """Function parse_messages test, the link messages"""
+
+    names = {4: "br0"}
+    link = struct.pack("=BxHiII", 0, 1, 5, 1, 0)
+    link += attribute(3, b"enp0s10\0") + attribute(1, bytes([8, 0, 0x27, 0xfa, 0x19, 0x27]))
+    link += attribute(10, b"\4\0\0\0")
+    removed = struct.pack("=BxHiII", 0, 1, 6, 0, 0) + attribute(3, b"veth0\0")
+    events = parse_messages(message(16, link) + message(17, removed), names)
+    assert events == [
+        LinkEvent("enp0s10", "ethernet", "up", "br0", "08:00:27:FA:19:27"),
+        LinkEvent("veth0", removed=True),
+    ]
+    assert names[5] == "enp0s10"
+
+
+def test_parse_address_messages():
+    """Function parse_messages test, the IPv4 address messages"""
+
+    names = {5: "enp0s10"}
+    address = struct.pack("=BBBBI", socket.AF_INET, 24, 0, 0, 5) + attribute(2, socket.inet_aton("10.0.4.15"))
+    ipv6 = struct.pack("=BBBBI", socket.AF_INET6, 64, 0, 0, 5) + attribute(2, b"\0" * 16)
+    events = parse_messages(message(20, address) + message(20, ipv6) + message(21, address), names)
+    assert events == [
+        AddressEvent("enp0s10", "10.0.4.15", 24),
+        AddressEvent("enp0s10", "10.0.4.15", 24, removed=True),
+    ]
+
+
+def test_parse_dynamic_address():
+    """Function parse_messages test, the address with a limited lifetime is dynamic"""
+
+    names = {5: "enp0s10"}
+    address = struct.pack("=BBBBI", socket.AF_INET, 24, 0, 0, 5) + attribute(2, socket.inet_aton("10.0.4.15"))
+    leased = address + attribute(6, struct.pack("=IIII", 3600, 7200, 0, 0))
+    permanent = address + attribute(6, struct.pack("=IIII", 0xFFFFFFFF, 0xFFFFFFFF, 0, 0))
+    events = parse_messages(message(20, leased) + message(20, permanent), names)
+    assert [event.dynamic for event in events] == [True, False]
+
+
+def test_apply_events(store, net_state):
+    """Function apply_events test, the interfaces and the bridges are patched without requesting the state"""
+
+    with patch('libnmstate.show') as mock_show:
+        mock_show.return_value = net_state
+        store.update()
+        apply_events(store, [
+            LinkEvent("enp0s10", state="down", controller="br0"),
+            AddressEvent("enp0s3", "10.0.2.20", 24),
+            LinkEvent("enp0s11"),
+            LinkEvent("enp0s8", removed=True),
+        ])
+        assert store.update() is store.state
+    assert mock_show.call_count == 1
+    interfaces = store.state.interfaces_by_name
+    assert "enp0s8" not in interfaces
+    assert interfaces["enp0s10"].state == "down"
+    assert interfaces["enp0s10"].controller == "br0"
+    assert interfaces["enp0s11"].ipv4 == {"enabled": False, "dhcp": False}
+    assert "10.0.2.20" in interfaces["enp0s3"].search_fields()
+    assert store.state.bridges_by_name["br0"]["bridge"]["port"] == [{"name": "enp0s9"}, {"name": "enp0s10"}]
+
+
+def test_state_watcher():
+    """Class StateWatcher test, the events of the source are collected in the background"""
+
+    source = QueueEventSource()
+    watcher = StateWatcher(source).start()
+    source.put(LinkEvent("enp0s10", state="down"))
+    source.put(AddressEvent("enp0s10", "10.0.4.15", 24))
+    events = []
+    deadline = time.monotonic() + 5
+    while len(events) < 2 and time.monotonic() < deadline:
+        events += watcher.drain()
+        time.sleep(0.01)
+    watcher.stop()
+    assert events == [LinkEvent("enp0s10", state="down"), AddressEvent("enp0s10", "10.0.4.15", 24)]
+    assert watcher.error is None
+
+
+def test_state_watcher_notify():
+    """Class StateWatcher test, the collected events are notified from the thread of the watcher"""
+
+    source = QueueEventSource()
+    notified = threading.Event()
+    watcher = StateWatcher(source, notified.set).start()
+    source.put(LinkEvent("enp0s10", state="down"))
+    assert notified.wait(5)
+    watcher.stop()
+    assert watcher.drain() == [LinkEvent("enp0s10", state="down")]
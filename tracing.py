@@ -0,0 +1,203 @@
+"""
+tracing.py
+------------
+The module contains the tracing spans of the backend calls, the store updates and the frames of the views.
+The last spans are kept in memory for the debug overlay, all spans can be exported to a file
+as JSON lines with the fields of the OpenTelemetry span.
+"""
+
+import itertools
+import json
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator
+
+from consts import Tracing
+
+_ids = itertools.count(1)
+
+
+class Span:
+    """Class - timing of one operation, the spans started inside it are its children."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration", "attributes", "error")
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict):
+        """
+        The initialization of the span, it is started at once.
+
+        Args:
+            name: operation name
+            parent: span of the enclosing operation of the same thread
+            attributes: attributes of the operation
+        """
+
+        self.name = name
+        self.span_id = f"{next(_ids):016x}"
+        self.trace_id = parent.trace_id if parent is not None else f"{self.span_id:0>32}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.time_ns()
+        self.duration = time.perf_counter_ns()
+        self.attributes = attributes
+        self.error = None
+
+    def finish(self) -> None:
+        """The method stops the span."""
+
+        self.duration = time.perf_counter_ns() - self.duration
+
+    @property
+    def seconds(self) -> float:
+        """The property returns the duration of the finished span in seconds."""
+
+        return self.duration / 1e9
+
+    def serialize(self) -> dict:
+        """
+        The method returns the span with the field names of the OpenTelemetry span.
+
+        Returns: span
+        """
+
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start,
+            "end_time_unix_nano": self.start + self.duration,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error is not None else {"code": "OK"},
+        }
+
+
+class Tracer:
+    """Class - collector of the spans of all threads."""
+
+    def __init__(self, capacity: int = Tracing.CAPACITY):
+        """
+        The initialization of the tracer.
+
+        Args:
+            capacity: number of the last spans kept in memory
+        """
+
+        self.spans = deque(maxlen=capacity)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stream = None
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        The method times the operation of the with block.
+
+        Args:
+            name: operation name
+            **attributes: attributes of the operation
+
+        Returns: started span, the attributes can be added inside the block
+        """
+
+        stack = self._local.__dict__.setdefault("stack", [])
+        span = Span(name, stack[-1] if stack else None, attributes)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            span.finish()
+            stack.pop()
+            self._record(span)
+
+    def _record(self, span: Span) -> None:
+        """
+        The method keeps the finished span and writes it to the export file.
+
+        Args:
+            span: finished span
+        """
+
+        with self._lock:
+            self.spans.append(span)
+            if self._stream is not None:
+                self._stream.write(json.dumps(span.serialize(), default=str) + "\n")
+
+    def recent(self, count: int) -> list[Span]:
+        """
+        The method returns the last finished spans.
+
+        Args:
+            count: number of spans
+
+        Returns: spans from the oldest to the newest
+        """
+
+        with self._lock:
+            return list(self.spans)[-count:] if count > 0 else []
+
+    def export(self, path: str) -> None:
+        """
+        The method starts writing the finished spans to the file as JSON lines.
+
+        Args:
+            path: file path, the spans are appended
+        """
+
+        stream = open(path, "a", buffering=1)
+        with self._lock:
+            previous, self._stream = self._stream, stream
+        if previous is not None:
+            previous.close()
+
+    def close(self) -> None:
+        """The method stops writing the spans to the file."""
+
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+
+
+TRACER = Tracer()
+
+
+def span(name: str, **attributes):
+    """
+    The function times the operation of the with block by the tracer of the application.
+
+    Args:
+        name: operation name
+        **attributes: attributes of the operation
+
+    Returns: context manager of the span
+    """
+
+    return TRACER.span(name, **attributes)
+
+
+def traced(name: str) -> Callable:
+    """
+    The decorator times each call of the function by the tracer of the application.
+
+    Args:
+        name: operation name
+
+    Returns: decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
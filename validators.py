@@ -1,18 +1,24 @@
 """
 validators.py
 ---------------
-The module contains validators for the types that are used in the application and a function for obtaining a validator
-by field type.
+The module contains validators for the types that are used in the application, a function for obtaining a validator
+by field type and a function validating many values of one type at once.
 """
 
 import re
+import socket
 
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
+
+from consts import Address
+
+BRIDGE_NAME_PATTERN = re.compile(r"[a-zA-Z][a-zA-Z0-9_-]{0,14}")
 
 
 def ipv4_validator(value: str) -> bool:
     """
-    IPv4 address checking function.
+    IPv4 address checking function, the address is parsed by the C parser of the socket library:
+    four decimal octets separated by dots, without leading zeros.
 
     Args:
         value: str - string with IPv4 address.
@@ -20,10 +26,59 @@ def ipv4_validator(value: str) -> bool:
     Returns: bool - True if the address is valid, False otherwise.
     """
 
+    try:
+        socket.inet_pton(socket.AF_INET, value)
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
+
+
+def parse_ipv4_addresses(value: str) -> list[tuple[str, int]]:
+    """
+    The function parses the static IPv4 addresses: the addresses with the optional prefix length
+    separated by commas or spaces, the prefix length is Address.DEFAULT_PREFIX_LENGTH if omitted.
+
+    Args:
+        value: str - string with the addresses, for example "10.0.2.10/24, 10.0.3.10"
+
+    Returns: list - addresses with the prefix lengths
+    """
+
     if not isinstance(value, str):
+        raise ValueError("IPv4 addresses must be a string")
+    addresses = []
+    for item in value.replace(",", " ").split():
+        ip, separator, prefix_length = item.partition("/")
+        if not ipv4_validator(ip):
+            raise ValueError(f"invalid IPv4 address: {item}")
+        if not separator:
+            addresses.append((ip, Address.DEFAULT_PREFIX_LENGTH))
+            continue
+        if not prefix_length.isascii() or not prefix_length.isdigit() or int(prefix_length) > 32:
+            raise ValueError(f"invalid prefix length: {item}")
+        addresses.append((ip, int(prefix_length)))
+    if not addresses:
+        raise ValueError("no IPv4 address")
+    if len({ip for ip, _ in addresses}) != len(addresses):
+        raise ValueError("duplicate IPv4 address")
+    return addresses
+
+
+def ipv4_addresses_validator(value: str) -> bool:
+    """
+    Function to check the static IPv4 addresses with the optional prefix lengths.
+
+    Args:
+        value: str - string with the addresses.
+
+    Returns: bool - True if the addresses are valid, False otherwise.
+    """
+
+    try:
+        parse_ipv4_addresses(value)
+    except ValueError:
         return False
-    pattern = re.compile(r"^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$")
-    return bool(pattern.match(value))
+    return True
 
 
 def bridge_name_validator(value: str) -> bool:
@@ -38,7 +93,20 @@ def bridge_name_validator(value: str) -> bool:
 
     if not isinstance(value, str):
         return False
-    return bool(re.match(r"^[a-zA-Z][a-zA-Z0-9_-]{0,14}$", value))
+    return BRIDGE_NAME_PATTERN.fullmatch(value) is not None
+
+
+def state_validator(value: str) -> bool:
+    """
+    Function to check the interface state.
+
+    Args:
+        value: str - string with state, up or down in any case.
+
+    Returns: bool - True if the state is valid, False otherwise.
+    """
+
+    return isinstance(value, str) and value.lower() in ("up", "down")
 
 
 def nullable_validator(value: Any) -> True:
@@ -57,12 +125,18 @@ def nullable_validator(value: Any) -> True:
 MAPPER_VALIDATORS = {
     "text": nullable_validator,
     "bool": nullable_validator,
-    "state_bool": nullable_validator,
-    "ipv4address": ipv4_validator,
+    "state_bool": state_validator,
+    "ipv4address": ipv4_addresses_validator,
     "apply_button": nullable_validator,
     "bridge_name": bridge_name_validator,
 }
 
+MAPPER_ERRORS = {
+    "state_bool": "invalid state",
+    "ipv4address": "invalid IPv4 address",
+    "bridge_name": "invalid bridge name",
+}
+
 
 def get_validator(field_type: str) -> Callable:
     """
@@ -75,3 +149,21 @@ def get_validator(field_type: str) -> Callable:
     """
 
     return MAPPER_VALIDATORS.get(field_type, nullable_validator)
+
+
+def validate_many(field_type: str, values: Iterable[Any]) -> list[str | None]:
+    """
+    The function validates many values of one type.
+
+    Args:
+        field_type: str - string with value type
+        values: values to check
+
+    Returns: list - error for each value in the order of the values, None for the valid value
+    """
+
+    validator = get_validator(field_type)
+    if validator is nullable_validator:
+        return [None for _ in values]
+    error = MAPPER_ERRORS[field_type]
+    return [None if valid else error for valid in map(validator, values)]
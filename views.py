@@ -8,6 +8,8 @@ import curses
 
 from abc import ABC, abstractmethod
 
+from consts import Color, Tracing
+from tracing import TRACER, span
 from widgets import TextEdit, Checkbox, RadioGroupState, Button
 
 
@@ -45,13 +47,61 @@ class View(ABC):
 
         self.position = 0
         self.items = items
+        self.active = None
+        self.dirty = set()
+        self.full_redraw = True
 
     def navigate(self, n):
+        old_position = self.position
         self.position += n
+        if self.position >= len(self.items):
+            self.position = len(self.items) - 1
         if self.position < 0:
             self.position = 0
-        elif self.position >= len(self.items):
-            self.position = len(self.items) - 1
+        if self.position != old_position:
+            self.dirty.update((old_position, self.position))
+
+    def set_active(self, active: bool) -> None:
+        """
+        The method changes the background of the view, the whole view is redrawn only if the state changes.
+
+        Args:
+            active: the view has the input focus
+        """
+
+        if active == self.active:
+            return
+        self.active = active
+        color = curses.color_pair(Color.ACTIVE_COLOR if active else Color.INACTIVE_COLOR)
+        self.parent.bkgd(" ", color)
+        self.window.bkgd(" ", color)
+        self.full_redraw = True
+
+    def visible_range(self) -> range:
+        """
+        The method returns the indexes of the items that fit into the window.
+
+        Returns: range of indexes
+        """
+
+        return range(len(self.items))
+
+    def rows_to_draw(self) -> list[int]:
+        """
+        The method returns the visible rows changed since the last frame and resets the damage.
+
+        Returns: indexes of the items to draw
+        """
+
+        visible = self.visible_range()
+        if self.full_redraw:
+            self.window.erase()
+            rows = list(visible)
+        else:
+            rows = sorted(row for row in self.dirty if row in visible)
+        self.dirty.clear()
+        self.full_redraw = False
+        return rows
 
     @abstractmethod
     def show(self):
@@ -59,26 +109,160 @@ class View(ABC):
 
 
 class MenuView(View):
-    """The menu presentation class is used to select an Ethernet interface and open it for modification."""
+    """
+    The menu presentation class is used to select an Ethernet interface and open it for modification.
+    Only the slice of the list that fits into the window is drawn.
+    """
 
-    def __init__(self, parent: curses.window, items: list[dict]):
+    def __init__(self, parent: curses.window, items: list, title: str = "Menu"):
         super().__init__(parent, items)
-        self.parent.addstr(0, 0, "Menu")
+        self.title = title
+        self.stale = False
+        self.parent.addstr(0, 0, title)
+        self._marks = dict()
+        self.top = 0
+        self.height = max(1, self.window.getmaxyx()[0] - 1)
+        self.indexes = {item.name: i for i, item in enumerate(items)}
+        self.counter = ""
+
+    def navigate(self, n):
+        super().navigate(n)
+        if self.position < self.top:
+            self.top = self.position
+            self.full_redraw = True
+        elif self.position >= self.top + self.height:
+            self.top = self.position - self.height + 1
+            self.full_redraw = True
+
+    def set_items(self, items: list) -> None:
+        """
+        The method replaces the items of the menu, for example by the filtered list, and redraws the menu.
+
+        Args:
+            items: new items
+        """
+
+        self.items = items
+        self.indexes = {item.name: i for i, item in enumerate(items)}
+        self.position = 0
+        self.top = 0
+        self.dirty.clear()
+        self.full_redraw = True
+
+    def redraw(self) -> None:
+        """The method draws the border and the whole menu again, for example after another menu has covered it."""
+
+        self.parent.erase()
+        self.parent.box()
+        self.parent.addstr(0, 0, self.caption())
+        self.counter = ""
+        self.active = None
+        self.full_redraw = True
+
+    def caption(self) -> str:
+        """
+        The method returns the caption of the menu border.
+
+        Returns: title, marked while the items come from the snapshot of the previous run
+        """
+
+        return f"{self.title} [stale]" if self.stale else self.title
+
+    def set_stale(self, stale: bool) -> None:
+        """
+        The method marks the title of the menu while its items come from the snapshot of the previous run.
+
+        Args:
+            stale: the items are not loaded from the network state yet
+        """
+
+        if stale == self.stale:
+            return
+        self.stale = stale
+        self.parent.box()
+        self.parent.addstr(0, 0, self.caption())
+
+    def page(self, n: int) -> None:
+        """
+        The method moves the position by whole pages.
+
+        Args:
+            n: number of pages, negative to move up
+        """
+
+        self.navigate(n * self.height)
+
+    def home(self) -> None:
+        """The method moves the position to the first item."""
+
+        self.navigate(-self.position)
+
+    def end(self) -> None:
+        """The method moves the position to the last item."""
+
+        self.navigate(len(self.items) - 1 - self.position)
+
+    def visible_range(self) -> range:
+        return range(self.top, min(self.top + self.height, len(self.items)))
+
+    @property
+    def marks(self) -> dict[str, str]:
+        """The property returns the marks shown next to the interface names."""
+
+        return self._marks
+
+    @marks.setter
+    def marks(self, marks: dict[str, str]) -> None:
+        if marks == self._marks:
+            return
+        changed = {name for name in marks.keys() | self._marks.keys() if marks.get(name) != self._marks.get(name)}
+        self.dirty.update(self.indexes[name] for name in changed if name in self.indexes)
+        self._marks = dict(marks)
 
     def show(self) -> None:
-        """Menu drawing method."""
+        """Menu drawing method, only the changed rows of the visible slice are drawn."""
+
+        with span("frame.menu") as trace:
+            rows = self.rows_to_draw()
+            for i in rows:
+                self._draw_row(i)
+            self._draw_counter()
+            self.parent.noutrefresh()
+            self.window.noutrefresh()
+            curses.doupdate()
+            trace.attributes["rows"] = len(rows)
+
+    def _draw_row(self, i: int) -> None:
+        """
+        The method draws one row of the menu.
 
-        self.window.clear()
-        self.parent.refresh()
-        self.window.refresh()
-        curses.doupdate()
-        for i, item in enumerate(self.items):
-            if i == self.position:
-                mode = curses.A_REVERSE
-            else:
-                mode = curses.A_NORMAL
-            caption = f"{i}. {item.name}"
-            self.window.addstr(1 + i, 1, caption, mode)
+        Args:
+            i: index of the item
+        """
+
+        item = self.items[i]
+        if i == self.position:
+            mode = curses.A_REVERSE
+        else:
+            mode = curses.A_NORMAL
+        caption = f"{i}. {item.name}"
+        if item.name in self.marks:
+            caption = f"{caption} [{self.marks[item.name]}]"
+        y = 1 + i - self.top
+        self.window.hline(y, 1, " ", self.window_width - 2)
+        self.window.addstr(y, 1, caption[: self.window_width - 2], mode)
+
+    def _draw_counter(self) -> None:
+        """The method draws the position in the list on the bottom border when the list does not fit."""
+
+        counter = f" {self.position + 1}/{len(self.items)} " if len(self.items) > self.height else ""
+        if counter == self.counter:
+            return
+        height, width = self.parent.getmaxyx()
+        self.parent.hline(height - 1, 1, curses.ACS_HLINE, width - 2)
+        if counter:
+            self.parent.addstr(height - 1, 2, counter)
+        self.counter = counter
 
 
 class InterfaceView(View):
@@ -91,46 +275,65 @@ class InterfaceView(View):
         self.parent.hline(1, 1, " ", self.window_width - 2)
         self.parent.addstr(1, 1, f"name: {interface.name}, type: {interface.type}")
         self.full_items = items
+        self.widgets = dict()
 
     def show(self, item: dict | None = None) -> None:
         """
-        Menu drawing method.
+        Menu drawing method, only the changed widgets are drawn.
 
         Args:
             item: editing item
         """
 
-        self.window.clear()
-        self.parent.refresh()
-        self.window.refresh()
-        curses.doupdate()
-        self._add_widgets(item)
+        with span("frame.interface") as trace:
+            trace.attributes["rows"] = self._add_widgets(item)
+            self.parent.noutrefresh()
+            self.window.noutrefresh()
+            curses.doupdate()
 
-    def _add_widgets(self, item: dict | None) -> None:
+    def _add_widgets(self, item: dict | None) -> int:
         """
         The method adds widgets to the interfaceview window.
 
         Args:
             item: editing item
+
+        Returns: number of the drawn widgets
         """
 
         border_top = 2
         border_left = 2
         self.set_show_items()
         self.change_position(item)
-        for i, item in enumerate(self.items):
+        if item in self.items:
+            self.dirty.add(self.items.index(item))
+        full_redraw = self.full_redraw
+        rows = self.rows_to_draw()
+        for i in rows:
+            item = self.items[i]
             if i == self.position:
                 mode = curses.A_REVERSE
             else:
                 mode = curses.A_NORMAL
-            widget = MAPPER_WIDGET[item["type"]]
-            editor = widget(self.window, border_top, border_left, i, item["name"], mode)
-            editor.value = item["value"]
+            editor = self.widgets.get(item["name"])
+            if editor is None:
+                widget = MAPPER_WIDGET[item["type"]]
+                editor = widget(self.window, border_top, border_left, i, item["name"], mode)
+                editor.value = item["value"]
+                self.widgets[item["name"]] = editor
+            else:
+                editor.update(item["value"], mode)
+                if full_redraw:
+                    editor.draw_frame()
             item["editor"] = editor
             editor.show()
+        return len(rows)
 
     def set_show_items(self):
-        """The method sets the elements available for display."""
+        """
+        The method sets the elements available for display,
+        the widgets are created again only if the set of elements changes.
+        """
 
         res = {item["name"]: item["value"] for item in self.full_items}
         show_items = []
@@ -143,7 +346,13 @@ class InterfaceView(View):
         elif not res["ipv4 dhcp"]:
             show_items = ["state", "ipv4 dhcp", "ipv4 address", "bridge", "apply"]
 
-        self.items = [item for item in self.full_items if item["name"] in show_items]
+        items = [item for item in self.full_items if item["name"] in show_items]
+        if items != self.items or not self.widgets:
+            self.full_redraw = True
+            self.widgets = dict()
+            for full_item in self.full_items:
+                full_item.pop("editor", None)
+        self.items = items
 
     def change_position(self, item: dict | None) -> None:
         """
@@ -155,6 +364,66 @@ class InterfaceView(View):
 
         if item:
             try:
-                self.position = self.items.index(item)
-            except IndexError:
-                self.position = 0
+                position = self.items.index(item)
+            except ValueError:
+                position = 0
+            if position != self.position:
+                self.dirty.update((self.position, position))
+                self.position = position
+
+
+class TraceOverlay:
+    """
+    The debug overlay class shows the durations of the last traced operations in the corner of the screen,
+    the frames that have drawn nothing are not shown.
+    """
+
+    current = None
+
+    def __init__(self, parent: curses.window, rows: int = Tracing.OVERLAY_ROWS, width: int = Tracing.OVERLAY_WIDTH):
+        height, parent_width = parent.getmaxyx()
+        rows = max(1, min(rows, height - 4))
+        width = min(width, parent_width)
+        self.rows = rows
+        self.window = parent.subwin(rows + 2, width, 2, parent_width - width)
+        self.shown = None
+
+    @classmethod
+    def enable(cls, parent: curses.window, rows: int = Tracing.OVERLAY_ROWS) -> "TraceOverlay":
+        """
+        The method creates the overlay shown by the controllers.
+
+        Args:
+            parent: main application window
+            rows: number of the shown operations
+
+        Returns: overlay
+        """
+
+        cls.current = cls(parent, rows)
+        return cls.current
+
+    @classmethod
+    def refresh(cls) -> None:
+        """The method draws the overlay if it is enabled and the traced operations have changed."""
+
+        if cls.current is not None:
+            cls.current.show()
+
+    def show(self) -> None:
+        """Overlay drawing method, it is drawn on top of the views."""
+
+        spans = [span for span in TRACER.recent(Tracing.CAPACITY) if span.attributes.get("rows") != 0][-self.rows:]
+        shown = [span.span_id for span in spans]
+        if shown == self.shown:
+            return
+        self.shown = shown
+        height, width = self.window.getmaxyx()
+        self.window.erase()
+        self.window.box()
+        self.window.addstr(0, 1, "Trace")
+        for y, item in enumerate(reversed(spans), 1):
+            caption = f"{item.seconds * 1000:8.1f}ms {item.name}"
+            self.window.addstr(y, 1, caption[: width - 2])
+        self.window.noutrefresh()
+        curses.doupdate()
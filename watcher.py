@@ -0,0 +1,377 @@
+"""
+watcher.py
+----------
+The module contains the watcher of the link and address changes reported by the kernel,
+the changes patch the list of interfaces without requesting the whole network state.
+"""
+
+import queue
+import select
+import socket
+import struct
+import threading
+
+from typing import Callable, NamedTuple, TYPE_CHECKING
+
+from consts import Watcher
+
+if TYPE_CHECKING:
+    from state import NetworkStore
+
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+
+NLMSG_HEADER = struct.Struct("=IHHII")
+IFINFOMSG = struct.Struct("=BxHiII")
+IFADDRMSG = struct.Struct("=BBBBI")
+RTATTR = struct.Struct("=HH")
+
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_MASTER = 10
+IFLA_LINKINFO = 18
+IFLA_INFO_KIND = 1
+
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_LABEL = 3
+IFA_CACHEINFO = 6
+IFA_CACHEINFO_VALID = struct.Struct("=4xI")
+INFINITY_LIFE_TIME = 0xFFFFFFFF
+
+AF_BRIDGE = 7
+IFF_UP = 0x1
+ARPHRD_ETHER = 1
+ARPHRD_LOOPBACK = 772
+
+
+class LinkEvent(NamedTuple):
+    """Class - the interface has been added, changed or removed."""
+
+    name: str
+    type: str = "ethernet"
+    state: str = "up"
+    controller: str = ""
+    mac: str = ""
+    removed: bool = False
+
+
+class AddressEvent(NamedTuple):
+    """Class - the IPv4 address has been added to the interface or removed from it, the dynamic one has a lease."""
+
+    name: str
+    ip: str
+    prefix_length: int
+    removed: bool = False
+    dynamic: bool = False
+
+
+def _align(length: int) -> int:
+    """The function rounds the length of the netlink message or attribute up to 4 bytes."""
+
+    return (length + 3) & ~3
+
+
+def _attributes(data: bytes) -> dict[int, bytes]:
+    """
+    The function parses the routing attributes of the netlink message.
+
+    Args:
+        data: attributes of the message
+
+    Returns: attribute values by their types
+    """
+
+    attributes = dict()
+    offset = 0
+    while offset + RTATTR.size <= len(data):
+        length, type = RTATTR.unpack_from(data, offset)
+        if length < RTATTR.size:
+            break
+        attributes[type & 0x7FFF] = data[offset + RTATTR.size:offset + length]
+        offset += _align(length)
+    return attributes
+
+
+def _string(value: bytes) -> str:
+    """The function decodes the null-terminated string attribute."""
+
+    return value.split(b"\0", 1)[0].decode(errors="replace")
+
+
+def _link_type(arphrd: int, kind: str) -> str:
+    """
+    The function returns the nmstate interface type by the hardware type and the link kind.
+
+    Args:
+        arphrd: hardware type of the link
+        kind: kind of the virtual link, empty for the hardware one
+
+    Returns: interface type
+    """
+
+    if kind == "bridge":
+        return "linux-bridge"
+    if kind:
+        return kind
+    if arphrd == ARPHRD_LOOPBACK:
+        return "loopback"
+    if arphrd == ARPHRD_ETHER:
+        return "ethernet"
+    return "unknown"
+
+
+def _index_name(index: int, names: dict[int, str]) -> str:
+    """The function returns the name of the interface by its index."""
+
+    if index not in names:
+        try:
+            names[index] = socket.if_indextoname(index)
+        except OSError:
+            return ""
+    return names[index]
+
+
+def parse_messages(data: bytes, names: dict[int, str]) -> list[LinkEvent | AddressEvent]:
+    """
+    The function parses the rtnetlink messages about the links and IPv4 addresses.
+
+    Args:
+        data: received datagram
+        names: interface names by their indexes, it is updated by the link messages
+
+    Returns: events in the order of the messages
+    """
+
+    events = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        payload = data[offset + NLMSG_HEADER.size:offset + length]
+        offset += _align(length)
+
+        if type in (RTM_NEWLINK, RTM_DELLINK) and len(payload) >= IFINFOMSG.size:
+            family, arphrd, index, flags, _ = IFINFOMSG.unpack_from(payload)
+            if family == AF_BRIDGE:
+                continue
+            attributes = _attributes(payload[IFINFOMSG.size:])
+            name = _string(attributes.get(IFLA_IFNAME, b"")) or _index_name(index, names)
+            if not name:
+                continue
+            if type == RTM_DELLINK:
+                names.pop(index, None)
+                events.append(LinkEvent(name, removed=True))
+                continue
+            names[index] = name
+            kind = _string(_attributes(attributes.get(IFLA_LINKINFO, b"")).get(IFLA_INFO_KIND, b""))
+            controller = ""
+            if IFLA_MASTER in attributes:
+                controller = _index_name(struct.unpack("=I", attributes[IFLA_MASTER][:4])[0], names)
+            events.append(LinkEvent(
+                name,
+                type=_link_type(arphrd, kind),
+                state="up" if flags & IFF_UP else "down",
+                controller=controller,
+                mac=":".join(f"{byte:02X}" for byte in attributes.get(IFLA_ADDRESS, b"")),
+            ))
+        elif type in (RTM_NEWADDR, RTM_DELADDR) and len(payload) >= IFADDRMSG.size:
+            family, prefix_length, _, _, index = IFADDRMSG.unpack_from(payload)
+            if family != socket.AF_INET:
+                continue
+            attributes = _attributes(payload[IFADDRMSG.size:])
+            address = attributes.get(IFA_LOCAL, attributes.get(IFA_ADDRESS))
+            name = _index_name(index, names) or _string(attributes.get(IFA_LABEL, b""))
+            if address is None or not name:
+                continue
+            cacheinfo = attributes.get(IFA_CACHEINFO, b"")
+            dynamic = (
+                len(cacheinfo) >= IFA_CACHEINFO_VALID.size
+                and IFA_CACHEINFO_VALID.unpack_from(cacheinfo)[0] != INFINITY_LIFE_TIME
+            )
+            events.append(AddressEvent(
+                name, socket.inet_ntoa(address[:4]), prefix_length, removed=type == RTM_DELADDR, dynamic=dynamic
+            ))
+    return events
+
+
+class NetlinkEventSource:
+    """Class - source of the events subscribed to the rtnetlink link and IPv4 address groups."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self.sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+        self.names = dict()
+
+    def read(self, timeout: float | None = None) -> list[LinkEvent | AddressEvent]:
+        """
+        The method waits for the netlink messages and parses them.
+
+        Args:
+            timeout: time to wait in seconds, None waits until a message is received
+
+        Returns: events, empty if nothing has been received
+        """
+
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        if not ready:
+            return []
+        return parse_messages(self.sock.recv(Watcher.BUFFER_SIZE), self.names)
+
+    def close(self) -> None:
+        """The method closes the netlink socket."""
+
+        self.sock.close()
+
+
+class QueueEventSource:
+    """Class - local stand-in of the netlink source, the events are put by hand, for example in tests."""
+
+    def __init__(self):
+        self.events = queue.Queue()
+
+    def put(self, event: LinkEvent | AddressEvent) -> None:
+        """
+        The method emits the event.
+
+        Args:
+            event: link or address event
+        """
+
+        self.events.put(event)
+
+    def read(self, timeout: float | None = None) -> list[LinkEvent | AddressEvent]:
+        """
+        The method waits for the first event and returns it with all the events put after it.
+
+        Args:
+            timeout: time to wait in seconds, None waits until an event is put
+
+        Returns: events, empty if nothing has been put
+        """
+
+        try:
+            events = [self.events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self) -> None:
+        """The method does nothing, there is nothing to close."""
+
+
+class StateWatcher:
+    """Class - background thread collecting the events of the source until the UI thread takes them."""
+
+    def __init__(self, source: NetlinkEventSource | QueueEventSource, notify: Callable[[], None] | None = None):
+        """
+        The initialization of the watcher.
+
+        Args:
+            source: source of the events
+            notify: function called in the thread of the watcher when the events are collected
+        """
+
+        self.source = source
+        self.notify = notify
+        self.error = None
+        self._events = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="watcher", daemon=True)
+
+    def start(self) -> "StateWatcher":
+        """
+        The method starts the thread reading the source.
+
+        Returns: the watcher itself
+        """
+
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """The method stops the thread and closes the source."""
+
+        self._stop.set()
+        self._thread.join()
+        self.source.close()
+
+    def _run(self) -> None:
+        """The method reads the source until the watcher is stopped or the source fails."""
+
+        while not self._stop.is_set():
+            try:
+                events = self.source.read(Watcher.READ_TIMEOUT)
+            except OSError as e:
+                self.error = e
+                if self.notify is not None:
+                    self.notify()
+                return
+            for event in events:
+                self._events.put(event)
+            if events and self.notify is not None:
+                self.notify()
+
+    def drain(self) -> list[LinkEvent | AddressEvent]:
+        """
+        The method takes all the events collected since the previous call.
+
+        Returns: events in the order they have been received
+        """
+
+        events = []
+        while not self._events.empty():
+            events.append(self._events.get())
+        return events
+
+
+def apply_events(store: "NetworkStore", events: list[LinkEvent | AddressEvent]) -> bool:
+    """
+    The function patches the snapshot of the interfaces and the bridges of the store by the events.
+
+    Args:
+        store: network state store
+        events: link and address events
+
+    Returns: True if there were events to apply
+    """
+
+    for event in events:
+        if isinstance(event, AddressEvent):
+            store.patch_address(event.name, event.ip, event.prefix_length, event.removed)
+        elif event.removed:
+            store.remove_interface(event.name)
+        else:
+            iface_state = {
+                "name": event.name,
+                "type": event.type,
+                "state": event.state,
+                "controller": event.controller,
+            }
+            if event.mac:
+                iface_state["mac-address"] = event.mac
+            store.patch_interface(iface_state)
+    return bool(events)
+
+
+def start_watcher(notify: Callable[[], None] | None = None) -> StateWatcher:
+    """
+    The function subscribes to the rtnetlink events and starts the watcher.
+
+    Args:
+        notify: function called in the thread of the watcher when the events are collected
+
+    Returns: started watcher
+    """
+
+    return StateWatcher(NetlinkEventSource(), notify).start()
@@ -42,12 +42,34 @@ class Widget(ABC):
         self.border_left = border_left
         self.width = 21
         self.window = self.parent.subwin(3, self.width, y, x)
-        self.window.box()
-        self.window.addstr(0, 0, caption, mode)
+        self.caption = caption
+        self.mode = mode
+        self.draw_frame()
         self.color = curses.color_pair(Color.WINDOW_COLOR)
         self.y = 1
         self.x = 1
 
+    def draw_frame(self) -> None:
+        """The method draws the border and the caption of the widget."""
+
+        self.window.box()
+        self.window.addstr(0, 0, self.caption, self.mode)
+
+    def update(self, value, mode: curses.color_pair) -> None:
+        """
+        The method prepares the reused widget for the next frame.
+
+        Args:
+            value: value of the field
+            mode: color display mode
+        """
+
+        self.value = value
+        self.color = curses.color_pair(Color.WINDOW_COLOR)
+        if mode != self.mode:
+            self.mode = mode
+            self.draw_frame()
+
     @abstractmethod
     def show(self):
         pass
@@ -64,6 +86,12 @@ class TextEdit(Widget):
         self.window.keypad(True)
         self.value = ""
 
+    def update(self, value, mode):
+        changed = value != self.value
+        super().update(value, mode)
+        if changed:
+            self.cursor_pos = 0
+
     def show(self) -> None:
         """Widget drawing method."""
 
@@ -73,7 +101,7 @@ class TextEdit(Widget):
         self.window.addstr(self.y, self.x, display_text)
         cursor_x = self.x + self.cursor_pos
         self.window.move(self.y, cursor_x)
-        self.window.refresh()
+        self.window.noutrefresh()
 
     def handle_input(self, key: int) -> None:
         """
@@ -121,7 +149,7 @@ class Checkbox(Widget):
 
         checkbox_str = " [X] ON " if self.value else " [ ] OFF"
         self.window.addstr(self.y, self.x, checkbox_str)
-        self.window.refresh()
+        self.window.noutrefresh()
 
     def toggle(self):
         """Switching Method Value."""
@@ -161,7 +189,7 @@ class RadioGroupState(Widget):
             self.window.addstr(self.y, current_x, line, mode)
 
             current_x += len(line) + self.spacing
-        self.window.refresh()
+        self.window.noutrefresh()
 
     def handle_input(self, key):
         """
@@ -179,14 +207,14 @@ class RadioGroupState(Widget):
 class Button(Widget):
     def __init__(self, parent, border_top, border_left, index, caption, mode):
         super().__init__(parent, border_top, border_left, index, caption, mode)
-        height, width = self.window.getmaxyx()
-        self.y = 1
-        self.caption = caption
-        self.x = (width - len(caption)) // 2
         self.value = lambda: None
-        self.mode = mode
+
+    def draw_frame(self):
+        """The method draws the border and the caption in the middle of the button."""
+
+        height, width = self.window.getmaxyx()
         self.window.box()
-        self.window.addstr(self.y, self.x, self.caption)
+        self.window.addstr(1, (width - len(self.caption)) // 2, self.caption)
 
     def show(self):
         """Widget drawing method."""
@@ -195,4 +223,4 @@ class Button(Widget):
             self.window.bkgd(" ", curses.color_pair(Color.INACTIVE_BUTTON_COLOR))
         else:
             self.window.bkgd(" ", curses.color_pair(Color.ACTIVE_BUTTON_COLOR))
-        self.window.refresh()
+        self.window.noutrefresh()